@@ -1,4 +1,28 @@
-from .plots import *
+import importlib
 from .stats import *
 from .utils import trace_to_dataframe, save_trace, load_trace
-from matplotlib.pyplot import style
+
+# The plots (and with them matplotlib) are only imported the first time one of them is accessed,
+# so `import arviz` stays cheap for code that only needs the stats.
+_PLOTS = ['autocorrplot', 'compareplot', 'densityplot', 'energyplot', 'forestplot', 'kdeplot',
+          'parallelplot', 'posteriorplot', 'traceplot', 'pairplot', 'jointplot', 'render_report',
+          'TraceMonitor']
+
+__all__ = ['bfmi', 'compare', 'hpd', 'loo', 'psislw', 'r2_score', 'summary', 'waic', 'effective_n',
+           'gelman_rubin', 'geweke', 'WaicAccumulator', 'trace_to_dataframe', 'save_trace',
+           'load_trace', 'style'] + _PLOTS
+
+
+def __getattr__(name):
+    if name in _PLOTS:
+        return getattr(importlib.import_module('.plots', __name__), name)
+    elif name == 'plots':
+        return importlib.import_module('.plots', __name__)
+    elif name == 'style':
+        from matplotlib.pyplot import style
+        return style
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PLOTS) | {'plots', 'style'})
@@ -7,5 +7,7 @@ from .kdeplot import kdeplot
 from .parallelplot import parallelplot
 from .posteriorplot import posteriorplot
 from .traceplot import traceplot
+from .tracemonitor import TraceMonitor
 from .pairplot import pairplot
 from .jointplot import jointplot
+from .report import render_report
@@ -2,10 +2,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 from .plot_utils import get_axis, _scale_text
 from ..utils import get_varnames, trace_to_dataframe
+from ..utils.profiling import timed
 
 
+@timed
 def autocorrplot(trace, varnames=None, max_lag=100, symmetric_plot=False, combined=False,
-                 figsize=None, textsize=None, skip_first=0, ax=None):
+                 figsize=None, textsize=None, skip_first=0, thin=1, ax=None):
     """
     Bar plot of the autocorrelation function for a trace.
 
@@ -30,6 +32,8 @@ def autocorrplot(trace, varnames=None, max_lag=100, symmetric_plot=False, combin
         Text size for labels, titles and lines. If None it will be autoscaled based on figsize.
     skip_first : int, optional
         Number of first samples not shown in plots (burn-in).
+    thin : int, optional
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     ax : axes, optional
         Matplotlib axes.
 
@@ -37,7 +41,7 @@ def autocorrplot(trace, varnames=None, max_lag=100, symmetric_plot=False, combin
     -------
     ax : matplotlib axes
     """
-    trace = trace_to_dataframe(trace[skip_first:], combined=combined)
+    trace = trace_to_dataframe(trace, combined=combined, skip_first=skip_first, thin=thin)
     varnames = get_varnames(trace, varnames)
 
     if figsize is None:
@@ -1,8 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from .plot_utils import _scale_text
+from ..utils.profiling import timed
 
 
+@timed
 def compareplot(comp_df, insample_dev=True, se=True, dse=True, figsize=None, textsize=None,
                 plot_kwargs=None, ax=None):
     """
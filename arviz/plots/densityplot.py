@@ -2,12 +2,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 from .kdeplot import fast_kde
 from ..stats import hpd
-from ..utils import trace_to_dataframe, expand_variable_names
-from .plot_utils import _scale_text
+from ..utils import trace_to_dataframe, get_varnames
+from .plot_utils import discrete_counts, plot_discrete_hist, _scale_text
+from ..utils.profiling import timed
 
+@timed
 def densityplot(trace, models=None, varnames=None, alpha=0.05, point_estimate='mean',
                 colors='cycle', outline=True, hpd_markers='', shade=0., bw=4.5, figsize=None,
-                textsize=None, skip_first=0, ax=None):
+                textsize=None, skip_first=0, thin=1, ax=None):
     """
     Generates KDE plots for continuous variables and histograms for discretes ones.
     Plots are truncated at their 100*(1-alpha)% credible intervals. Plots are grouped per variable
@@ -51,6 +53,8 @@ def densityplot(trace, models=None, varnames=None, alpha=0.05, point_estimate='m
         Text size for labels and legend. If None it will be autoscaled based on figsize.
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     ax : axes
         Matplotlib axes.
 
@@ -61,9 +65,10 @@ def densityplot(trace, models=None, varnames=None, alpha=0.05, point_estimate='m
 
     """
     if not isinstance(trace, (list, tuple)):
-        trace = [trace_to_dataframe(trace[skip_first:], combined=True)]
+        trace = [trace_to_dataframe(trace, combined=True, skip_first=skip_first, thin=thin)]
     else:
-        trace = [trace_to_dataframe(tr[skip_first:], combined=True) for tr in trace]
+        trace = [trace_to_dataframe(tr, combined=True, skip_first=skip_first, thin=thin)
+                 for tr in trace]
 
     if point_estimate not in ('mean', 'median', None):
         raise ValueError("Point estimate should be 'mean', 'median' or None")
@@ -86,18 +91,7 @@ def densityplot(trace, models=None, varnames=None, alpha=0.05, point_estimate='m
     elif isinstance(colors, str):
         colors = [colors for i in range(length_models)]
 
-    if varnames is None:
-        varnames = []
-        for tr in trace:
-            varnames_tmp = tr.columns
-            for v in varnames_tmp:
-                if v not in varnames:
-                    varnames.append(v)
-    else:
-        v_tmp = []
-        for tr in trace:
-            v_tmp.extend(expand_variable_names(tr, varnames))
-        varnames = np.unique(v_tmp)
+    varnames = list(dict.fromkeys(v for tr in trace for v in get_varnames(tr, varnames)))
 
     if figsize is None:
         figsize = (6, len(varnames) * 2)
@@ -167,11 +161,11 @@ def _d_helper(vec, vname, c, bw, textsize, lw, ms, alpha, point_estimate, hpd_ma
 
     else:
         xmin, xmax = hpd(vec, alpha)
-        bins = range(xmin, xmax + 2)
+        start, counts = discrete_counts(vec, xmin, xmax)
         if outline:
-            ax.hist(vec, bins=bins, color=c, histtype='step', align='left')
+            plot_discrete_hist(ax, start, counts, outline=True, color=c)
         if shade:
-            ax.hist(vec, bins=bins, color=c, alpha=shade)
+            plot_discrete_hist(ax, start, counts, color=c, alpha=shade)
 
     if hpd_markers:
         ax.plot(xmin, 0, 'v', color=c, markeredgecolor='k', markersize=ms)
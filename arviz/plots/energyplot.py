@@ -2,11 +2,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from .kdeplot import kdeplot
 from ..stats import bfmi as e_bfmi
-from ..utils import get_stats
+from ..utils import get_sampler_stats
+from ..utils.profiling import timed
 
 
+@timed
 def energyplot(trace, kind='kde', bfmi=True, figsize=None, legend=True, shade=(1, .75),
-               color_shade=('C0', 'C5'), bw=4.5, skip_first=0, kwargs_shade=None, ax=None,
+               color_shade=('C0', 'C5'), bw=4.5, skip_first=0, thin=1, kwargs_shade=None, ax=None,
                **kwargs):
     """Plot energy transition distribution and marginal energy distribution in
     order to diagnose poor exploration by HMC algorithms.
@@ -35,6 +37,8 @@ def energyplot(trace, kind='kde', bfmi=True, figsize=None, legend=True, shade=(1
         of thumb (the default rule used by SciPy). Only works if `kind='kde'`
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     kwargs_shade : dicts, optional
         Additional keywords passed to `fill_between` (to control the shade)
     ax : axes
@@ -45,7 +49,10 @@ def energyplot(trace, kind='kde', bfmi=True, figsize=None, legend=True, shade=(1
     ax : matplotlib axes
     """
 
-    energy = get_stats(trace[skip_first:], 'energy')
+    stats = get_sampler_stats(trace)
+    if 'energy' not in stats:
+        raise ValueError('The trace has no energy statistic')
+    energy = stats.get('energy', skip_first=skip_first, thin=thin)
 
     if figsize is None:
         figsize = (6, 6)
@@ -1,14 +1,18 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import gridspec
-from ..stats import hpd, gelman_rubin, effective_n
-from ..utils import trace_to_dataframe, expand_variable_names
+from ..stats import gelman_rubin, effective_n
+from ..stats.stats import _hpd_cnames, _quantile_cnames, _quantile_table
+from ..utils import trace_to_dataframe, VariableIndex
 from .plot_utils import _scale_text
+from ..utils.profiling import timed
 
 
+@timed
 def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rhat=True, neff=True,
                main=None, xtitle=None, xlim=None, ylabels=None, colors='C0', chain_spacing=0.1,
-               vline=0, figsize=None, textsize=None, skip_first=0, plot_kwargs=None, gs=None):
+               vline=0, figsize=None, textsize=None, skip_first=0, thin=1, plot_kwargs=None,
+               gs=None, summary_df=None):
     """
     Forest plot
 
@@ -56,11 +60,19 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
         Text size for labels. If None it will be autoscaled based on figsize.
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     plot_kwargs : dict, optional
         Optional arguments for plot elements. Currently accepts `fontsize`, `linewidth`, `marker`
         and `markersize`.
     gs : GridSpec
         Matplotlib GridSpec object. Defaults to None.
+    summary_df : DataFrame or list of DataFrames, optional
+        Precomputed statistics, one table per model, as returned by
+        `summary(trace, alpha=alpha, quantiles=[0.25, 0.5, 0.75])` (only the median quantile is
+        needed if `quartiles` is False). When provided the intervals are drawn from the table and
+        `trace` is ignored, so it can be None. Chains are not plotted separately and R-hat and n_eff
+        are taken from the `Rhat` and `n_eff` columns when present. Defaults to None.
 
     Returns
     -------
@@ -70,10 +82,13 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
     if plot_kwargs is None:
         plot_kwargs = {}
 
+    if summary_df is not None:
+        trace = summary_df
     if not isinstance(trace, (list, tuple)):
-        trace = [trace_to_dataframe(trace[skip_first:], combined=False)]
-    else:
-        trace = [trace_to_dataframe(tr[skip_first:], combined=False) for tr in trace]
+        trace = [trace]
+    if summary_df is None:
+        trace = [trace_to_dataframe(tr, combined=False, skip_first=skip_first, thin=thin)
+                 for tr in trace]
 
     if models is None:
         if len(trace) > 1:
@@ -94,24 +109,19 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
     else:
         qlist = [alpha / 2, 0.50, (1 - alpha / 2)]
 
-    nchains = [tr.columns.value_counts()[0] for tr in trace]
-
-    if varnames is None:
-        varnames = []
-        for tr in trace:
-            varnames_tmp = tr.columns
-            for v in varnames_tmp:
-                if v not in varnames:
-                    varnames.append(v)
+    if summary_df is None:
+        model_stats = [_stats_from_trace(tr, qlist, alpha, rhat, neff) for tr in trace]
     else:
-        v_tmp = []
-        for tr in trace:
-            v_tmp.extend(expand_variable_names(tr, varnames))
-        varnames = np.unique(v_tmp)
+        model_stats = [_stats_from_table(tr, qlist, alpha, rhat, neff) for tr in trace]
 
-    plot_rhat = [rhat and nch > 1 for nch in nchains]
-    plot_neff = [neff and nch > 1 for nch in nchains]
+    model_varnames = [list(stats) for stats in model_stats]
+    if varnames is not None:
+        model_varnames = [VariableIndex.from_columns(names).select(varnames)
+                          for names in model_varnames]
+    varnames = list(dict.fromkeys(v for names in model_varnames for v in names))
 
+    plot_rhat = [any(s['rhat'] is not None for s in stats.values()) for stats in model_stats]
+    plot_neff = [any(s['neff'] is not None for s in stats.values()) for stats in model_stats]
 
     if figsize is None:
         figsize = (6, len(varnames) * 2)
@@ -137,9 +147,8 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
             gr_rhat.set_title('R-hat', fontsize=textsize)
             gr_rhat.tick_params(labelsize=textsize)
         if np.any(plot_neff):
-            neffs = []
-            for tr in trace:
-                neffs.extend(effective_n(tr).values)
+            neffs = [s['neff'] for stats in model_stats for s in stats.values()
+                     if s['neff'] is not None]
             mins, maxs = round(min(neffs), -1),  round(max(neffs), -1)
             gr_neff = plt.subplot(gs[nsp-1])
             gr_neff.set_xticks((mins, maxs))
@@ -149,45 +158,23 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
     # Subplot for confidence intervals
     interval_plot = plt.subplot(gs[0])
 
-    trace_quantiles = []
-    hpd_intervals = []
-    for tr in trace:
-        trace_quantiles.append(tr.quantile(qlist))
-        hpd_intervals.append(tr.apply(lambda x: hpd(x, alpha)))
-
     labels = []
     var = 0
     all_quants = []
     bands = [(0.05, 0)[i % 2] for i in range(len(varnames))]
     var_old = 0.5
     for v_idx, v in enumerate(varnames):
-        for h, tr in enumerate(trace):
-            if plot_rhat[h]:
-                R = gelman_rubin(tr)
-            if plot_neff[h]:
-                n_e = effective_n(tr)
-            if v not in tr.columns:
+        for h, stats in enumerate(model_stats):
+            if v not in stats:
                 labels.append(models[h] + ' ' + v)
                 y = - var
                 var += 1
             else:
+                chain_quants = stats[v]['quants']
                 # Add spacing for each chain, if more than one
                 offset = [0] + [(chain_spacing * ((i + 2) / 2)) * (-1)
-                                ** i for i in range(nchains[h] - 1)]
-                for j in range(nchains[h]):
-                    if nchains[h] > 1:
-                        var_quantiles = trace_quantiles[h][v].iloc[:, j]
-                        var_hpd = hpd_intervals[h][v].iloc[j]
-                    else:
-                        var_quantiles = trace_quantiles[h][v]
-                        var_hpd = hpd_intervals[h][v]
-
-                    quants = var_quantiles.loc[np.unique(qlist)].values
-
-                    # Substitute HPD interval for quantile
-                    quants[0] = var_hpd[0]
-                    quants[-1] = var_hpd[1]
-
+                                ** i for i in range(len(chain_quants) - 1)]
+                for j, quants in enumerate(chain_quants):
                     # Ensure x-axis contains range of current interval
                     all_quants.extend(quants)
 
@@ -204,11 +191,12 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
                                                plot_kwargs)
 
                 # Genenerate Gelman-Rubin plot
-                if plot_rhat[h] and v in tr.columns:
-                    gr_rhat.plot(min(R[v], 2), -var, 'o', color=colors[h], markersize=ms)
+                if plot_rhat[h] and stats[v]['rhat'] is not None:
+                    gr_rhat.plot(min(stats[v]['rhat'], 2), -var, 'o', color=colors[h],
+                                 markersize=ms)
                 # Genenerate effective sample size plot
-                if plot_neff[h] and v in tr.columns:
-                    gr_neff.plot(n_e[v], -var, 'o', color=colors[h], markersize=ms)
+                if plot_neff[h] and stats[v]['neff'] is not None:
+                    gr_neff.plot(stats[v]['neff'], -var, 'o', color=colors[h], markersize=ms)
 
                 var += 1
 
@@ -279,6 +267,90 @@ def forestplot(trace, models=None, varnames=None, alpha=0.05, quartiles=True, rh
     return gs
 
 
+def _stats_from_trace(trace, qlist, alpha, rhat, neff):
+    """
+    Compute the statistics shown by the forestplot for every variable of a trace.
+
+    Parameters
+    ----------
+    trace : DataFrame
+        Trace with one column per variable and chain
+    qlist : list
+        Quantiles to compute, the first and last are replaced by the HPD interval
+    alpha : float
+        Alpha value for the HPD interval
+    rhat : bool
+        Whether to compute the Gelman-Rubin statistic
+    neff : bool
+        Whether to compute the effective sample size
+
+    Returns
+    -------
+    dict mapping each variable name to a dict with the per chain intervals (`quants`) and the
+    `rhat` and `neff` values (None when not computed)
+    """
+    nchains = trace.columns.value_counts()[0]
+    # HPD interval and quantiles of every chain of every variable, from one sort of the samples
+    cnames = _hpd_cnames(alpha)
+    cnames[1:1] = _quantile_cnames(qlist[1:-1])
+    intervals = _quantile_table(trace.values, alpha, qlist[1:-1])[cnames].values
+
+    R = gelman_rubin(trace) if rhat and nchains > 1 else {}
+    n_e = effective_n(trace) if neff and nchains > 1 else {}
+
+    chain_columns = {}
+    for col, v in enumerate(trace.columns):
+        chain_columns.setdefault(v, []).append(col)
+
+    stats = {}
+    for v, cols in chain_columns.items():
+        stats[v] = {'quants': list(intervals[cols]), 'rhat': R.get(v), 'neff': n_e.get(v)}
+
+    return stats
+
+
+def _stats_from_table(summary_df, qlist, alpha, rhat, neff):
+    """
+    Read the statistics shown by the forestplot from a table returned by `summary`.
+
+    Parameters
+    ----------
+    summary_df : DataFrame
+        Summary statistics, one row per variable
+    qlist : list
+        Quantiles to plot, the first and last are replaced by the HPD interval
+    alpha : float
+        Alpha value for the HPD interval
+    rhat : bool
+        Whether to read the Gelman-Rubin statistic
+    neff : bool
+        Whether to read the effective sample size
+
+    Returns
+    -------
+    dict mapping each variable name to a dict with a single interval (`quants`) and the `rhat`
+    and `neff` values (None when not available)
+    """
+    cnames = _hpd_cnames(alpha)
+    cnames[1:1] = _quantile_cnames(qlist[1:-1])
+    missing = [c for c in cnames if c not in summary_df.columns]
+    if missing:
+        raise ValueError('The summary table lacks the columns {}, compute it with '
+                         'summary(trace, alpha={:g}, quantiles={})'.format(
+                             missing, alpha, qlist[1:-1]))
+
+    rhat = rhat and 'Rhat' in summary_df.columns
+    neff = neff and 'n_eff' in summary_df.columns
+
+    stats = {}
+    for v, row in summary_df.iterrows():
+        stats[v] = {'quants': [row[cnames].values.astype(float)],
+                    'rhat': row['Rhat'] if rhat else None,
+                    'neff': row['n_eff'] if neff else None}
+
+    return stats
+
+
 def _plot_tree(ax, y, ntiles, show_quartiles, c, linewidth, ms, plot_kwargs):
     """Helper to plot errorbars for the forestplot.
 
@@ -4,10 +4,12 @@ from matplotlib.ticker import NullFormatter
 from .kdeplot import kdeplot
 from ..utils import trace_to_dataframe
 from .plot_utils import _scale_text, get_bins
+from ..utils.profiling import timed
 
 
+@timed
 def jointplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter', gridsize='auto',
-              skip_first=0, joint_kwargs=None, marginal_kwargs=None):
+              skip_first=0, thin=1, joint_kwargs=None, marginal_kwargs=None):
     """
     Plot a scatter or hexbin of two variables with their respective marginals distributions.
 
@@ -34,6 +36,8 @@ def jointplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
         in the x-direction and the y-direction.
     skip_first : int
         Number of first samples not shown in plots (burn-in)
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     joint_shade : dicts, optional
         Additional keywords modifying the join distribution (central subplot)
     marginal_shade : dicts, optional
@@ -45,7 +49,7 @@ def jointplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
     axHistx : matplotlib axes, x (top) distribution
     axHisty : matplotlib axes, y (right) distribution
     """
-    trace = trace_to_dataframe(trace[skip_first:] , combined=True)
+    trace = trace_to_dataframe(trace, combined=True, skip_first=skip_first, thin=thin)
 
     if figsize is None:
         figsize = (6, 6)
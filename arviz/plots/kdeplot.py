@@ -2,8 +2,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import gaussian, convolve
 from scipy.stats import entropy
+from ..utils.profiling import timed
+from ..utils.precision import as_float
 
 
+@timed
 def kdeplot(values, label=None, shade=0, color_shade=None, bw=4.5, rotated=False,
             ax=None, kwargs_shade=None, **kwargs):
     """
@@ -36,11 +39,19 @@ def kdeplot(values, label=None, shade=0, color_shade=None, bw=4.5, rotated=False
     if ax is None:
         _, ax = plt.subplots()
 
+    density, l, u = fast_kde(values, bw)
+    x = np.linspace(l, u, len(density))
+
+    return _draw_kde(x, density, ax, label=label, shade=shade, color_shade=color_shade,
+                     rotated=rotated, kwargs_shade=kwargs_shade, **kwargs)
+
+
+def _draw_kde(x, density, ax, label=None, shade=0, color_shade=None, rotated=False,
+              kwargs_shade=None, **kwargs):
+    """Draw the `density` evaluated at `x` as `kdeplot` does, for a KDE already computed."""
     if kwargs_shade is None:
         kwargs_shade = {}
 
-    density, l, u = fast_kde(values, bw)
-    x = np.linspace(l, u, len(density))
     if rotated:
         x, density = density, x
 
@@ -56,6 +67,7 @@ def kdeplot(values, label=None, shade=0, color_shade=None, bw=4.5, rotated=False
     return ax
 
 
+@timed
 def fast_kde(x, bw=4.5):
     """
     A fft-based Gaussian kernel density estimate (KDE)
@@ -75,7 +87,7 @@ def fast_kde(x, bw=4.5):
     xmin: minimum value of x
     xmax: maximum value of x
     """
-    x = np.asarray(x, dtype=float)
+    x = as_float(x)
     x = x[np.isfinite(x)]
     n = len(x)
     nx = 200
@@ -88,6 +100,14 @@ def fast_kde(x, bw=4.5):
         std_x = 0.
     grid, _ = np.histogram(x, bins=nx)
 
+    density = _grid_kde(grid, n, dx, std_x).astype(x.dtype, copy=False)
+
+    return density, xmin, xmax
+
+
+def _grid_kde(grid, n, dx, std_x):
+    """Smooth the histogram `grid` of `n` points, in bins of width `dx`, with a Gaussian kernel."""
+    nx = len(grid)
     scotts_factor = n ** (-0.2)
     kern_nx = int(scotts_factor * 2 * np.pi * std_x)
     kernel = gaussian(kern_nx, scotts_factor * std_x)
@@ -98,6 +118,4 @@ def fast_kde(x, bw=4.5):
 
     norm_factor = n * dx * (2 * np.pi * std_x ** 2 * scotts_factor ** 2) ** 0.5
 
-    density = density / norm_factor
-
-    return density, xmin, xmax
+    return density / norm_factor
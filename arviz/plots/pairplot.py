@@ -1,12 +1,15 @@
 import matplotlib.pyplot as plt
 from matplotlib import gridspec
 from matplotlib.ticker import NullFormatter
-from ..utils import trace_to_dataframe, get_stats, get_varnames
+from ..utils import trace_to_dataframe, get_sampler_stats, get_varnames
 from .plot_utils import _scale_text
+from ..utils.profiling import timed
 
 
+@timed
 def pairplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter', gridsize='auto',
-             divergences=False, skip_first=0, gs=None, ax=None, kwargs_divergences=None, **kwargs):
+             divergences=False, skip_first=0, thin=1, gs=None, ax=None, kwargs_divergences=None,
+             **kwargs):
     """
     Plot a scatter or hexbin matrix of the sampled parameters.
 
@@ -32,6 +35,8 @@ def pairplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
         If True divergences will be plotted in a diferent color
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     gs : Grid spec
         Matplotlib Grid spec.
     kwargs_divergences : dicts, optional
@@ -49,9 +54,9 @@ def pairplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
         raise ValueError('Plot type {} not recognized.'.format(kind))
 
     if divergences:
-        divergent = get_stats(trace[skip_first:] , 'diverging')
+        divergent = get_sampler_stats(trace).divergences(skip_first=skip_first, thin=thin)
 
-    trace = trace_to_dataframe(trace[skip_first:] , combined=True)
+    trace = trace_to_dataframe(trace, combined=True, skip_first=skip_first, thin=thin)
     varnames = get_varnames(trace, varnames)
 
     if kwargs_divergences is None:
@@ -80,7 +85,7 @@ def pairplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
             ax.grid(False)
 
         if divergences:
-            ax.scatter(trace[varnames[0]][divergent], trace[varnames[1]][divergent],
+            ax.scatter(trace[varnames[0]].iloc[divergent], trace[varnames[1]].iloc[divergent],
                        s=ms, **kwargs_divergences)
 
         ax.set_xlabel('{}'.format(varnames[0]), fontsize=textsize)
@@ -106,7 +111,8 @@ def pairplot(trace, varnames=None, figsize=None, textsize=None, kind='scatter',
                     ax.grid(False)
 
                 if divergences:
-                    ax.scatter(var1[divergent], var2[divergent], s=ms, **kwargs_divergences)
+                    ax.scatter(var1.iloc[divergent], var2.iloc[divergent], s=ms,
+                               **kwargs_divergences)
 
                 if j + 1 != numvars - 1:
                     ax.axes.get_xaxis().set_major_formatter(NullFormatter())
@@ -1,11 +1,13 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from ..utils import trace_to_dataframe, get_varnames, get_stats
+from ..utils import trace_to_dataframe, get_varnames, get_sampler_stats
 from .plot_utils import _scale_text
+from ..utils.profiling import timed
 
 
+@timed
 def parallelplot(trace, varnames=None, figsize=None, textsize=None, legend=True, colornd='k',
-                 colord='C1', shadend=.025, skip_first=0, ax=None):
+                 colord='C1', shadend=.025, skip_first=0, thin=1, ax=None):
     """
     A parallel coordinates plot showing posterior points with and without divergences
 
@@ -31,6 +33,8 @@ def parallelplot(trace, varnames=None, figsize=None, textsize=None, legend=True,
         Defaults to .025
     skip_first : int, optional
         Number of first samples not shown in plots (burn-in).
+    thin : int, optional
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     ax : axes
         Matplotlib axes.
 
@@ -38,8 +42,12 @@ def parallelplot(trace, varnames=None, figsize=None, textsize=None, legend=True,
     -------
     ax : matplotlib axes
     """
-    divergent = get_stats(trace[skip_first:], 'diverging')
-    trace = trace_to_dataframe(trace[skip_first:])
+    stats = get_sampler_stats(trace)
+    if 'diverging' in stats:
+        divergent = stats.divergences(skip_first=skip_first, thin=thin)
+    else:
+        divergent = np.array([], dtype=int)
+    trace = trace_to_dataframe(trace, skip_first=skip_first, thin=thin)
     varnames = get_varnames(trace, varnames)
 
     if len(varnames) < 2:
@@ -56,9 +64,10 @@ def parallelplot(trace, varnames=None, figsize=None, textsize=None, legend=True,
     if ax is None:
         _, ax = plt.subplots(figsize=figsize)
 
-    ax.plot(trace.values[divergent == 0].T, color=colornd, alpha=shadend)
-    if np.any(divergent):
-        ax.plot(trace.values[divergent == 1].T, color=colord, lw=1)
+    values = trace.values
+    ax.plot(np.delete(values, divergent, axis=0).T, color=colornd, alpha=shadend)
+    if len(divergent):
+        ax.plot(values[divergent].T, color=colord, lw=1)
 
     ax.tick_params(labelsize=textsize)
     ax.set_xticks(range(trace.shape[1]))
@@ -66,7 +75,7 @@ def parallelplot(trace, varnames=None, figsize=None, textsize=None, legend=True,
 
     if legend:
         ax.plot([], color=colornd, label='non-divergent')
-        if np.any(divergent):
+        if len(divergent):
             ax.plot([], color=colord, label='divergent')
         ax.legend(fontsize=textsize)
 
@@ -62,3 +62,176 @@ def get_bins(x, max_bins=50, n=2):
     else:
         bins = range(x_min, x_max + n)
     return bins
+
+
+def decimate(y, n_points, method='minmax'):
+    """
+    Reduce the number of points of the line plot of each column of `y`.
+
+    Parameters
+    ----------
+    y : array
+        2D array, the values of each line are in a column, plotted against their row index
+    n_points : int
+        Maximum number of points kept per line, e.g. twice the width in pixels of the plot
+    method : str
+        `minmax` keeps the minimum and the maximum of each of `n_points / 2` buckets of
+        consecutive rows, so the envelope of the line and its outliers are drawn exactly.
+        `lttb` (largest triangle three buckets) keeps the point of each bucket forming the
+        largest triangle with the points kept in the neighbouring buckets.
+
+    Returns
+    -------
+    x : array
+        Row index of the points kept, with the same shape as the returned values
+    y : array
+        Values of the points kept
+    """
+    y = np.asarray(y)
+    n_rows, n_cols = y.shape
+    if method not in ('minmax', 'lttb'):
+        raise ValueError('Decimation method {} not recognized. Use minmax or lttb'.format(method))
+    if n_points < 4 or n_rows <= n_points:
+        x = np.broadcast_to(np.arange(n_rows)[:, None], y.shape)
+        return x, y
+    if method == 'minmax':
+        x = _decimate_minmax(y, n_points // 2)
+    else:
+        x = _decimate_lttb(y, n_points)
+    return x, np.take_along_axis(y, x, axis=0)
+
+
+def _decimation_points(ax, method='minmax'):
+    """
+    Number of points kept by `decimate` for a line drawn in `ax`: twice (`minmax`) or once
+    (`lttb`) the width of the axes in pixels, at the dpi of the figure or at `savefig.dpi` if it
+    is higher.
+    """
+    dpi = ax.get_figure().dpi
+    savefig_dpi = plt.rcParams['savefig.dpi']
+    scale = max(1., savefig_dpi / dpi) if isinstance(savefig_dpi, (int, float)) else 1.
+    pixels = int(np.ceil(ax.bbox.width * scale))
+    return 2 * pixels if method == 'minmax' else pixels
+
+
+def _decimate_minmax(y, n_buckets):
+    """Row index of the minimum and maximum of each bucket of rows, in order."""
+    n_rows, n_cols = y.shape
+    size = -(-n_rows // n_buckets)
+    full = n_rows - n_rows % size
+    buckets = y[:full].reshape(-1, size, n_cols)
+    start = np.arange(0, full, size)[:, None]
+    x_min = start + buckets.argmin(axis=1)
+    x_max = start + buckets.argmax(axis=1)
+    if full < n_rows:
+        x_min = np.vstack([x_min, full + y[full:].argmin(axis=0)])
+        x_max = np.vstack([x_max, full + y[full:].argmax(axis=0)])
+    x = np.stack([np.minimum(x_min, x_max), np.maximum(x_min, x_max)], axis=1)
+    return x.reshape(-1, n_cols)
+
+
+def _decimate_lttb(y, n_points):
+    """Row index of the points selected by the largest triangle three buckets algorithm."""
+    n_rows, n_cols = y.shape
+    # The first and last rows are kept, the others are split in n_points - 2 buckets
+    edges = np.linspace(1, n_rows - 1, n_points - 1).astype(int)
+    columns = np.arange(n_cols)
+    x = np.empty((n_points, n_cols), dtype=int)
+    x[0] = 0
+    x[-1] = n_rows - 1
+    for i in range(n_points - 2):
+        lower, upper = edges[i], edges[i + 1]
+        if i < n_points - 3:
+            next_x = (edges[i + 1] + edges[i + 2] - 1) / 2
+            next_y = y[edges[i + 1]:edges[i + 2]].mean(axis=0)
+        else:
+            next_x, next_y = n_rows - 1, y[-1]
+        prev_x = x[i]
+        prev_y = y[prev_x, columns]
+        rows = np.arange(lower, upper)[:, None]
+        # twice the area of the triangle formed with the previous and next points
+        area = np.abs((prev_x - next_x) * (y[lower:upper] - prev_y) -
+                      (prev_x - rows) * (next_y - prev_y))
+        x[i + 1] = lower + area.argmax(axis=0)
+    return x
+
+
+def discrete_counts(values, lower=None, upper=None, width=1):
+    """
+    Count the integers of each column of `values` in bins of `width` consecutive integers.
+
+    All the columns are counted at once, by a single `np.bincount` of the values offset by
+    column.
+
+    Parameters
+    ----------
+    values : array
+        1D or 2D array of integers, one histogram per column
+    lower : int, optional
+        First integer counted. Defaults to the minimum of `values`.
+    upper : int, optional
+        Last integer counted. Defaults to the maximum of `values`. Values outside of
+        `[lower, upper]` are not counted.
+    width : int
+        Number of consecutive integers per bin. Defaults to 1.
+
+    Returns
+    -------
+    start : array
+        First integer of each bin
+    counts : array
+        2D array with the counts of each bin (rows) in each column of `values`
+    """
+    values = np.asarray(values)
+    values = values.reshape(len(values), -1)
+    if lower is None:
+        lower = values.min()
+    if upper is None:
+        upper = values.max()
+    n_bins = (upper - lower) // width + 1
+    n_cols = values.shape[1]
+    kept = (values >= lower) & (values <= upper)
+    bins = (values - lower) // width + np.arange(n_cols) * n_bins
+    counts = np.bincount(bins[kept], minlength=n_bins * n_cols)
+    return lower + width * np.arange(n_bins), counts.reshape(n_cols, n_bins).T
+
+
+def plot_discrete_hist(ax, start, counts, width=1, outline=False, **kwargs):
+    """
+    Draw histograms of integers from `discrete_counts`, each as a single artist.
+
+    The bin of integers `[s, s + width - 1]` spans `[s - 0.5, s + width - 0.5]`, so bins of single
+    integers are centred on them.
+
+    Parameters
+    ----------
+    ax : matplotlib axes
+    start : array
+        First integer of each bin
+    counts : array
+        1D or 2D array of counts (or densities), one histogram per column
+    width : int
+        Number of consecutive integers per bin. Defaults to 1.
+    outline : bool
+        Draw the outline of the histograms (one line each) instead of filling them (one polygon
+        each).
+    **kwargs
+        Passed to `ax.plot` if `outline`, to `ax.fill_between` otherwise.
+
+    Returns
+    -------
+    artists : list
+        One Line2D or PolyCollection per histogram
+    """
+    counts = np.asarray(counts).reshape(len(start), -1)
+    edges = np.append(start, start[-1] + width) - 0.5
+    artists = []
+    for column in counts.T:
+        if outline:
+            # up and down the sides of the bins, as `hist(histtype='step')`
+            heights = np.concatenate([[0], np.repeat(column, 2), [0]])
+            artists.extend(ax.plot(np.repeat(edges, 2), heights, **kwargs))
+        else:
+            artists.append(ax.fill_between(edges, np.append(column, column[-1]), step='post',
+                                           **kwargs))
+    return artists
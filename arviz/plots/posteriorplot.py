@@ -1,16 +1,18 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.stats import mode
-from . import kdeplot
-from .kdeplot import fast_kde
-from ..stats import hpd
+from .kdeplot import fast_kde, _draw_kde
+from ..stats.stats import _hpd_cnames, _hpd_sorted, _quantile_cnames
 from ..utils import trace_to_dataframe, expand_variable_names
-from .plot_utils import  _scale_text
+from ..utils.precision import as_compute
+from .plot_utils import discrete_counts, plot_discrete_hist, _scale_text
+from ..utils.profiling import timed
 
 
+@timed
 def posteriorplot(trace, varnames=None, figsize=None, textsize=None, alpha=0.05, round_to=1,
                   point_estimate='mean', rope=None, ref_val=None, kind='kde', bw=4.5, bins=None,
-                  skip_first=0, ax=None, **kwargs):
+                  skip_first=0, thin=1, ax=None, summary_df=None, **kwargs):
     """
     Plot Posterior densities in the style of John K. Kruschke's book.
 
@@ -49,10 +51,19 @@ def posteriorplot(trace, varnames=None, figsize=None, textsize=None, alpha=0.05,
         `range(xmin, xmax + 1)` for discrete variables.
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     ax : axes
         Matplotlib axes. Defaults to None.
+    summary_df : DataFrame, optional
+        Precomputed statistics as returned by `summary(trace, alpha=alpha)`, with one row per
+        plotted variable. When provided the HPD interval and the point estimate are read from the
+        table instead of being computed from the samples, which are then only used to draw the
+        density. The `median` point estimate requires the `q_50` column (`quantiles=[0.5]`) and
+        the `mode` one the `mode` column (`kde_mode=True`). Defaults to None.
     **kwargs
-        Passed as-is to plt.hist() or plt.plot() function depending on the value of `kind`.
+        Passed as-is to kdeplot() or plt.hist() function depending on the value of `kind`, or
+        to plt.fill_between() for the histograms of discrete variables with `bins=None`.
 
     Returns
     -------
@@ -60,7 +71,7 @@ def posteriorplot(trace, varnames=None, figsize=None, textsize=None, alpha=0.05,
 
     """
 
-    trace = trace_to_dataframe(trace[skip_first:], combined=True)
+    trace = trace_to_dataframe(trace, combined=True, skip_first=skip_first, thin=thin)
 
     if varnames is not None:
         varnames = expand_variable_names(trace, varnames)
@@ -85,10 +96,17 @@ def posteriorplot(trace, varnames=None, figsize=None, textsize=None, alpha=0.05,
     elif np.ndim(rope) == 1:
         rope = [rope] * var_num
 
+    if summary_df is not None:
+        missing = [v for v in trace.columns if v not in summary_df.index]
+        if missing:
+            raise ValueError('The summary table lacks the variables {}'.format(missing))
+
     for idx, (a, v) in enumerate(zip(np.atleast_1d(ax), trace.columns)):
+        stats = summary_df.loc[v] if summary_df is not None else None
         _plot_posterior_op(trace[v], ax=a, bw=bw, linewidth=linewidth, bins=bins, kind=kind,
                            point_estimate=point_estimate, round_to=round_to, alpha=alpha,
-                           ref_val=ref_val[idx], rope=rope[idx], textsize=textsize, **kwargs)
+                           ref_val=ref_val[idx], rope=rope[idx], textsize=textsize, stats=stats,
+                           **kwargs)
         a.set_title(v, fontsize=textsize)
 
     plt.tight_layout()
@@ -96,21 +114,49 @@ def posteriorplot(trace, varnames=None, figsize=None, textsize=None, alpha=0.05,
 
 
 def _plot_posterior_op(trace_values, ax, bw, linewidth, bins, kind, point_estimate, round_to,
-                       alpha, ref_val, rope, textsize, **kwargs):
+                       alpha, ref_val, rope, textsize, stats=None, **kwargs):
     """
     Artist to draw posterior.
+
+    If `stats` (a row of a summary table) is provided, the HPD interval and the point estimate are
+    read from it instead of being computed from `trace_values`.
+
+    The samples are read in a single pass: the KDE (or the counts of a discrete variable) drawn is
+    also used for the mode, and one sorted copy of the samples gives the HPD interval, the median
+    and the probabilities below and above `ref_val`.
     """
+    values = trace_values.values
+    n = len(values)
+    continuous = values.dtype.kind == 'f'
+    discrete = values.dtype.kind == 'i'
+    needs_mode = point_estimate == 'mode' and stats is None
+
+    if continuous and (kind == 'kde' or needs_mode):
+        density, lower, upper = fast_kde(values, bw)
+        x = np.linspace(lower, upper, len(density))
+    if discrete and (bins is None or needs_mode):
+        start, counts = discrete_counts(values)
+    if stats is None or ref_val is not None:
+        sorted_values = np.sort(as_compute(values))
+    if point_estimate == 'mean' or ref_val is not None:
+        mean = values.mean(dtype=np.float64)
+
+    def from_stats(column):
+        if column not in stats.index:
+            raise ValueError('The summary table lacks the column {}'.format(column))
+        return stats[column]
+
     def format_as_percent(x, round_to=0):
         return '{0:.{1:d}f}%'.format(100 * x, round_to)
 
     def display_ref_val(ref_val):
-        less_than_ref_probability = (trace_values < ref_val).mean()
-        greater_than_ref_probability = (trace_values >= ref_val).mean()
+        less_than_ref_probability = np.searchsorted(sorted_values, ref_val, side='left') / n
+        greater_than_ref_probability = 1 - less_than_ref_probability
         ref_in_posterior = "{} <{:g}< {}".format(format_as_percent(less_than_ref_probability, 1),
                                                  ref_val,
                                                  format_as_percent(greater_than_ref_probability, 1))
         ax.axvline(ref_val, ymin=0.02, ymax=.75, color='C1', lw=linewidth, alpha=0.65)
-        ax.text(trace_values.mean(), plot_height * 0.6, ref_in_posterior, size=textsize,
+        ax.text(mean, plot_height * 0.6, ref_in_posterior, size=textsize,
                 color='C1', horizontalalignment='center')
 
     def display_rope(rope):
@@ -126,24 +172,31 @@ def _plot_posterior_op(trace_values, ax, bw, linewidth, bins, kind, point_estima
         if point_estimate not in ('mode', 'mean', 'median'):
             raise ValueError(
                 "Point Estimate should be in ('mode','mean','median')")
-        if point_estimate == 'mean':
-            point_value = trace_values.mean()
+        if stats is not None:
+            column = {'mean': 'mean', 'mode': 'mode',
+                      'median': _quantile_cnames([0.5])[0]}[point_estimate]
+            point_value = from_stats(column)
+        elif point_estimate == 'mean':
+            point_value = mean
         elif point_estimate == 'mode':
-            if isinstance(trace_values.iloc[0], float):
-                density, l, u = fast_kde(trace_values, bw)
-                x = np.linspace(l, u, len(density))
+            if continuous:
                 point_value = x[np.argmax(density)]
+            elif discrete:
+                point_value = start[np.argmax(counts)]
             else:
                 point_value = mode(trace_values.round(round_to))[0][0]
         elif point_estimate == 'median':
-            point_value = np.median(trace_values)
+            point_value = 0.5 * (sorted_values[(n - 1) // 2] + sorted_values[n // 2])
         point_text = '{}={:.{}f}'.format(point_estimate, point_value, round_to)
 
         ax.text(point_value, plot_height * 0.8, point_text, size=textsize,
                 horizontalalignment='center')
 
     def display_hpd():
-        hpd_intervals = hpd(trace_values, alpha=alpha)
+        if stats is not None:
+            hpd_intervals = np.array([from_stats(c) for c in _hpd_cnames(alpha)])
+        else:
+            hpd_intervals = np.array(_hpd_sorted(sorted_values, alpha))
         ax.plot(hpd_intervals, (plot_height * 0.02, plot_height * 0.02), lw=linewidth, color='k')
         ax.text(hpd_intervals[0], plot_height * 0.07,
                 hpd_intervals[0].round(round_to),
@@ -170,18 +223,17 @@ def _plot_posterior_op(trace_values, ax, bw, linewidth, bins, kind, point_estima
         if key not in d:
             d[key] = value
 
-    if kind == 'kde' and isinstance(trace_values.iloc[0], float):
-        kdeplot(trace_values, alpha=kwargs.pop('alpha', 1), bw=bw, ax=ax, lw=linewidth, **kwargs)
+    if kind == 'kde' and continuous:
+        _draw_kde(x, density, ax, alpha=kwargs.pop('alpha', 1), lw=linewidth, **kwargs)
+
+    elif bins is None and discrete:
+        set_key_if_doesnt_exist(kwargs, 'color', 'C0')
+        plot_discrete_hist(ax, start, counts, alpha=0.35, **kwargs)
+        ax.set_xlim(start[0] - 0.5, start[-1] + 0.5)
 
     else:
         if bins is None:
-            if trace_values.dtype.kind == 'i':
-                xmin = trace_values.min()
-                xmax = trace_values.max()
-                bins = range(xmin, xmax + 2)
-                ax.set_xlim(xmin - 0.5, xmax + 0.5)
-            else:
-                bins = 'auto'
+            bins = 'auto'
         set_key_if_doesnt_exist(kwargs, 'align', 'left')
         set_key_if_doesnt_exist(kwargs, 'color', 'C0')
         ax.hist(trace_values, bins=bins, alpha=0.35, **kwargs)
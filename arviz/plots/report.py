@@ -0,0 +1,157 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from ..utils import get_sampler_stats, get_varnames, trace_to_dataframe
+from ..utils.profiling import timed
+
+# Plots that can be rendered from the samples alone
+_REPORT_PLOTS = ['autocorrplot', 'densityplot', 'forestplot', 'jointplot', 'pairplot',
+                 'parallelplot', 'posteriorplot', 'traceplot']
+# Plots drawing the divergent draws of a PyMC3 trace
+_DIVERGENCE_PLOTS = ['pairplot', 'parallelplot']
+
+# Trace and divergences shared with the processes of the pool, set by `_init_worker`
+_WORKER_TRACE = None
+_WORKER_DIVERGING = None
+
+
+@timed
+def render_report(trace, specs, directory, fmt='png', dpi=None, n_jobs=1):
+    """
+    Render a batch of plots of a trace and save them to files.
+
+    With more than one job the plots are rendered by a pool of processes using the Agg backend.
+    The samples are written once to memory-mapped files in a temporary directory, that every
+    process maps read-only instead of receiving a pickled copy of the trace. The `diverging`
+    statistic of a PyMC3 trace is kept for `pairplot` and `parallelplot`.
+
+    Parameters
+    ----------
+    trace : Pandas DataFrame or PyMC3 trace
+        Posterior samples
+    specs : list of dicts
+        One dictionary per figure with the name of the plot under `plot` (one of
+        `autocorrplot`, `densityplot`, `forestplot`, `jointplot`, `pairplot`, `parallelplot`,
+        `posteriorplot` or `traceplot`), an optional `filename` relative to `directory`, and the
+        keyword arguments of the plot, e.g. `{'plot': 'traceplot', 'varnames': ['mu']}`.
+        Defaults to `{index}_{plot}.{fmt}` for figures without filename.
+    directory : str
+        Directory where the figures are saved, created if needed.
+    fmt : str
+        Format of the figures without filename. Defaults to png.
+    dpi : float, optional
+        Resolution of the saved figures. Defaults to the matplotlib `savefig.dpi` setting.
+    n_jobs : int
+        Number of processes rendering the figures. If None, one per CPU. Defaults to 1.
+
+    Returns
+    -------
+    paths : list of str
+        Path of the saved figures, in the order of `specs`.
+    """
+    specs = [dict(spec) for spec in specs]
+    for i, spec in enumerate(specs):
+        plot = spec.get('plot')
+        if plot not in _REPORT_PLOTS:
+            raise ValueError('Plot {} not recognized. Use one of {}'.format(plot, _REPORT_PLOTS))
+        spec.setdefault('filename', '{:03d}_{}.{}'.format(i, plot, fmt))
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(spec, os.path.join(directory, spec.pop('filename')), dpi) for spec in specs]
+
+    diverging = None
+    if any(spec['plot'] in _DIVERGENCE_PLOTS for spec in specs):
+        diverging = _diverging_dataframe(trace)
+    trace = trace_to_dataframe(trace, combined=False)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(jobs))
+    if n_jobs <= 1:
+        return [_render(trace, diverging, *job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with tempfile.TemporaryDirectory() as store:
+        blocks = _save_blocks(trace, store, 'block')
+        diverging_blocks = None if diverging is None else _save_blocks(diverging, store,
+                                                                       'diverging')
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(blocks, diverging_blocks)) as executor:
+            return list(executor.map(_render_job, jobs))
+
+
+def _diverging_dataframe(trace):
+    """
+    The `diverging` statistic of a PyMC3 trace as a DataFrame with one `diverging` column per
+    chain, None for a DataFrame or a trace without it.
+    """
+    if type(trace).__name__ != 'MultiTrace':
+        return None
+    stats = get_sampler_stats(trace)
+    if 'diverging' not in stats:
+        return None
+    chains = stats.chains('diverging')
+    diverging = np.zeros((max(len(chain) for chain in chains), len(chains)), dtype=bool)
+    for j, chain in enumerate(chains):
+        diverging[:len(chain), j] = chain
+    return pd.DataFrame(diverging, columns=['diverging'] * len(chains))
+
+
+def _save_blocks(trace, store, prefix):
+    """
+    Save the columns of `trace` to one `.npy` file per run of consecutive columns of the same
+    dtype, return the files and columns.
+    """
+    blocks = []
+    dtypes = trace.dtypes.values
+    starts = [0] + [j for j in range(1, len(dtypes)) if dtypes[j] != dtypes[j - 1]]
+    for k, (start, stop) in enumerate(zip(starts, starts[1:] + [len(dtypes)])):
+        path = os.path.join(store, '{}{}.npy'.format(prefix, k))
+        np.save(path, trace.iloc[:, start:stop].values)
+        blocks.append((path, trace.columns[start:stop]))
+    return blocks
+
+
+def _load_blocks(blocks):
+    """DataFrame of the memory-mapped blocks saved by `_save_blocks`, in the original order."""
+    var_dfs = [pd.DataFrame(np.load(path, mmap_mode='r'), columns=columns, copy=False)
+               for path, columns in blocks]
+    return var_dfs[0] if len(var_dfs) == 1 else pd.concat(var_dfs, axis=1, copy=False)
+
+
+def _init_worker(blocks, diverging_blocks):
+    global _WORKER_TRACE, _WORKER_DIVERGING
+    import matplotlib
+    matplotlib.use('Agg')
+    _WORKER_TRACE = _load_blocks(blocks)
+    _WORKER_DIVERGING = None if diverging_blocks is None else _load_blocks(diverging_blocks)
+
+
+def _render_job(job):
+    return _render(_WORKER_TRACE, _WORKER_DIVERGING, *job)
+
+
+def _render(trace, diverging, spec, path, dpi):
+    """
+    Draw one plot of `trace` in a new figure, save it to `path` and close the figure. The
+    `diverging` columns, if any, are added to the trace of the plots drawing the divergences.
+    """
+    import matplotlib.pyplot as plt
+    from .. import plots
+
+    kwargs = dict(spec)
+    name = kwargs.pop('plot')
+    plot = getattr(plots, name)
+    if diverging is not None and name in _DIVERGENCE_PLOTS:
+        if kwargs.get('varnames') is None:
+            kwargs['varnames'] = get_varnames(trace, None)
+        trace = pd.concat([trace, diverging], axis=1, copy=False)
+    figures = set(plt.get_fignums())
+    try:
+        plot(trace, **kwargs)
+        plt.gcf().savefig(path, dpi=dpi)
+    finally:
+        # close every figure opened by the plot, including those left behind by a failure
+        for num in set(plt.get_fignums()) - figures:
+            plt.close(num)
+    return path
@@ -0,0 +1,294 @@
+import numpy as np
+from .kdeplot import _grid_kde
+from .plot_utils import get_axis, decimate, _decimation_points, _scale_text
+from ..utils import get_varnames, trace_to_dataframe
+
+
+class TraceMonitor(object):
+    """
+    Trace plot updated in place while the samples are drawn.
+
+    The figure is created with the first draws, the following draws update the data of the
+    existing lines. The densities are kernel density estimates of running histograms, updated
+    with the new draws only. When the limits of the axes do not change, only the lines are
+    redrawn over a saved background.
+
+    Parameters
+    ----------
+    varnames : list of variable names
+        Variables to be plotted, if None all variable are plotted
+    figsize : figure size tuple
+        If None, size is (12, num of variables * 2) inch
+    textsize: int
+        Text size for labels and titles. If None it will be autoscaled based on figsize.
+    grid : bool
+        Flag for adding gridlines to the densities. Defaults to True.
+    shade : float
+        Alpha blending value for the sample values. Defaults to 0.35.
+    bw : float
+        Bandwidth scaling factor for the KDE. Should be larger than 0. The higher this number the
+        smoother the KDE will be. Defaults to 4.5.
+    decimation : str or None
+        How the lines of the sample values are decimated, `minmax` (default), `lttb` or None.
+        See `traceplot`.
+
+    Examples
+    --------
+
+    .. code:: ipython
+
+        >>> monitor = az.plots.TraceMonitor(varnames=['mu', 'tau'])
+        >>> for draws in chunks:  # DataFrames of new draws, one column per chain
+        ...     monitor.append(draws)
+
+    A growing PyMC3 trace can be passed to `update`, which shows the draws not shown yet.
+    """
+
+    def __init__(self, varnames=None, figsize=None, textsize=None, grid=True, shade=0.35,
+                 bw=4.5, decimation='minmax'):
+        self.varnames = varnames
+        self.figsize = figsize
+        self.textsize = textsize
+        self.grid = grid
+        self.shade = shade
+        self.bw = bw
+        self.decimation = decimation
+        self.ax = None
+        self.ndraws = 0
+        self._values = []
+        self._histograms = []
+        self._kde_lines = []
+        self._trace_lines = []
+        self._limits = []
+        self._backgrounds = None
+
+    @property
+    def figure(self):
+        return None if self.ax is None else self.ax[0, 0].get_figure()
+
+    def update(self, trace):
+        """Show the draws of `trace` (DataFrame or PyMC3 trace) that are not shown yet."""
+        draws = trace_to_dataframe(trace, combined=False, draws=slice(self.ndraws, None))
+        if len(draws):
+            self.append(draws)
+
+    def append(self, draws):
+        """
+        Add new draws to the plot.
+
+        Parameters
+        ----------
+        draws : Pandas DataFrame or PyMC3 trace
+            The new draws of every chain, with one column per chain as returned by
+            `trace_to_dataframe(trace, combined=False)`.
+        """
+        draws = trace_to_dataframe(draws, combined=False)
+        if self.ax is None:
+            self.varnames = get_varnames(draws, self.varnames)
+            self._create(draws)
+        else:
+            for i, v in enumerate(self.varnames):
+                self._histograms[i].add(self._columns(draws, v, i))
+        n = self.ndraws + len(draws)
+        for i, v in enumerate(self.varnames):
+            values = self._values[i]
+            if n > len(values):
+                grown = np.empty((max(2 * len(values), n), values.shape[1]), dtype=values.dtype)
+                grown[:self.ndraws] = values[:self.ndraws]
+                self._values[i] = values = grown
+            values[self.ndraws:n] = self._columns(draws, v, i)
+        self.ndraws = n
+        self._refresh(self._set_data())
+
+    def _columns(self, draws, v, i=None):
+        values = np.asarray(draws[v].values).reshape(len(draws), -1)
+        if i is not None and values.shape[1] != self._values[i].shape[1]:
+            raise ValueError('Expected {} columns for {}, got {}'.format(
+                self._values[i].shape[1], v, values.shape[1]))
+        return values
+
+    def _create(self, draws):
+        """Create the figure and the lines from the first draws."""
+        figsize = self.figsize
+        if figsize is None:
+            figsize = (12, len(self.varnames) * 2)
+        textsize, linewidth, _ = _scale_text(figsize, textsize=self.textsize, f=1)
+        self.ax = get_axis(None, len(self.varnames), 2, squeeze=False, figsize=figsize)
+        for i, v in enumerate(self.varnames):
+            values = self._columns(draws, v)
+            self._values.append(np.empty((max(len(values), 1024), values.shape[1]),
+                                         dtype=np.result_type(values.dtype, np.float64)))
+            self._histograms.append(_RunningHistogram(values))
+            self._limits.append(None)
+            empty = np.empty((0, values.shape[1]))
+            self._kde_lines.append(self.ax[i, 0].plot(empty, empty, lw=linewidth))
+            self._trace_lines.append(self.ax[i, 1].plot(empty, empty, lw=linewidth,
+                                                        alpha=self.shade))
+            self.ax[i, 0].set_title(v, fontsize=textsize)
+            self.ax[i, 0].grid(self.grid)
+            self.ax[i, 1].set_title(v, fontsize=textsize)
+            self.ax[i, 0].set_yticks([])
+            self.ax[i, 0].tick_params(labelsize=textsize)
+            self.ax[i, 1].tick_params(labelsize=textsize)
+            self.ax[i, 0].set_ylim(0, 1)
+            self.ax[i, 1].set_xlim(0, 1)
+        self.figure.tight_layout()
+
+    def _set_data(self):
+        """Update the data of the lines, return whether the limits of some axes changed."""
+        rescaled = False
+        for i in range(len(self.varnames)):
+            ax_kde, ax_trace = self.ax[i]
+            values = self._values[i][:self.ndraws]
+            if self.decimation is None:
+                x, y = np.arange(self.ndraws), values
+                x = np.broadcast_to(x[:, None], y.shape)
+            else:
+                x, y = decimate(values, _decimation_points(ax_trace, self.decimation),
+                                self.decimation)
+            for j, line in enumerate(self._trace_lines[i]):
+                line.set_data(x[:, j], y[:, j])
+
+            peak = 0
+            for line, (x, density) in zip(self._kde_lines[i],
+                                          self._histograms[i].densities(self.bw)):
+                if density is not None and np.all(np.isfinite(density)):
+                    line.set_data(x, density)
+                    peak = max(peak, np.nanmax(density))
+
+            # the limits grow with a margin, so that most updates leave them unchanged
+            lower, upper = self._histograms[i].edges()
+            xmin, xmax = ax_kde.get_xlim()
+            if self._limits[i] is None or lower < xmin or upper > xmax:
+                if self._limits[i] is not None:
+                    lower, upper = min(lower, xmin), max(upper, xmax)
+                margin = 0.1 * (upper - lower)
+                ax_kde.set_xlim(lower - margin, upper + margin)
+                rescaled = True
+            if peak > ax_kde.get_ylim()[1] or self._limits[i] is None:
+                ax_kde.set_ylim(0, 1.25 * peak or 1)
+                rescaled = True
+            if self.ndraws > ax_trace.get_xlim()[1]:
+                ax_trace.set_xlim(0, max(2 * ax_trace.get_xlim()[1], self.ndraws))
+                rescaled = True
+            vmin, vmax = np.nanmin(y), np.nanmax(y)
+            limits = self._limits[i]
+            if limits is None or vmin < limits[0] or vmax > limits[1]:
+                if limits is not None:
+                    vmin, vmax = min(vmin, limits[0]), max(vmax, limits[1])
+                margin = 0.1 * (vmax - vmin) or 0.5
+                self._limits[i] = (vmin - margin, vmax + margin)
+                ax_trace.set_ylim(*self._limits[i])
+                rescaled = True
+        return rescaled
+
+    def _refresh(self, rescaled):
+        """Draw the figure, or only the lines if the limits of the axes did not change."""
+        canvas = self.figure.canvas
+        lines = [line for lines in self._kde_lines + self._trace_lines for line in lines]
+        if rescaled or not self._backgrounds or not canvas.supports_blit:
+            for line in lines:
+                line.set_visible(False)
+            canvas.draw()
+            for line in lines:
+                line.set_visible(True)
+            if canvas.supports_blit:
+                self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in self.ax.flat]
+        if self._backgrounds:
+            for ax, background in zip(self.ax.flat, self._backgrounds):
+                canvas.restore_region(background)
+                for line in ax.get_lines():
+                    ax.draw_artist(line)
+                canvas.blit(ax.bbox)
+        else:
+            canvas.draw()
+        canvas.flush_events()
+
+
+class _RunningHistogram(object):
+    """
+    Histogram of each column of the draws, in bins of a common width extended and merged as the
+    range of the draws grows.
+    """
+
+    def __init__(self, values, nx=200):
+        values = np.asarray(values, dtype=float)
+        finite = values[np.isfinite(values)]
+        lower, upper = (finite.min(), finite.max()) if finite.size else (0., 1.)
+        if upper == lower:
+            lower, upper = lower - 0.5, upper + 0.5
+        self.nx = nx
+        self.width = (upper - lower) / (nx - 1)
+        self.lower = lower - self.width / 2
+        self.counts = np.zeros((nx, values.shape[1]), dtype=np.int64)
+        self.add(values)
+
+    def edges(self):
+        """Edges of the bins between the first and the last non empty bins."""
+        filled = np.flatnonzero(self.counts.any(axis=1))
+        if not filled.size:
+            return self.lower, self.lower + len(self.counts) * self.width
+        return (self.lower + filled[0] * self.width,
+                self.lower + (filled[-1] + 1) * self.width)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+        if not finite.any():
+            return
+        vmin, vmax = values[finite].min(), values[finite].max()
+        n_cols = self.counts.shape[1]
+        # double the width until the range fits in 2 nx bins, before allocating any of them, so
+        # the bins of the current width are merged in groups aligned on `self.lower`
+        factor, width = 1, self.width
+        while True:
+            n_kept = -(-len(self.counts) // factor)
+            n_below = int(np.ceil((self.lower - vmin) / width)) if vmin < self.lower else 0
+            upper = self.lower + n_kept * width
+            n_above = int((vmax - upper) / width) + 1 if vmax >= upper else 0
+            if n_below + n_kept + n_above <= 2 * self.nx:
+                break
+            factor *= 2
+            width *= 2
+        if factor > 1:
+            pad = n_kept * factor - len(self.counts)
+            self.counts = np.vstack([self.counts, np.zeros((pad, n_cols), dtype=np.int64)])
+            self.counts = self.counts.reshape(-1, factor, n_cols).sum(axis=1)
+            self.width = width
+        if n_below or n_above:
+            self.counts = np.vstack([np.zeros((n_below, n_cols), dtype=np.int64), self.counts,
+                                     np.zeros((n_above, n_cols), dtype=np.int64)])
+            self.lower -= n_below * width
+        bins = np.clip(((values - self.lower) / self.width).astype(int, copy=False), 0,
+                       len(self.counts) - 1)
+        for j in range(n_cols):
+            self.counts[:, j] += np.bincount(bins[finite[:, j], j], minlength=len(self.counts))
+
+    def densities(self, bw=4.5):
+        """
+        Kernel density estimate of each column, between its smallest and largest values, as in
+        `fast_kde` with the values replaced by the centres of their bins.
+        """
+        centres = self.lower + (np.arange(len(self.counts)) + 0.5) * self.width
+        for grid in self.counts.T:
+            filled = np.flatnonzero(grid)
+            if not filled.size:
+                yield None, None
+                continue
+            grid = grid[filled[0]:filled[-1] + 1]
+            x = centres[filled[0]:filled[-1] + 1]
+            n = grid.sum()
+            # entropy of the values shifted by their minimum, as computed by `fast_kde`
+            shifted = x - x[0]
+            total = np.dot(grid, shifted)
+            if total > 0:
+                positive = shifted > 0
+                entropy = np.log(total) - (np.dot(grid[positive],
+                                                  shifted[positive] * np.log(shifted[positive]))
+                                           / total)
+            else:
+                entropy = 0.
+            try:
+                yield x, _grid_kde(grid.astype(float), n, self.width, entropy * bw)
+            except ValueError:
+                yield None, None
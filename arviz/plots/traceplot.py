@@ -2,13 +2,20 @@ import numpy as np
 import matplotlib.pyplot as plt
 from ..stats import hpd
 from .kdeplot import fast_kde, kdeplot
-from .plot_utils import get_axis, make_2d, get_bins, _scale_text
+from .plot_utils import (get_axis, make_2d, get_bins, decimate, discrete_counts,
+                         plot_discrete_hist, _decimation_points, _scale_text)
 from ..utils import get_varnames, trace_to_dataframe
+from ..utils.profiling import timed
 
+# Curves of the priors already evaluated, by distribution and parameters
+_PRIOR_CURVES = {}
+_MAX_PRIOR_CURVES = 256
 
+
+@timed
 def traceplot(trace, varnames=None, figsize=None, textsize=None, lines=None, combined=False,
               grid=True, shade=0.35, priors=None, prior_shade=1, prior_style='--', bw=4.5,
-              skip_first=0, ax=None):
+              skip_first=0, thin=1, decimation=None, ax=None):
     """Plot samples histograms and values.
 
     Parameters
@@ -45,6 +52,16 @@ def traceplot(trace, varnames=None, figsize=None, textsize=None, lines=None, com
         of thumb (the default rule used by SciPy).
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
+    decimation : str or None
+        How the lines of the sample values are decimated when there are more samples than
+        pixels: `minmax` draws the minimum and maximum of the samples falling in each pixel
+        column, so the envelope and the outliers of the trace are kept, `lttb` draws one sample
+        per pixel column chosen by the largest triangle three buckets algorithm. The pixels are
+        those of the axes at the figure dpi, or at `savefig.dpi` if it is higher; set `savefig.dpi`
+        before plotting a figure saved at a higher resolution. Defaults to None, every sample is
+        drawn.
     ax : axes
         Matplotlib axes. Accepts an array of axes, e.g.:
 
@@ -59,7 +76,7 @@ def traceplot(trace, varnames=None, figsize=None, textsize=None, lines=None, com
     ax : matplotlib axes
 
     """
-    trace = trace_to_dataframe(trace[skip_first:], combined)
+    trace = trace_to_dataframe(trace, combined, skip_first=skip_first, thin=thin)
     varnames = get_varnames(trace, varnames)
 
     if figsize is None:
@@ -81,14 +98,18 @@ def traceplot(trace, varnames=None, figsize=None, textsize=None, lines=None, com
         width = len(d)
         if d.dtype.kind == 'i':
             hist_objs = _histplot_op(ax[i, 0], d, shade, prior, prior_shade, prior_style)
-            colors = [h[-1][0].get_facecolor() for h in hist_objs]
+            colors = [h.get_facecolor()[0] for h in hist_objs]
         else:
             artists = _kdeplot_op(ax[i, 0], d, bw, linewidth, prior, prior_shade, prior_style)[0]
             colors = [a[0].get_color() for a in artists]
         ax[i, 0].set_title(v, fontsize=textsize)
         ax[i, 0].grid(grid)
         ax[i, 1].set_title(v, fontsize=textsize)
-        ax[i, 1].plot(range(width), d, lw=linewidth, alpha=shade)
+        if decimation is None:
+            ax[i, 1].plot(range(width), d, lw=linewidth, alpha=shade)
+        else:
+            n_points = _decimation_points(ax[i, 1], decimation)
+            ax[i, 1].plot(*decimate(d, n_points, decimation), lw=linewidth, alpha=shade)
 
         ax[i, 0].set_yticks([])
         ax[i, 0].tick_params(labelsize=textsize)
@@ -117,16 +138,13 @@ def traceplot(trace, varnames=None, figsize=None, textsize=None, lines=None, com
 
 def _histplot_op(ax, data, shade=.35, prior=None, prior_shade=1, prior_style='--'):
     """Add a histogram for each column of the data to the provided axes."""
-    hs = []
-    for column in data.T:
-        bins = get_bins(column)
-        hs.append(ax.hist(column, bins=bins, alpha=shade, align='left',
-                          density=True))
-        if prior is not None:
-            x_sample = prior.rvs(1000)
-            x = np.arange(x_sample.min(), x_sample.max())
-            p = prior.pmf(x)
-            ax.step(x, p, where='mid', alpha=prior_shade, ls=prior_style)
+    x_range = data.max() - data.min()
+    width = int(x_range / 10) if x_range > 50 else 1
+    start, counts = discrete_counts(data, width=width)
+    hs = plot_discrete_hist(ax, start, counts / (width * len(data)), width=width, alpha=shade)
+    if prior is not None:
+        x, p = _prior_curve(prior, discrete=True)
+        ax.step(x, p, where='mid', alpha=prior_shade, ls=prior_style)
     xticks = get_bins(data, max_bins=10, n=1)
     ax.set_xticks(xticks)
 
@@ -143,18 +161,68 @@ def _kdeplot_op(ax, data, bw, linewidth, prior=None, prior_shade=1, prior_style=
             density, l, u = fast_kde(d, bw)
             x = np.linspace(l, u, len(density))
             ls.append(ax.plot(x, density, lw=linewidth))
-            if prior is not None:
-                x_sample = prior.rvs(10000)
-                x = np.linspace(x_sample.min(), x_sample.max(), 1000)
-                p = prior.pdf(x)
-                pls.append(ax.plot(x, p, alpha=prior_shade, ls=prior_style))
-
         except ValueError:
             errored.append(str(i))
 
+    if prior is not None:
+        x, p = _prior_curve(prior)
+        pls.append(ax.plot(x, p, alpha=prior_shade, ls=prior_style))
+
     if errored:
         ax.text(.27, .47, 'WARNING: KDE plot failed for: ' + ','.join(errored),
                 bbox={'facecolor': 'red', 'alpha': 0.5, 'pad': 10},
                 style='italic')
 
     return ls, pls
+
+
+def _prior_curve(prior, discrete=False, tail=1e-4, points=1000):
+    """
+    Evaluate the density (or mass) function of a prior over its support.
+
+    The support is taken between the `tail` and `1 - tail` quantiles of the prior. The curves of
+    frozen scipy distributions are memoized by distribution and parameters, so the same prior is
+    evaluated once for all the chains, variables and figures.
+
+    Parameters
+    ----------
+    prior : scipy distribution
+        Frozen distribution with `ppf` and `pdf` (or `pmf` if discrete) methods
+    discrete : bool
+        Whether the prior is a discrete distribution, evaluated at every integer of the support.
+    tail : float
+        Probability left out on each side of the support
+    points : int
+        Number of points of the curve of a continuous distribution
+
+    Returns
+    -------
+    x : array
+    p : array
+        The density or mass at x
+    """
+    try:
+        key = (prior.dist.name, prior.args, tuple(sorted(prior.kwds.items())), discrete, tail,
+               points)
+        hash(key)
+    except (AttributeError, TypeError):
+        key = None
+    if key in _PRIOR_CURVES:
+        return _PRIOR_CURVES[key]
+
+    lower, upper = prior.ppf([tail, 1 - tail])
+    if discrete:
+        x = np.arange(lower, upper + 1)
+        p = prior.pmf(x)
+    else:
+        x = np.linspace(lower, upper, points)
+        p = prior.pdf(x)
+
+    if key is not None:
+        # the curves are shared by every caller
+        x.setflags(write=False)
+        p.setflags(write=False)
+        if len(_PRIOR_CURVES) >= _MAX_PRIOR_CURVES:
+            _PRIOR_CURVES.clear()
+        _PRIOR_CURVES[key] = x, p
+    return x, p
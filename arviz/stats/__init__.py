@@ -1,2 +1,2 @@
-from .stats import bfmi, compare, hpd, loo, r2_score, summary, waic, psislw
+from .stats import bfmi, compare, hpd, loo, r2_score, summary, waic, psislw, WaicAccumulator
 from .diagnostics import effective_n, gelman_rubin, geweke
@@ -1,12 +1,16 @@
 import numpy as np
 import pandas as pd
 from ..utils import trace_to_dataframe, get_varnames
-from scipy.signal import fftconvolve
+from ..utils.cache import cached
+from ..utils.precision import as_compute, float_dtype
+from ..utils.profiling import timed
 
 
 __all__ = ['effective_n', 'gelman_rubin', 'geweke']
 
 
+@timed
+@cached
 def effective_n(trace, varnames=None, round_to=2):
     R"""
     Returns estimate of the effective sample size of a set of traces.
@@ -54,7 +58,7 @@ def effective_n(trace, varnames=None, round_to=2):
         n_eff = pd.Series(name='n_eff')
 
         for var in varnames:
-            n_eff[var] = round(_get_neff(trace[var].values.T), round_to)
+            n_eff[var] = round(_get_neff(as_compute(trace[var].values.T)), round_to)
 
         return n_eff
 
@@ -67,7 +71,7 @@ def _get_neff(trace_value):
 
     acov = np.asarray([_autocov(trace_value[chain]) for chain in range(nchain)])
 
-    chain_mean = trace_value.mean(axis=1)
+    chain_mean = trace_value.mean(axis=1, dtype=np.float64)
     chain_var = acov[:, 0] * n_samples / (n_samples - 1.)
     acov_t = acov[:, 1] * n_samples / (n_samples - 1.)
     mean_var = np.mean(chain_var)
@@ -102,6 +106,69 @@ def _get_neff(trace_value):
     return ess
 
 
+def _get_neff_batch(trace_values):
+    """
+    Compute the effective sample size of many quantities at once, with the same estimator as
+    `_get_neff`.
+
+    Parameters
+    ----------
+    trace_values : array of shape (n_chains, n_samples, n_quantities)
+
+    Returns
+    -------
+    ess : array of shape (n_quantities,)
+    """
+    nchain, n_samples, _ = trace_values.shape
+
+    acov = _autocov_batch(trace_values)
+
+    chain_mean = trace_values.mean(axis=1, dtype=np.float64)
+    chain_var = acov[:, 0] * n_samples / (n_samples - 1.)
+    acov_t = acov[:, 1] * n_samples / (n_samples - 1.)
+    mean_var = np.mean(chain_var, axis=0)
+    var_plus = mean_var * (n_samples - 1.) / n_samples
+    if nchain > 1:
+        var_plus += np.var(chain_mean, axis=0, ddof=1)
+
+    rho_hat_t = 1. - (mean_var - np.mean(acov, axis=0)) / var_plus
+    rho_hat_t[0] = 1.
+    rho_hat_t[1] = 1. - (mean_var - np.mean(acov_t, axis=0)) / var_plus
+
+    # Sums of consecutive (even, odd) pairs of autocorrelations, the pairs after the first are
+    # those computed by Geyer's initial positive sequence in `_get_neff`
+    n_pairs = n_samples // 2
+    pairs = rho_hat_t[:2 * n_pairs].reshape(n_pairs, 2, -1).sum(axis=1)
+    # Geyer's initial positive sequence: truncate at the first negative pair
+    positive = np.cumprod(pairs >= 0, axis=0).astype(bool)
+    # Geyer's initial monotone sequence
+    monotone = np.minimum.accumulate(pairs[1:], axis=0)
+    rho_sum = pairs[0] + np.sum(np.where(positive[1:], monotone, 0.), axis=0)
+
+    return (nchain * n_samples) / (-1. + 2. * rho_sum)
+
+
+def _autocov_batch(x):
+    """
+    Compute autocovariance estimates for every lag along the second axis of `x`, as `_autocov`.
+
+    Parameters
+    ----------
+    x : array of shape (n_chains, n_samples, n_quantities)
+
+    Returns
+    -------
+    acov : array of shape (n_chains, n_samples, n_quantities)
+    """
+    n = x.shape[1]
+    y = x - x.mean(axis=1, dtype=np.float64, keepdims=True)
+    n_fft = 2 ** int(np.ceil(np.log2(2 * n - 1)))
+    spectrum = np.fft.rfft(y, n=n_fft, axis=1)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=1)[:, :n]
+    acov /= np.arange(n, 0, -1)[:, None]
+    return acov
+
+
 def _autocorr(x):
     """
     Compute autocorrelation using FFT for every lag for the input array
@@ -116,7 +183,10 @@ def _autocorr(x):
     -------
     acorr: Numpy array same size as the input array
     """
-    y = x - x.mean()
+    from scipy.signal import fftconvolve
+
+    # the mean is accumulated in float64, the centered samples keep the compute dtype
+    y = x - float_dtype(x.dtype).type(x.mean(dtype=np.float64))
     n = len(y)
     result = fftconvolve(y, y[::-1])
     acorr = result[len(result) // 2:]
@@ -139,11 +209,13 @@ def _autocov(x):
     acov: Numpy array same size as the input array
     """
     acorr = _autocorr(x)
-    varx = np.var(x, ddof=1) * (len(x) - 1) / len(x)
+    varx = np.var(x, ddof=1, dtype=np.float64) * (len(x) - 1) / len(x)
     acov = acorr * varx
     return acov
 
 
+@timed
+@cached
 def gelman_rubin(trace, varnames=None, round_to=2):
     R"""
     Returns estimate of R for a set of traces.
@@ -195,12 +267,12 @@ def gelman_rubin(trace, varnames=None, round_to=2):
         Rhat = pd.Series(name='Rhat')
 
         for var in varnames:
-            x = trace[var].values.T
+            x = as_compute(trace[var].values.T)
             num_samples = x.shape[1]
             # Calculate between-chain variance
-            B = num_samples * np.var(np.mean(x, axis=1), axis=0, ddof=1)
+            B = num_samples * np.var(np.mean(x, axis=1, dtype=np.float64), axis=0, ddof=1)
             # Calculate within-chain variance
-            W = np.mean(np.var(x, axis=1, ddof=1), axis=0)
+            W = np.mean(np.var(x, axis=1, ddof=1, dtype=np.float64), axis=0)
             # Estimate of marginal posterior variance
             Vhat = W * (num_samples - 1) / num_samples + B / num_samples
 
@@ -209,6 +281,7 @@ def gelman_rubin(trace, varnames=None, round_to=2):
         return Rhat
 
 
+@timed
 def geweke(trace, varnames=None, first=.1, last=.5, intervals=20):
     R"""
     Return z-scores for convergence diagnostics.
@@ -1,15 +1,23 @@
+import os
 import numpy as np
 import pandas as pd
 import warnings
-from ..utils import get_stats, get_varnames, trace_to_dataframe, log_post_trace
-from .diagnostics import effective_n, gelman_rubin
+from ..utils import (get_sampler_stats, get_varnames, trace_to_dataframe, log_post_trace,
+                     log_post_point, log_post_chunks)
+from ..utils.cache import cached
+from ..utils.precision import as_compute, as_float, float_dtype
+from ..utils.profiling import timed
+from .diagnostics import effective_n, gelman_rubin, _get_neff_batch
 from scipy.special import logsumexp
-from scipy.stats import dirichlet, circmean, circstd
-from scipy.optimize import minimize
 
-__all__ = ['bfmi', 'compare', 'hpd', 'loo', 'psislw', 'r2_score', 'summary', 'waic']
+__all__ = ['bfmi', 'compare', 'hpd', 'loo', 'psislw', 'r2_score', 'summary', 'waic',
+           'WaicAccumulator']
 
+# Maximum number of samples sorted at once by `summary` for the HPD intervals and quantiles
+_QUANTILE_BATCH = 2**20
 
+
+@timed
 def bfmi(trace):
     R"""Calculate the estimated Bayesian fraction of missing information (BFMI).
 
@@ -30,13 +38,17 @@ def bfmi(trace):
         The Bayesian fraction of missing information of the model and trace. One element per
         chain in the trace.
     """
-    energy = np.atleast_2d(get_stats(trace, 'energy', combined=False))
+    stats = get_sampler_stats(trace)
+    if 'energy' not in stats:
+        raise ValueError('The trace has no energy statistic')
+    energy = stats.chains('energy')
 
-    return np.square(np.diff(energy, 1)).mean(1) / np.var(energy, 1)
+    return np.array([np.square(np.diff(e)).mean() / np.var(e) for e in energy])
 
 
+@timed
 def compare(model_dict, ic='waic', method='stacking', b_samples=1000,
-            alpha=1, seed=None, round_to=2):
+            alpha=1, seed=None, round_to=2, n_jobs=1):
     R"""
     Compare models based on the widely applicable information criterion (WAIC) or leave-one-out
     (LOO) cross-validation.
@@ -72,6 +84,10 @@ def compare(model_dict, ic='waic', method='stacking', b_samples=1000,
            np.random state is used.
     round_to : int
         Number of decimals used to round results (default 2).
+    n_jobs : int or None
+        Number of worker processes computing the IC of the models concurrently. If None, one per
+        CPU. Defaults to 1, the models are evaluated one after the other in the current process.
+        The result does not depend on the number of workers.
 
     Returns
     -------
@@ -96,20 +112,18 @@ def compare(model_dict, ic='waic', method='stacking', b_samples=1000,
         be indication of WAIC/LOO starting to fail see http://arxiv.org/abs/1507.04544 for details.
     """
 
+    # scipy.optimize and scipy.stats are slow to import, load them only when comparing models
+    from scipy.optimize import minimize
+    from scipy.stats import dirichlet
+
     names = [model.name for model in model_dict if model.name]
     if not names:
         names = np.arange(len(model_dict))
 
     if ic == 'waic':
         ic_func = waic
-        df_comp = pd.DataFrame(index=names,
-                               columns=['waic', 'pwaic', 'dwaic', 'weight','se', 'dse', 'warning'])
-
     elif ic == 'loo':
         ic_func = loo
-        df_comp = pd.DataFrame(index=names,
-                               columns=['loo', 'ploo', 'dloo', 'weight', 'se', 'dse', 'warning'])
-
     else:
         raise NotImplementedError('The information criterion {} is not supported.'.format(ic))
 
@@ -119,39 +133,22 @@ def compare(model_dict, ic='waic', method='stacking', b_samples=1000,
     if method not in ['stacking', 'BB-pseudo-BMA', 'pseudo-BMA']:
         raise ValueError('The method {}, to compute weights, is not supported.'.format(method))
 
-    ic_se = '{}_se'.format(ic)
-    p_ic = 'p_{}'.format(ic)
-    ic_i = '{}_i'.format(ic)
-
-    ics = pd.DataFrame()
-    for m, t in model_dict.items():
-        ics = ics.append(ic_func(t, m, pointwise=True))
-    ics.index = names
-    ics.sort_values(by=ic, inplace=True)
+    ics = PointwiseIC.from_results(ic, names, _pointwise_ics(ic_func, model_dict, n_jobs))
+    N, K = ics.pointwise.shape
 
     if method == 'stacking':
-        N, K, ic_i_val = _ic_matrix(ics, ic_i)
-        exp_ic_i = np.exp(-0.5 * ic_i_val)
+        exp_ic_i = np.exp(-0.5 * ics.pointwise)
         Km = K - 1
 
         def w_fuller(w):
             return np.concatenate((w, [max(1. - np.sum(w), 0.)]))
 
         def log_score(w):
-            w_full = w_fuller(w)
-            score = 0.
-            for i in range(N):
-                score += np.log(np.dot(exp_ic_i[i], w_full))
-            return -score
+            return -np.sum(np.log(exp_ic_i.dot(w_fuller(w))))
 
         def gradient(w):
-            w_full = w_fuller(w)
-            grad = np.zeros(Km)
-            for k in range(Km):
-                for i in range(N):
-                    grad[k] += (exp_ic_i[i, k] - exp_ic_i[i, Km]) / \
-                        np.dot(exp_ic_i[i], w_full)
-            return -grad
+            density = exp_ic_i.dot(w_fuller(w))
+            return -np.sum((exp_ic_i[:, :Km] - exp_ic_i[:, Km:]) / density[:, None], axis=0)
 
         theta = np.full(Km, 1. / K)
         bounds = [(0., 1.) for i in range(Km)]
@@ -165,70 +162,149 @@ def compare(model_dict, ic='waic', method='stacking', b_samples=1000,
                      constraints=constraints)
 
         weights = w_fuller(w['x'])
-        ses = ics[ic_se]
+        ses = ics.se
 
     elif method == 'BB-pseudo-BMA':
-        N, K, ic_i_val = _ic_matrix(ics, ic_i)
-        ic_i_val = ic_i_val * N
-
         b_weighting = dirichlet.rvs(alpha=[alpha] * N, size=b_samples,
                                     random_state=seed)
-        weights = np.zeros((b_samples, K))
-        z_bs = np.zeros_like(weights)
-        for i in range(b_samples):
-            z_b = np.dot(b_weighting[i], ic_i_val)
-            u_weights = np.exp(-0.5 * (z_b - np.min(z_b)))
-            z_bs[i] = z_b
-            weights[i] = u_weights / np.sum(u_weights)
-
-        weights = weights.mean(0)
-        ses = pd.Series(z_bs.std(0))
+        z_bs = b_weighting.dot(ics.pointwise * N)
+        u_weights = np.exp(-0.5 * (z_bs - np.min(z_bs, axis=1, keepdims=True)))
+        weights = (u_weights / np.sum(u_weights, axis=1, keepdims=True)).mean(0)
+        ses = z_bs.std(0)
 
     elif method == 'pseudo-BMA':
-        min_ic = ics.iloc[0][ic]
-        Z = np.exp(-0.5 * (ics[ic] - min_ic))
+        Z = np.exp(-0.5 * (ics.values - np.min(ics.values)))
         weights = Z / np.sum(Z)
-        ses = ics[ic_se]
+        ses = ics.se
 
     if np.any(weights):
-        min_ic_i_val = ics[ic_i].iloc[0]
-        for i in ics.index:
-            res = ics.loc[i]
-            diff = res[ic_i] - min_ic_i_val
-            d_ic = np.sum(diff)
-            d_se = np.sqrt(len(diff) * np.var(diff))
-            se = ses.loc[i]
-            weight = weights[i]
-            df_comp.at[i] = (round(res[ic], round_to),
-                             round(res[p_ic], round_to),
-                             round(d_ic, round_to),
-                             round(weight, round_to),
-                             round(se, round_to),
-                             round(d_se, round_to),
-                             res['warning'])
-
-        return df_comp.sort_values(by=ic)
-
-
-def _ic_matrix(ics, ic_i):
-    """
-    Store the previously computed pointwise predictive accuracy values (ics) in a 2D matrix array.
-    """
-    N = len(ics[ic_i].iloc[0])
-    K = len(ics)
-    ic_i_val = np.zeros((N, K))
-
-    for i in ics.index:
-        ic = ics.loc[i][ic_i]
-        if len(ic) != N:
-            raise ValueError('The number of observations should be the same '
-                             'across all models')
-        else:
-            ic_i_val[:, i] = ic
+        d_ic, d_se = ics.differences()
+        df_comp = pd.DataFrame({ic: ics.values,
+                                'p{}'.format(ic): ics.p,
+                                'd{}'.format(ic): d_ic,
+                                'weight': weights,
+                                'se': ses,
+                                'dse': d_se},
+                               index=ics.names,
+                               columns=[ic, 'p{}'.format(ic), 'd{}'.format(ic), 'weight', 'se',
+                                        'dse'])
+        df_comp = df_comp.round(round_to)
+        df_comp['warning'] = ics.warning
+
+        return df_comp.sort_values(by=ic, kind='mergesort')
+
+
+class PointwiseIC(object):
+    """
+    Information criterion of several models fitted to the same observations, in columns.
+
+    The pointwise values of all the models are stored side by side in a single array, so the
+    statistics comparing the models are computed without looping over them.
+
+    Attributes
+    ----------
+    ic : str
+        Name of the information criterion, 'waic' or 'loo'
+    names : list
+        Name of each model
+    values : array of shape (n_models,)
+        Information criterion of each model
+    se : array of shape (n_models,)
+        Standard error of the information criterion of each model
+    p : array of shape (n_models,)
+        Effective number of parameters of each model
+    warning : array of shape (n_models,)
+        1 if the computation of the information criterion of the model may not be reliable
+    pointwise : array of shape (n_observations, n_models)
+        Pointwise information criterion, one column per model. Each column is contiguous in
+        memory.
+    """
+
+    def __init__(self, ic, names, n_observations):
+        n_models = len(names)
+        self.ic = ic
+        self.names = list(names)
+        self.values = np.empty(n_models)
+        self.se = np.empty(n_models)
+        self.p = np.empty(n_models)
+        self.warning = np.zeros(n_models, dtype=int)
+        self.pointwise = np.empty((n_observations, n_models), order='F')
+
+    @classmethod
+    def from_results(cls, ic, names, results):
+        """
+        Gather the results of `waic` or `loo`, computed with `pointwise=True`, of each model.
+
+        Parameters
+        ----------
+        ic : str
+            'waic' or 'loo'
+        names : list
+            Name of each model
+        results : list of DataFrames
+            One-row result of each model, in the order of `names`
+        """
+        columns = [ic, '{}_se'.format(ic), 'p_{}'.format(ic), 'warning', '{}_i'.format(ic)]
+        rows = [result[columns].values[0] for result in results]
+        pointwise_ic = cls(ic, names, len(rows[0][4]))
+        for k, (value, se, p, warning, pointwise) in enumerate(rows):
+            if len(pointwise) != len(pointwise_ic.pointwise):
+                raise ValueError('The number of observations should be the same '
+                                 'across all models')
+            pointwise_ic.values[k] = value
+            pointwise_ic.se[k] = se
+            pointwise_ic.p[k] = p
+            pointwise_ic.warning[k] = warning
+            pointwise_ic.pointwise[:, k] = pointwise
+        return pointwise_ic
+
+    def __len__(self):
+        return len(self.names)
+
+    def differences(self):
+        """
+        Difference between the information criterion of each model and of the best model (the
+        lowest information criterion) and its standard error.
+
+        Returns
+        -------
+        d_ic : array of shape (n_models,)
+        d_se : array of shape (n_models,)
+        """
+        best = np.argmin(self.values)
+        diff = self.pointwise - self.pointwise[:, best:best + 1]
+        d_ic = np.sum(diff, axis=0)
+        d_se = np.sqrt(len(diff) * np.var(diff, axis=0))
+        return d_ic, d_se
+
+
+def _pointwise_ics(ic_func, model_dict, n_jobs=1):
+    """
+    Compute `ic_func` with pointwise values for every model, in the order of `model_dict`.
+
+    With more than one job the models are distributed over a pool of processes, the models and
+    traces are pickled to be sent to the workers.
+    """
+    models = list(model_dict)
+    traces = [model_dict[m] for m in models]
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(models))
+    if n_jobs <= 1:
+        return [_pointwise_ic(ic_func, t, m) for t, m in zip(traces, models)]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        # map returns the results in the order of the models, whatever the completion order
+        return list(executor.map(_pointwise_ic, [ic_func] * len(models), traces, models))
 
-    return N, K, ic_i_val
 
+def _pointwise_ic(ic_func, trace, model):
+    return ic_func(trace, model, pointwise=True)
 
+
+@timed
 def hpd(x, alpha=0.05, transform=lambda x: x, circular=False):
     """
     Calculate highest posterior density (HPD) of array for given alpha. 
@@ -239,7 +315,8 @@ def hpd(x, alpha=0.05, transform=lambda x: x, circular=False):
     Parameters
     ----------
     x : Numpy array
-        An array containing posterior samples
+        An array containing posterior samples. float32 samples are cast to float64, unless the
+        float32 mode is enabled (see `enable_float32`).
     alpha : float, optional
         Desired probability of type I error (defaults to 0.05)
     transform : callable
@@ -254,43 +331,219 @@ def hpd(x, alpha=0.05, transform=lambda x: x, circular=False):
         lower and upper value of the interval.
     """
     # Make a copy of trace
-    x = transform(x.copy())
-    n = len(x)
-    cred_mass = 1.0 - alpha
+    x = transform(as_compute(x, copy=True))
 
     if circular:
-        mean = circmean(x, high=np.pi, low=-np.pi)
-        x = x - mean
-        x = np.arctan2(np.sin(x), np.cos(x))
+        sin_x, cos_x = np.sin(x), np.cos(x)
+        mean = _circ_moments(sin_x, cos_x)[0]
+        x = _circ_deviations(sin_x, cos_x, mean)
+
+    hdi_min, hdi_max = _hpd_sorted(np.sort(x, axis=0), alpha)
+
+    if circular:
+        hdi_min = _circ_wrap(hdi_min + mean)
+        hdi_max = _circ_wrap(hdi_max + mean)
+
+    return hdi_min, hdi_max
+
 
-    x = np.sort(x)
-    interval_idx_inc = int(np.floor(cred_mass * n))
+def _hpd_sorted(x, alpha):
+    """HPD interval of the samples `x`, already sorted (of each column if `x` is 2-D)."""
+    n = len(x)
+    interval_idx_inc = int(np.floor((1.0 - alpha) * n))
     n_intervals = n - interval_idx_inc
     interval_width = x[interval_idx_inc:] - x[:n_intervals]
 
     if len(interval_width) == 0:
         raise ValueError('Too few elements for interval calculation')
 
-    min_idx = np.argmin(interval_width)
-    hdi_min = x[min_idx]
-    hdi_max = x[min_idx + interval_idx_inc]
+    min_idx = np.argmin(interval_width, axis=0)
+    if x.ndim == 1:
+        return x[min_idx], x[min_idx + interval_idx_inc]
+    columns = np.arange(x.shape[1])
+    return x[min_idx, columns], x[min_idx + interval_idx_inc, columns]
 
-    if circular:
-        hdi_min = hdi_min + mean
-        hdi_max = hdi_max + mean
-        hdi_min = np.arctan2(np.sin(hdi_min), np.cos(hdi_min))
-        hdi_max = np.arctan2(np.sin(hdi_max), np.cos(hdi_max))
 
-    return hdi_min, hdi_max
+def _quantile_sorted(x, quantiles):
+    """
+    Quantiles of the samples `x`, already sorted (of each column if `x` is 2-D), with the linear
+    interpolation of `np.quantile`.
+    """
+    position = np.asarray(quantiles, dtype=np.float64) * (len(x) - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, len(x) - 1)
+    fraction = (position - lower).reshape(position.shape + (1,) * (x.ndim - 1))
+    return x[lower] + fraction * (x[upper] - x[lower])
+
+
+def _quantile_table(x, alpha=0.05, quantiles=None, index=None, overwrite=False):
+    """
+    HPD interval and quantiles of each column of the samples `x`, all computed from a single sort
+    of every column at once. If `overwrite` is True a 2-D `x` of the compute dtype is sorted in
+    place.
+
+    Returns
+    -------
+    DataFrame with one row per column of `x` and the columns of the HPD limits, then the
+    quantiles if requested, named as in `summary`.
+    """
+    x = as_compute(x).reshape(len(x), -1)
+    if overwrite:
+        x.sort(axis=0)
+    else:
+        x = np.sort(x, axis=0)
+    cnames = _hpd_cnames(alpha)
+    columns = list(_hpd_sorted(x, alpha))
+    if quantiles is not None:
+        cnames = cnames + _quantile_cnames(quantiles)
+        columns.extend(_quantile_sorted(x, quantiles))
+    return pd.DataFrame(np.column_stack(columns), index=index, columns=cnames)
+
+
+def _sample_block(trace, varnames, size):
+    """
+    Samples of the variables `varnames` of a DataFrame trace, each with `size` samples, copied
+    into the columns of a Fortran ordered block of their compute dtype.
+    """
+    dtype = np.result_type(*trace.dtypes[trace.columns.isin(varnames)])
+    if dtype.kind == 'f':
+        dtype = float_dtype(dtype)
+    block = np.empty((size, len(varnames)), dtype=dtype, order='F')
+    for j, var in enumerate(varnames):
+        block[:, j] = np.ravel(trace[var].values)
+    return block
 
 
 def _hpd_df(x, alpha):
-    cnames = ['hpd_{0:g}'.format(100 * alpha / 2),
-              'hpd_{0:g}'.format(100 * (1 - alpha / 2))]
+    cnames = _hpd_cnames(alpha)
     return pd.DataFrame(hpd(x, alpha), columns=cnames)
 
 
-def loo(trace, model, pointwise=False, reff=None):
+def _hpd_cnames(alpha):
+    """Names of the lower and upper HPD columns of a summary for the given alpha."""
+    return ['hpd_{0:g}'.format(100 * alpha / 2),
+            'hpd_{0:g}'.format(100 * (1 - alpha / 2))]
+
+
+def _quantile_cnames(quantiles):
+    """Names of the quantile columns of a summary, e.g. 0.25 -> `q_25`."""
+    return ['q_{0:g}'.format(100 * q) for q in quantiles]
+
+
+def _circ_wrap(x):
+    """Wrap angles back to [-np.pi, np.pi]."""
+    return np.arctan2(np.sin(x), np.cos(x))
+
+
+def _circ_moments(sin_x, cos_x):
+    """
+    Circular mean and mean resultant length of the angles (of each column of a 2-D array), from
+    their sines and cosines.
+    """
+    mean_sin, mean_cos = np.mean(sin_x, axis=0), np.mean(cos_x, axis=0)
+    return np.arctan2(mean_sin, mean_cos), np.minimum(1, np.hypot(mean_sin, mean_cos))
+
+
+def _circ_deviations(sin_x, cos_x, mean):
+    """Deviations of the angles from `mean`, wrapped to [-np.pi, np.pi], from their sines and
+    cosines."""
+    sin_mean, cos_mean = np.sin(mean), np.cos(mean)
+    return np.arctan2(sin_x * cos_mean - cos_x * sin_mean, cos_x * cos_mean + sin_x * sin_mean)
+
+
+def _circ_mc_error(sin_x, cos_x, batches=5):
+    """
+    Simulation standard error of circular variables, one per column of the 2-D arrays of sines and
+    cosines, from the circular standard deviation of the circular means of `batches` batches.
+    """
+    if batches == 1:
+        resultant = _circ_moments(sin_x, cos_x)[1]
+        return np.sqrt(-2 * np.log(resultant)) / np.sqrt(len(sin_x))
+    size = len(sin_x) // batches
+    # the sine and cosine of the mean angle of a batch are its mean sine and cosine, normalized
+    mean_sin = sin_x[:batches * size].reshape(batches, size, -1).mean(axis=1)
+    mean_cos = cos_x[:batches * size].reshape(batches, size, -1).mean(axis=1)
+    norm = np.hypot(mean_sin, mean_cos)
+    resultant = _circ_moments(mean_sin / norm, mean_cos / norm)[1]
+    return np.sqrt(-2 * np.log(resultant)) / np.sqrt(batches)
+
+
+def _circ_summary(x, alpha=0.05, batches=100, quantiles=None, kde_mode=False):
+    """
+    Summary statistics of circular variables (in the range [-np.pi, np.pi]), one per column of
+    the 2-D array `x`.
+
+    The sines and cosines of the samples are computed once for all the columns. They give the
+    circular mean, the circular standard deviation, the batch means simulation error and the
+    deviations from the mean, sorted once for the HPD interval, the quantiles and the mode.
+
+    Returns
+    -------
+    DataFrame with one row per column of `x` and the columns `mean`, `sd`, `mc_error`, the HPD
+    limits, then the quantiles and `mode` if requested.
+    """
+    sin_x, cos_x = np.sin(x), np.cos(x)
+    mean, resultant = _circ_moments(sin_x, cos_x)
+    table = pd.DataFrame({'mean': mean, 'sd': np.sqrt(-2 * np.log(resultant)),
+                          'mc_error': _circ_mc_error(sin_x, cos_x, batches)})
+    deviations = _circ_deviations(sin_x, cos_x, mean)
+    del sin_x, cos_x
+    deviations.sort(axis=0)
+
+    for name, limit in zip(_hpd_cnames(alpha), _hpd_sorted(deviations, alpha)):
+        table[name] = _circ_wrap(limit + mean)
+    if quantiles is not None:
+        qs = _quantile_sorted(deviations, quantiles) + mean
+        for name, q in zip(_quantile_cnames(quantiles), _circ_wrap(qs)):
+            table[name] = q
+    if kde_mode:
+        modes = [_kde_mode(column) for column in deviations.T]
+        table['mode'] = _circ_wrap(np.array(modes) + mean)
+    return table
+
+
+def _kde_mode(x, bw=4.5, circular=False):
+    """
+    Estimate the mode of a sample. For continuous variables the mode is the maximum of the KDE, for
+    discrete variables the most frequent value.
+
+    Parameters
+    ----------
+    x : Numpy array
+        An array containing posterior samples
+    bw : float
+        Bandwidth scaling factor for the KDE. Defaults to 4.5
+    circular : bool, optional
+        Whether `x` is a circular variable (in the range [-np.pi, np.pi]) or not.
+
+    Returns
+    -------
+    mode : float
+    """
+    # imported here to avoid a circular import, the plots depend on the stats module
+    from ..plots.kdeplot import fast_kde
+
+    x = np.asarray(x)
+    if x.dtype.kind != 'f':
+        values, counts = np.unique(x, return_counts=True)
+        return values[np.argmax(counts)]
+
+    if circular:
+        sin_x, cos_x = np.sin(x), np.cos(x)
+        mean = _circ_moments(sin_x, cos_x)[0]
+        x = _circ_deviations(sin_x, cos_x, mean)
+
+    density, l, u = fast_kde(x, bw)
+    mode = np.linspace(l, u, len(density))[np.argmax(density)]
+
+    if circular:
+        mode = _circ_wrap(mode + mean)
+    return mode
+
+
+@timed
+def loo(trace, model, pointwise=False, reff=None, subsample=None, subsample_method='srs',
+        seed=None):
     """
     Pareto-smoothed importance sampling leave-one-out cross-validation
     
@@ -298,6 +551,11 @@ def loo(trace, model, pointwise=False, reff=None):
     following Vehtari et al. (2015). Cross-validation is computed using Pareto-smoothed
     importance sampling (PSIS).
 
+    For very large datasets the LOO can be approximated from a subsample of the observations,
+    following Magnusson et al. (2019). The log-likelihood of the observations at the posterior
+    mean is used as a cheap approximation of the LOO of every observation, and PSIS is used only on
+    the subsample to estimate the difference between the exact and the approximate values.
+
     Parameters
     ----------
     trace : result of MCMC run
@@ -305,9 +563,24 @@ def loo(trace, model, pointwise=False, reff=None):
         Optional model. Default None, taken from context.
     pointwise: bool, optional
         if True the pointwise predictive accuracy will be returned. Defaults to False
-    reff : float, optional
+    reff : float or array of shape (n_observations,), optional
         relative MCMC efficiency, `effective_n / n` i.e. number of effective samples divided by
-        the number of actual samples. Computed from trace by default.
+        the number of actual samples. By default it is computed for each observation, from the
+        effective sample size of its likelihood (see `psislw`).
+    subsample : int, optional
+        Number of observations used to approximate the LOO. Defaults to None, the exact LOO is
+        computed from all the observations. The subsampling standard error decreases as the
+        subsample grows.
+    subsample_method : str
+        How the subsample is drawn, only used when `subsample` is given:
+
+        - 'srs' : (default) simple random sampling without replacement.
+        - 'stratified' : the observations are split in 10 strata of equal size by their
+          approximate LOO and sampled proportionally from each stratum. Reduces the subsampling
+          error when the approximation is informative.
+    seed : int or np.random.RandomState instance
+        If int or RandomState, use it for drawing the subsample. Default None the global
+        np.random state is used.
 
     Returns
     -------
@@ -317,21 +590,24 @@ def loo(trace, model, pointwise=False, reff=None):
     p_loo: effective number of parameters
     shape_warn: 1 if the estimated shape parameter of 
         Pareto distribution is greater than 0.7 for one or more samples
-    loo_i: array of pointwise predictive accuracy, only if pointwise True
+    loo_i: array of pointwise predictive accuracy, only if pointwise True. With subsampling the
+        values are exact at the subsampled observations and approximate elsewhere.
+    loo_subsample_se: standard error of loo due to subsampling, only with subsampling
+
+    References
+    ----------
+    Magnusson et al. (2019) Bayesian leave-one-out cross-validation for large data
+    http://arxiv.org/abs/1904.10679
     """
 
-    if reff is None:
-        df = trace_to_dataframe(trace, combined=False)
-        nchains = df.columns.value_counts()[0]
-        if nchains == 1:
-            reff = 1.
-        else:
-            eff_ave = effective_n(df).mean()
-            samples = len(df) * nchains
-            reff = eff_ave / samples
+    if subsample is not None:
+        return _loo_subsample(trace, model, reff, subsample, subsample_method, seed)
 
     log_py = log_post_trace(trace, model)
 
+    if reff is None:
+        reff = _relative_eff(log_py, trace.nchains)
+
     lw, ks = psislw(-log_py, reff)
     lw += log_py
 
@@ -362,6 +638,111 @@ def loo(trace, model, pointwise=False, reff=None):
                             columns=['loo', 'loo_se', 'p_loo', 'warning', 'loo_i'])
 
 
+def _loo_subsample(trace, model, reff, size, method, seed):
+    """
+    Difference estimator of the LOO from a subsample of the observations.
+
+    The approximation of the pointwise LOO is -2 times the log-likelihood at the posterior mean.
+    Within each stratum h of N_h observations, m_h of them are subsampled and the total is
+    estimated by sum(approx) + N_h * mean(exact - approx), with the subsampling variance
+    N_h**2 * (1 - m_h / N_h) * var(exact - approx) / m_h.
+    """
+    if method not in ('srs', 'stratified'):
+        raise ValueError('The subsample method {} is not supported.'.format(method))
+    if size < 2:
+        raise ValueError('The subsample should contain at least 2 observations.')
+
+    if not isinstance(seed, np.random.RandomState):
+        seed = np.random.RandomState(seed)
+
+    point = {v: np.mean(trace.get_values(v), axis=0) for v in trace.varnames}
+    approx = - 2 * log_post_point(point, model)
+    N = len(approx)
+
+    if method == 'srs':
+        strata = [np.arange(N)]
+    else:
+        strata = np.array_split(np.argsort(approx), min(10, size // 2, N))
+    sizes = [min(len(s), max(2, int(round(size * len(s) / N)))) for s in strata]
+    idx = np.concatenate([seed.choice(s, m_h, replace=False) for s, m_h in zip(strata, sizes)])
+
+    log_py = log_post_trace(trace, model, observations=idx)
+
+    if reff is None:
+        reff = _relative_eff(log_py, trace.nchains)
+    elif np.ndim(reff):
+        reff = np.asarray(reff)[idx]
+
+    lw, ks = psislw(-log_py, reff)
+    lw += log_py
+
+    warn_mg = 0
+    if np.any(ks > 0.7):
+        warnings.warn("""Estimated shape parameter of Pareto distribution is greater than 0.7 for
+        one or more samples. You should consider using a more robust model, this is because
+        importance sampling is less likely to work well if the marginal posterior and LOO posterior
+        are very different. This is more likely to happen with a non-robust model and highly
+        influential observations.""")
+        warn_mg = 1
+
+    exact = - 2 * logsumexp(lw, axis=0)
+    lpd = logsumexp(log_py, axis=0, b=1. / log_py.shape[0])
+
+    loo_lppd = np.sum(approx)
+    sq_lppd = np.sum(approx ** 2)
+    p_loo = 0.
+    var_subsample = 0.
+    start = 0
+    for s, m_h in zip(strata, sizes):
+        sample = slice(start, start + m_h)
+        start += m_h
+        N_h = len(s)
+        approx_h = approx[idx[sample]]
+        diff = exact[sample] - approx_h
+        loo_lppd += N_h * np.mean(diff)
+        sq_lppd += N_h * np.mean(exact[sample] ** 2 - approx_h ** 2)
+        p_loo += N_h * np.mean(lpd[sample] + 0.5 * exact[sample])
+        if m_h < N_h:
+            var_subsample += N_h ** 2 * (1 - m_h / N_h) * np.var(diff, ddof=1) / m_h
+
+    # N * var(loo_i), the square of the total is corrected for the subsampling variance
+    loo_lppd_se = max(sq_lppd - (loo_lppd ** 2 - var_subsample) / N, 0.) ** 0.5
+
+    loo_lppd_i = approx
+    loo_lppd_i[idx] = exact
+
+    return pd.DataFrame([[loo_lppd, loo_lppd_se, p_loo, warn_mg, loo_lppd_i,
+                          var_subsample ** 0.5]],
+                        columns=['loo', 'loo_se', 'p_loo', 'warning', 'loo_i',
+                                 'loo_subsample_se'])
+
+
+def _relative_eff(log_py, nchains, block_size=2**22):
+    """
+    Relative MCMC efficiency of each observation, the effective sample size of its likelihood
+    divided by the number of samples.
+
+    The samples of `log_py` are expected chain after chain, with chains of equal length, otherwise
+    they are treated as a single chain. The autocorrelations are computed with FFTs over blocks of
+    observations of at most `block_size` values.
+    """
+    n_samples, n_obs = log_py.shape
+    if n_samples % nchains:
+        nchains = 1
+    reff = np.empty(n_obs)
+    step = max(1, block_size // n_samples)
+    for start in range(0, n_obs, step):
+        block = log_py[:, start:start + step]
+        likelihood = np.exp(block - np.max(block, axis=0))
+        likelihood = likelihood.reshape(nchains, n_samples // nchains, -1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reff[start:start + step] = _get_neff_batch(likelihood) / n_samples
+    # constant likelihoods give uniform weights, whatever the efficiency
+    reff[~np.isfinite(reff)] = 1.
+    return reff
+
+
+@timed
 def psislw(lw, reff=1.):
     """
     Pareto smoothed importance sampling (PSIS).
@@ -370,8 +751,9 @@ def psislw(lw, reff=1.):
     ----------
     lw : array
         Array of size (n_samples, n_observations)
-    reff : float
-        relative MCMC efficiency, `effective_n / n`
+    reff : float or array of size (n_observations,)
+        relative MCMC efficiency, `effective_n / n`, of all the observations or of each of them.
+        It sets the number of samples in the tail of each observation.
 
     Returns
     -------
@@ -386,7 +768,8 @@ def psislw(lw, reff=1.):
     kss = np.empty(m)
 
     # precalculate constants
-    cutoff_ind = - int(np.ceil(min(n / 5., 3 * (n / reff) ** 0.5))) - 1
+    reff = np.broadcast_to(np.asarray(reff, dtype=float), (m,))
+    cutoff_inds = - np.ceil(np.minimum(n / 5., 3 * (n / reff) ** 0.5)).astype(int) - 1
     cutoffmin = np.log(np.finfo(float).tiny)
     k_min = 1. / 3
 
@@ -397,7 +780,7 @@ def psislw(lw, reff=1.):
         # sort the array
         x_sort_ind = np.argsort(x)
         # divide log weights into body and right tail
-        xcutoff = max(x[x_sort_ind[cutoff_ind]], cutoffmin)
+        xcutoff = max(x[x_sort_ind[cutoff_inds[i]]], cutoffmin)
 
         expxcutoff = np.exp(xcutoff)
         tailinds, = np.where(x > xcutoff)
@@ -431,16 +814,22 @@ def psislw(lw, reff=1.):
     return lw_out, kss
 
 
-def _gpdfit(x):
+def _gpdfit(x, block_size=2**20):
     """
     Estimate the parameters for the Generalized Pareto Distribution (GPD)
     Empirical Bayes estimate for the parameters of the generalized Pareto
     distribution given the data.
 
+    The profile log-likelihood and the weights are computed by blocks of rows of at most
+    `block_size` values, instead of (m, n) and (m, m) matrices with m = 30 + sqrt(n). Each row is
+    reduced as it would be in the full matrix, so the result does not depend on `block_size`.
+
     Parameters
     ----------
     x : array
         sorted 1D data array
+    block_size : int
+        Maximum number of values held in memory at once
 
     Returns
     -------
@@ -458,9 +847,15 @@ def _gpdfit(x):
     bs /= prior_bs * x[int(n/4 + 0.5) - 1]
     bs += 1 / x[-1]
 
-    ks = np.log1p(-bs[:, None] * x).mean(axis=1)
+    ks = np.empty(m)
+    step = max(1, block_size // n)
+    for start in range(0, m, step):
+        ks[start:start + step] = np.log1p(-bs[start:start + step, None] * x).mean(axis=1)
     L = n * (np.log(-(bs / ks)) - ks - 1)
-    w = 1 / np.exp(L - L[:, None]).sum(axis=1)
+    w = np.empty(m)
+    step = max(1, block_size // m)
+    for start in range(0, m, step):
+        w[start:start + step] = 1 / np.exp(L - L[start:start + step, None]).sum(axis=1)
 
     # remove negligible weights
     dii = w >= 10 * np.finfo(float).eps
@@ -508,7 +903,8 @@ def _gpinv(p, k, sigma):
     return x
 
 
-def r2_score(y_true, y_pred, round_to=2):
+@timed
+def r2_score(y_true, y_pred, round_to=2, chunk_size=None, distribution=False):
     """
     R-squared for Bayesian regression models. Only valid for linear models.
     http://www.stat.columbia.edu/%7Egelman/research/unpublished/bayes_R2.pdf
@@ -517,32 +913,98 @@ def r2_score(y_true, y_pred, round_to=2):
     ----------
     y_true: : array-like of shape = (n_samples) or (n_samples, n_outputs)
         Ground truth (correct) target values.
-    y_pred : array-like of shape = (n_samples) or (n_samples, n_outputs)
-        Estimated target values.
+    y_pred : array-like of shape = (n_samples) or (n_samples, n_outputs), or iterable of arrays
+        Estimated target values, e.g. posterior predictive samples of shape (draws, observations),
+        one R2 per draw. It can be a memory-mapped array, or an iterable of chunks of consecutive
+        observations of shape (draws, observations in the chunk).
     round_to : int
         Number of decimals used to round results (default 2).
+    chunk_size : int, optional
+        If given, the variances are accumulated over `chunk_size` observations at a time, so the
+        residuals are never computed for all the observations at once. Defaults to None, every
+        observation at once, unless `y_pred` is memory-mapped or an iterable of chunks.
+    distribution : bool
+        If True, the R2 of every draw is returned too. Defaults to False.
 
     Returns
     -------
     Pandas Series with the following indices:
-    R2_median: median of the Bayesian R2
-    R2_mean: mean of the Bayesian R2
-    R2_std: standard deviation of the Bayesian R2
+    r2_median: median of the Bayesian R2
+    r2_mean: mean of the Bayesian R2
+    r2_std: standard deviation of the Bayesian R2
+    r2: the Bayesian R2 of every draw, only if distribution is True
     """
-    dimension = None
-    if y_true.ndim > 1:
-        dimension = 1
-
-    var_y_est = np.var(y_pred, axis=dimension)
-    var_e = np.var(y_true - y_pred, axis=dimension)
+    y_true = np.asarray(y_true)
+    if chunk_size is None and hasattr(y_pred, 'ndim') and not isinstance(y_pred, np.memmap):
+        dimension = None
+        if y_true.ndim > 1 or np.ndim(y_pred) > 1:
+            dimension = 1
+
+        var_y_est = np.var(y_pred, axis=dimension)
+        var_e = np.var(y_true - y_pred, axis=dimension)
+    else:
+        var_y_est, var_e = _r2_variances(y_true, y_pred, chunk_size)
 
     r2 = var_y_est / (var_y_est + var_e)
-    return pd.Series([np.median(r2), np.mean(r2), np.std(r2)],
-                     index=['r2_median', 'r2_mean', 'r2_std'])
+    values = [np.median(r2), np.mean(r2), np.std(r2)]
+    index = ['r2_median', 'r2_mean', 'r2_std']
+    if distribution:
+        values.append(np.atleast_1d(r2))
+        index.append('r2')
+    return pd.Series(values, index=index)
 
 
+def _r2_variances(y_true, y_pred, chunk_size=None):
+    """
+    Variance of the predictions and of the residuals of every draw, accumulated over chunks of
+    observations (the last axis) with the update of Chan et al.
+    """
+    if hasattr(y_pred, 'ndim'):
+        y_pred = np.asanyarray(y_pred)
+        if chunk_size is None:
+            # about 2**20 values per chunk
+            chunk_size = max(1, 2**20 * y_pred.shape[-1] // max(y_pred.size, 1))
+        chunks = (y_pred[..., start:start + chunk_size]
+                  for start in range(0, y_pred.shape[-1], chunk_size))
+    else:
+        chunks = y_pred
+
+    n_obs = 0
+    moments = None
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=float)
+        n_chunk = chunk.shape[-1]
+        if n_chunk == 0:
+            continue
+        true = y_true[..., n_obs:n_obs + n_chunk] if y_true.ndim else y_true
+        if np.shape(true)[-1:] not in ((), (n_chunk,)):
+            raise ValueError('y_true has fewer observations than y_pred')
+        chunk_moments = []
+        for values in (chunk, true - chunk):
+            mean = np.mean(values, axis=-1)
+            chunk_moments.append((mean, np.sum((values - mean[..., None]) ** 2, axis=-1)))
+        if moments is None:
+            moments = chunk_moments
+        else:
+            n_total = n_obs + n_chunk
+            for k, ((mean, m2), (chunk_mean, chunk_m2)) in enumerate(zip(moments, chunk_moments)):
+                delta = chunk_mean - mean
+                moments[k] = (mean + delta * n_chunk / n_total,
+                              m2 + chunk_m2 + delta ** 2 * n_obs * n_chunk / n_total)
+        n_obs += n_chunk
+
+    if moments is None:
+        raise ValueError('y_pred has no observations')
+    if y_true.ndim and y_true.shape[-1] != n_obs:
+        raise ValueError('y_true has {} observations and y_pred {}'.format(y_true.shape[-1], n_obs))
+    return moments[0][1] / n_obs, moments[1][1] / n_obs
+
+
+@timed
+@cached
 def summary(trace, varnames=None, round_to=2, transform=lambda x: x, circ_varnames=None,
-            stat_funcs=None, extend=False, alpha=0.05, skip_first=0, batches=None):
+            stat_funcs=None, extend=False, alpha=0.05, skip_first=0, thin=1, batches=None,
+            quantiles=None, kde_mode=False):
     R"""
     Create a data frame with summary statistics.
 
@@ -581,15 +1043,26 @@ def summary(trace, varnames=None, round_to=2, transform=lambda x: x, circ_varnam
         meaningful when `stat_funcs` is None.
     skip_first : int
         Number of first samples not shown in plots (burn-in).
+    thin : int
+        Keep one every `thin` samples of each chain (thinning). Defaults to 1.
     batches : None or int
         Batch size for calculating standard deviation for non-independent samples. Defaults to the
         smaller of 100 or the number of samples. This is only meaningful when `stat_funcs` is None.
+    quantiles : None or list of floats
+        Probabilities (between 0 and 1) of the quantiles to add to the default statistics, e.g.
+        `[0.25, 0.5, 0.75]` adds the columns `q_25`, `q_50` and `q_75`. Defaults to None (no
+        quantiles).
+    kde_mode : bool
+        If True add a `mode` column with the mode of each variable, estimated as the maximum of its
+        KDE for continuous variables. Defaults to False.
 
     Returns
     -------
     `pandas.DataFrame` with summary statistics for each variable Defaults one are: `mean`, `sd`,
     `mc_error`, `hpd_2.5`, `hpd_97.5`, `n_eff` and `Rhat`. Last two are only computed for traces
-    with 2 or more chains.
+    with 2 or more chains. The extended statistics requested with `quantiles` and `kde_mode` are
+    placed after the HPD columns. A summary with these statistics can be passed to `forestplot`
+    and `posteriorplot` instead of recomputing them from the samples.
 
     Examples
     --------
@@ -617,7 +1090,7 @@ def summary(trace, varnames=None, round_to=2, transform=lambda x: x, circ_varnam
         mu__0  0.066473  0.000312  0.105039  0.214242
         mu__1  0.067513 -0.159097 -0.045637  0.062912
     """
-    trace = trace_to_dataframe(trace, combined=False)[skip_first:]
+    trace = trace_to_dataframe(trace, combined=False, skip_first=skip_first, thin=thin)
     varnames = get_varnames(trace, varnames)
 
     if batches is None:
@@ -628,36 +1101,59 @@ def summary(trace, varnames=None, round_to=2, transform=lambda x: x, circ_varnam
     else:
         circ_varnames = get_varnames(trace, circ_varnames)
 
-    cnames = ['hpd_{0:g}'.format(100 * alpha / 2),
-              'hpd_{0:g}'.format(100 * (1 - alpha / 2))]
-
-    funcs = [lambda x: pd.Series(np.mean(x, 0), name='mean').round(round_to),
-             lambda x: pd.Series(np.std(x, 0), name='sd').round(round_to),
-             lambda x: pd.Series(_mc_error(x, batches).round(round_to), name='mc_error'),
-             lambda x: pd.DataFrame([hpd(x, alpha)], columns=cnames).round(round_to)]
-
-    circ_funcs = [lambda x: pd.Series(circmean(x, high=np.pi, low=-np.pi, axis=0),
-                                      name='mean').round(round_to),
-                  lambda x: pd.Series(circstd(x, high=np.pi, low=-np.pi, axis=0),
-                                      name='sd').round(round_to),
-                  lambda x: pd.Series(_mc_error(x, batches, circular=True).round(
-                      round_to), name='mc_error'),
-                  lambda x: pd.DataFrame([hpd(x, alpha, circular=True)],
-                                         columns=cnames).round(round_to)]
-
+    funcs = [lambda x: pd.Series(np.mean(x, 0, dtype=np.float64), name='mean').round(round_to),
+             lambda x: pd.Series(np.std(x, 0, dtype=np.float64), name='sd').round(round_to),
+             lambda x: pd.Series(_mc_error(x, batches).round(round_to), name='mc_error')]
+    # statistics after the HPD interval and the quantiles
+    tail_funcs = []
+
+    if kde_mode:
+        tail_funcs.append(lambda x: pd.Series(_kde_mode(x), name='mode').round(round_to))
+
+    # the circular variables with the same number of samples are summarized together
+    circ_vals = {var: as_float(np.ravel(trace[var].values))
+                 for var in varnames if var in circ_varnames}
+    circ_dfs = {}
+    for size in set(len(vals) for vals in circ_vals.values()):
+        group = [var for var, vals in circ_vals.items() if len(vals) == size]
+        circ_df = _circ_summary(np.column_stack([circ_vals.pop(var) for var in group]), alpha,
+                                batches, quantiles, kde_mode).round(round_to)
+        circ_df.index = group
+        circ_dfs.update((var, circ_df.loc[[var]]) for var in group)
+
+    intervals = stat_funcs is None or extend
     if stat_funcs is not None:
         if extend:
-            funcs = funcs + stat_funcs
+            tail_funcs = tail_funcs + stat_funcs
         else:
-            funcs = stat_funcs
+            funcs, tail_funcs = stat_funcs, []
+
+    # the HPD intervals and quantiles of batches of variables with the same number of samples
+    # are computed together, from one in-place sort of their samples
+    interval_dfs = {}
+    if intervals:
+        n_chains = trace.columns.value_counts()
+        sizes = {var: len(trace) * n_chains[var] for var in varnames if var not in circ_dfs}
+        for size in set(sizes.values()):
+            group = [var for var in sizes if sizes[var] == size]
+            step = max(1, _QUANTILE_BATCH // size)
+            for start in range(0, len(group), step):
+                batch = group[start:start + step]
+                interval_df = _quantile_table(_sample_block(trace, batch, size), alpha,
+                                              quantiles, index=batch, overwrite=True)
+                interval_df = interval_df.round(round_to)
+                interval_dfs.update((var, interval_df.loc[[var]].reset_index(drop=True))
+                                    for var in batch)
 
     var_dfs = []
     for var in varnames:
-        vals = np.ravel(trace[var].values)
-        if var in circ_varnames:
-            var_df = pd.concat([f(vals) for f in circ_funcs], axis=1)
-        else:
-            var_df = pd.concat([f(vals) for f in funcs], axis=1)
+        if var in circ_dfs:
+            var_dfs.append(circ_dfs[var])
+            continue
+        vals = as_compute(np.ravel(trace[var].values))
+        var_df = pd.concat([f(vals) for f in funcs] +
+                           ([interval_dfs[var]] if intervals else []) +
+                           [f(vals) for f in tail_funcs], axis=1)
         var_df.index = [var]
         var_dfs.append(var_df)
     dforg = pd.concat(var_dfs, axis=0)
@@ -701,12 +1197,11 @@ def _mc_error(x, batches=5, circular=False):
         return np.reshape([mc_error(t, batches) for t in trace], dims[1:])
 
     else:
+        if circular:
+            return _circ_mc_error(np.sin(x)[:, None], np.cos(x)[:, None], batches)[0]
+
         if batches == 1:
-            if circular:
-                std = circstd(x, high=np.pi, low=-np.pi)
-            else:
-                std = np.std(x)
-            return std / np.sqrt(len(x))
+            return np.std(x, dtype=np.float64) / np.sqrt(len(x))
 
         try:
             batched_traces = np.resize(x, (batches, int(len(x) / batches)))
@@ -716,17 +1211,14 @@ def _mc_error(x, batches=5, circular=False):
             new_shape = (batches, (len(x) - resid) / batches)
             batched_traces = np.resize(x[:-resid], new_shape)
 
-        if circular:
-            means = circmean(batched_traces, high=np.pi, low=-np.pi, axis=1)
-            std = circstd(means, high=np.pi, low=-np.pi)
-        else:
-            means = np.mean(batched_traces, 1)
-            std = np.std(means)
+        means = np.mean(batched_traces, 1, dtype=np.float64)
+        std = np.std(means)
 
         return std / np.sqrt(batches)
 
 
-def waic(trace, model, pointwise=False):
+@timed
+def waic(trace, model, pointwise=False, chunk_size=None):
     """
     Calculate the widely available information criterion, its standard error and the effective
     number of parameters of the samples in trace from model.
@@ -740,6 +1232,10 @@ def waic(trace, model, pointwise=False):
     pointwise: bool
         if True the pointwise predictive accuracy will be returned.
         Default False
+    chunk_size : int, optional
+        If given, the log-likelihood is evaluated `chunk_size` samples at a time and accumulated
+        with a `WaicAccumulator`, so the memory used does not grow with the number of samples.
+        Defaults to None, the log-likelihood of all the samples is evaluated at once.
 
     Returns
     -------
@@ -751,12 +1247,22 @@ def waic(trace, model, pointwise=False):
          densities exceeds 0.4
     waic_i: and array of the pointwise predictive accuracy, only if pointwise True
     """
+    if chunk_size is not None:
+        accumulator = WaicAccumulator()
+        for log_py in log_post_chunks(trace, model, chunk_size):
+            accumulator.update(log_py)
+        return accumulator.result(pointwise)
 
     log_py = log_post_trace(trace, model)
 
     lppd_i = logsumexp(log_py, axis=0, b=1.0 / log_py.shape[0])
 
     vars_lpd = np.var(log_py, axis=0)
+    return _waic_from_pointwise(lppd_i, vars_lpd, pointwise)
+
+
+def _waic_from_pointwise(lppd_i, vars_lpd, pointwise):
+    """WAIC from the pointwise log predictive density and posterior variance of the logp."""
     warn_mg = 0
     if np.any(vars_lpd > 0.4):
         warnings.warn("""For one or more samples the posterior variance of the log predictive
@@ -780,3 +1286,85 @@ def waic(trace, model, pointwise=False):
     else:
         return pd.DataFrame([[waic, waic_se, p_waic, warn_mg, ]],
                             columns=['waic', 'waic_se', 'p_waic', 'warning'])
+
+
+class WaicAccumulator(object):
+    """
+    Streaming computation of the WAIC from chunks of samples of the pointwise log-likelihood.
+
+    For each observation it keeps a running maximum and a sum of exponentials rescaled by that
+    maximum (for the log predictive density) and the running mean and sum of squared deviations
+    of Welford's algorithm (for the posterior variance of the log-likelihood). The memory used is
+    proportional to the number of observations, whatever the number of samples.
+
+    Examples
+    --------
+
+    .. code:: ipython
+
+        >>> accumulator = az.WaicAccumulator()
+        >>> for log_py in chunks:  # arrays of shape (n_samples_in_chunk, n_observations)
+        ...     accumulator.update(log_py)
+        >>> accumulator.result()
+    """
+
+    def __init__(self):
+        self.n_samples = 0
+        self._max = None
+        self._sum_exp = None
+        self._mean = None
+        self._m2 = None
+
+    def update(self, log_py):
+        """
+        Add samples of the pointwise log-likelihood.
+
+        Parameters
+        ----------
+        log_py : array of shape (n_samples_in_chunk, n_observations)
+        """
+        log_py = np.atleast_2d(log_py)
+        n_chunk = len(log_py)
+        if n_chunk == 0:
+            return
+        chunk_max = np.max(log_py, axis=0)
+        chunk_mean = np.mean(log_py, axis=0)
+        chunk_m2 = np.sum((log_py - chunk_mean) ** 2, axis=0)
+
+        if self._max is None:
+            self._max = chunk_max
+            self._sum_exp = np.sum(np.exp(log_py - chunk_max), axis=0)
+            self._mean = chunk_mean
+            self._m2 = chunk_m2
+            self.n_samples = n_chunk
+            return
+
+        if log_py.shape[1] != len(self._max):
+            raise ValueError('The number of observations should be the same in every chunk')
+
+        new_max = np.maximum(self._max, chunk_max)
+        self._sum_exp = (self._sum_exp * np.exp(self._max - new_max) +
+                         np.sum(np.exp(log_py - new_max), axis=0))
+        self._max = new_max
+
+        # Chan et al. update of the mean and of the sum of squared deviations
+        n_samples = self.n_samples + n_chunk
+        delta = chunk_mean - self._mean
+        self._mean = self._mean + delta * n_chunk / n_samples
+        self._m2 = self._m2 + chunk_m2 + delta ** 2 * self.n_samples * n_chunk / n_samples
+        self.n_samples = n_samples
+
+    def result(self, pointwise=False):
+        """
+        WAIC of the samples added so far, in the format returned by `waic`.
+
+        Parameters
+        ----------
+        pointwise: bool
+            if True the pointwise predictive accuracy will be returned. Default False
+        """
+        if not self.n_samples:
+            raise ValueError('No samples were added to the accumulator.')
+        lppd_i = self._max + np.log(self._sum_exp / self.n_samples)
+        vars_lpd = self._m2 / self.n_samples
+        return _waic_from_pointwise(lppd_i, vars_lpd, pointwise)
@@ -1,7 +1,11 @@
+from types import SimpleNamespace
 import numpy as np
 import pandas as pd
 from numpy.testing import assert_allclose
-from ..stats import gelman_rubin, effective_n, geweke
+from ..plots.kdeplot import fast_kde
+from ..stats import gelman_rubin, effective_n, geweke, hpd
+from ..stats.diagnostics import _get_neff, _get_neff_batch
+from ..utils import float32_mode, trace_to_dataframe
 
 good_rhat = 1.1
 
@@ -41,6 +45,42 @@ def test_effective_n():
     assert eff_n.shape == (3,)
 
 
+def test_effective_n_batch():
+    trace = fake_trace(1000)
+    values = np.stack([trace[v].values for v in ['a', 'b', 'c']], axis=-1).transpose(1, 0, 2)
+    assert_allclose(_get_neff_batch(values), [_get_neff(values[..., k]) for k in range(3)])
+
+
+class MultiTrace(object):
+    """In-memory stand-in for a PyMC3 MultiTrace with one scalar variable `a`."""
+
+    def __init__(self, chains):
+        self._chains = chains
+        self.chains = list(range(len(chains)))
+        self._straces = {0: SimpleNamespace(var_shapes={'a': ()})}
+
+    def get_values(self, varname, burn=0, thin=1, combine=True, chains=None, squeeze=True):
+        return [self._chains[c][burn::thin] for c in chains]
+
+
+def test_float32_mode():
+    trace = fake_trace(1000)
+    trace32 = trace.astype(np.float32)
+    x32 = trace32.values[:, 0]
+    # chains of different length, padded with NaN when placed side by side
+    multitrace = MultiTrace([x32, x32[:300]])
+
+    assert np.asarray(hpd(x32)).dtype == np.float64
+    assert fast_kde(x32)[0].dtype == np.float64
+    assert (trace_to_dataframe(multitrace, combined=False).dtypes == np.float64).all()
+    with float32_mode():
+        assert np.asarray(hpd(x32)).dtype == np.float32
+        assert fast_kde(x32)[0].dtype == np.float32
+        assert (trace_to_dataframe(multitrace, combined=False).dtypes == np.float32).all()
+        assert_allclose(effective_n(trace32), effective_n(trace), rtol=1e-3)
+        assert_allclose(gelman_rubin(trace32), gelman_rubin(trace), rtol=1e-3)
+
+
 def test_geweke():
     trace = fake_trace(1000)
     gw = geweke(trace)
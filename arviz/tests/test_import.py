@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+
+def _modules_after(code):
+    code += "; import sys; print(' '.join(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return output.decode().split()
+
+
+def test_lazy_plots():
+    modules = _modules_after('import arviz')
+    assert 'matplotlib' not in modules
+    assert 'arviz.plots' not in modules
+    assert 'scipy.signal' not in modules
+
+    modules = _modules_after('import arviz; arviz.traceplot')
+    assert 'arviz.plots' in modules
@@ -1,9 +1,15 @@
 from pandas import DataFrame
 import numpy as np
 import pymc3 as pm
+from numpy.testing import assert_allclose
 from pytest import raises
+from scipy import stats
+from ..stats import summary
+from ..plots.plot_utils import decimate, discrete_counts
+from ..plots.report import _load_blocks, _save_blocks
+from ..plots.traceplot import _PRIOR_CURVES, _prior_curve
 from ..plots import (densityplot, traceplot, energyplot, posteriorplot, autocorrplot, forestplot,
-                     parallelplot, pairplot, jointplot)
+                     parallelplot, pairplot, jointplot, render_report, TraceMonitor)
 
 
 J = 8
@@ -37,7 +43,14 @@ def test_plots():
     assert forestplot(short_trace, rhat=False).get_geometry() == (1, 2)
     assert forestplot(short_trace, neff=False).get_geometry() == (1, 2)
 
-    with raises(AttributeError):
+    df_s = summary(short_trace, quantiles=[0.25, 0.5, 0.75], kde_mode=True)
+    assert forestplot(None, summary_df=df_s).get_geometry() == (1, 3)
+    assert forestplot(None, summary_df=df_s[df_s.columns[:-3]]).get_geometry() == (1, 1)
+    assert posteriorplot(short_trace, summary_df=df_s, point_estimate='mode').shape == (10,)
+    with raises(ValueError):
+        forestplot(None, summary_df=df_s[['mean', 'sd']])
+
+    with raises(ValueError):
         energyplot(trace0)
     assert energyplot(short_trace)
 
@@ -55,3 +68,127 @@ def test_pairplot():
              kwargs_divergences={'marker': '*', 'c': 'C'})
     pairplot(short_trace, kind='hexbin', varnames=['theta__0', 'theta__1'],
              cmap='viridis', textsize=20)
+
+
+def test_prior_curves(monkeypatch):
+    _PRIOR_CURVES.clear()
+    trace0 = DataFrame({'a': np.random.normal(size=100), 'b': np.random.poisson(2.3, 100)})
+    priors = [stats.norm(0, 2), stats.poisson(2.3)]
+    assert traceplot(trace0, priors=priors).shape == (2, 2)
+    assert len(_PRIOR_CURVES) == 2
+
+    # served from the cache, evaluated over the ppf support
+    x, p = _prior_curve(stats.norm(0, 2))
+    assert _prior_curve(priors[0])[0] is x
+    assert_allclose(x[[0, -1]], priors[0].ppf([1e-4, 1 - 1e-4]))
+    assert_allclose(p, priors[0].pdf(x))
+    assert not x.flags.writeable and not p.flags.writeable
+    x, p = _prior_curve(priors[1], discrete=True)
+    assert_allclose(x, np.arange(priors[1].ppf(1e-4), priors[1].ppf(1 - 1e-4) + 1))
+    assert_allclose(p, priors[1].pmf(x))
+
+    monkeypatch.setitem(_prior_curve.__globals__, '_MAX_PRIOR_CURVES', 3)
+    for scale in range(1, 6):
+        _prior_curve(stats.norm(0, scale))
+        assert len(_PRIOR_CURVES) <= 3
+    assert _prior_curve(stats.norm(0, 5)) is _prior_curve(stats.norm(0, 5))
+
+
+def test_decimate():
+    values = np.random.randn(10001, 2)
+    values[1234, 0], values[5678, 1] = 100, -100
+    for method, n_points in [('minmax', 1000), ('lttb', 500)]:
+        x, y = decimate(values, n_points, method)
+        assert x.shape == y.shape and len(x) <= n_points
+        assert np.all(np.diff(x, axis=0) >= 0)
+        assert y[:, 0].max() == 100 and y[:, 1].min() == -100
+    assert decimate(values, 1000, 'minmax')[1].max(0).tolist() == values.max(0).tolist()
+    with raises(ValueError):
+        decimate(values, 1000, 'mean')
+    traceplot(short_trace, decimation='lttb')
+
+    trace0 = DataFrame({'a': np.random.normal(size=20000)})
+    assert len(traceplot(trace0)[0, 1].get_lines()[0].get_xdata()) == 20000
+    ax = traceplot(trace0, decimation='minmax')
+    fig = ax[0, 1].get_figure()
+    # two points per pixel column of the trace axes, about half of the figure
+    assert len(ax[0, 1].get_lines()[0].get_xdata()) < fig.get_figwidth() * fig.dpi
+
+
+def test_render_report(tmpdir):
+    specs = [{'plot': 'traceplot', 'varnames': ['mu']},
+             {'plot': 'posteriorplot', 'varnames': ['tau'], 'filename': 'tau.svg'},
+             {'plot': 'forestplot'}]
+    for n_jobs in [1, 2]:
+        paths = render_report(short_trace, specs, str(tmpdir.join(str(n_jobs))), n_jobs=n_jobs)
+        assert [p.rsplit('/', 1)[-1] for p in paths] == ['000_traceplot.png', 'tau.svg',
+                                                         '002_forestplot.png']
+        assert all(tmpdir.join(str(n_jobs), p.rsplit('/', 1)[-1]).size() > 0 for p in paths)
+    with raises(ValueError):
+        render_report(short_trace, [{'plot': 'compareplot'}], str(tmpdir))
+
+    # the divergences are kept and the columns of mixed dtypes keep their order
+    divergences = [{'plot': 'pairplot', 'varnames': ['mu', 'tau'], 'divergences': True},
+                   {'plot': 'parallelplot'}]
+    for n_jobs in [1, 2]:
+        render_report(short_trace, divergences, str(tmpdir.join('div', str(n_jobs))),
+                      n_jobs=n_jobs)
+    trace0 = DataFrame({'k': np.arange(10), 'a': np.random.randn(10), 'j': np.arange(10)})
+    blocks = _save_blocks(trace0, str(tmpdir), 'mixed')
+    assert list(_load_blocks(blocks).columns) == ['k', 'a', 'j']
+
+
+def test_trace_monitor():
+    df_trace = DataFrame({'a': np.random.normal(size=2000), 'b': np.random.poisson(3, size=2000)})
+    monitor = TraceMonitor(decimation=None)
+    for i in range(0, 2000, 500):
+        monitor.update(df_trace.iloc[:i + 500])
+    assert monitor.ndraws == 2000
+    assert monitor.ax.shape == (2, 2)
+    x, y = monitor.ax[0, 1].lines[0].get_data()
+    assert np.array_equal(y, df_trace['a'].values)
+    x, density = monitor.ax[0, 0].lines[0].get_data()
+    assert abs(np.sum(density) * (x[1] - x[0]) - 1) < 0.05
+    with raises(ValueError):
+        monitor.append(DataFrame(np.zeros((10, 3)), columns=['a', 'a', 'b']))
+
+
+def test_trace_monitor_outlier():
+    monitor = TraceMonitor(decimation=None)
+    monitor.append(DataFrame({'a': np.random.normal(size=500)}))
+    monitor.append(DataFrame({'a': [1e9]}))
+    histogram = monitor._histograms[0]
+    assert len(histogram.counts) <= 2 * histogram.nx
+    assert histogram.counts.sum() == 501
+    lower, upper = histogram.edges()
+    assert lower < -3 and upper > 1e9
+
+
+def test_discrete_counts():
+    values = np.random.poisson(5, size=(1000, 3))
+    start, counts = discrete_counts(values)
+    assert start[0] == values.min() and start[-1] == values.max()
+    for j in range(3):
+        assert np.array_equal(counts[:, j], np.bincount(values[:, j] - values.min(),
+                                                        minlength=len(start)))
+    start, counts = discrete_counts(values[:, 0], lower=2, upper=7, width=3)
+    assert start.tolist() == [2, 5]
+    assert counts.ravel().tolist() == [((values[:, 0] >= s) & (values[:, 0] < s + 3)).sum()
+                                       for s in start]
+    df_trace = DataFrame({'a': np.random.poisson(3, 1000), 'b': np.random.poisson(300, 1000)})
+    traceplot(df_trace)
+    densityplot(df_trace, shade=0.5)
+    posteriorplot(df_trace)
+
+
+def test_posteriorplot_point_estimates():
+    df_trace = DataFrame({'a': np.random.normal(size=1000), 'k': np.random.poisson(3, 1000)})
+    for point_estimate in ['mode', 'mean', 'median']:
+        ax = posteriorplot(df_trace, point_estimate=point_estimate, ref_val=0)
+        assert '0.0% <0< 100.0%' in [t.get_text() for t in ax[1].texts]
+    mode_k = np.bincount(df_trace['k']).argmax()
+    ax = posteriorplot(df_trace, varnames=['k'], point_estimate='mode')
+    assert 'mode={:.1f}'.format(mode_k) in [t.get_text() for t in ax.texts]
+    # kdeplot keywords apply to the KDE of continuous variables
+    ax = posteriorplot(df_trace, varnames=['a'], shade=0.4, label='a')
+    assert len(ax.collections) == 1 and ax.lines[0].get_label() == 'a'
@@ -2,9 +2,13 @@ import numpy as np
 import pandas as pd
 import pymc3 as pm
 from scipy import stats
+from scipy.special import logsumexp
 import copy
 from numpy.testing import assert_almost_equal, assert_array_almost_equal, assert_array_less
-from ..stats import bfmi, compare, hpd, r2_score, summary, waic, psislw
+from pandas.testing import assert_frame_equal
+from pytest import raises
+from ..stats import bfmi, compare, hpd, loo, r2_score, summary, waic, psislw, WaicAccumulator
+from ..stats.stats import _gpdfit, _quantile_table
 
 
 def fake_trace(n_samples):
@@ -18,6 +22,8 @@ def fake_trace(n_samples):
 def test_bfmi():
     trace = pd.DataFrame([1, 2, 3, 4], columns=['energy'])
     assert_almost_equal(bfmi(trace), 0.8)
+    with raises(ValueError):
+        bfmi(trace.rename(columns={'energy': 'a'}))
 
 
 def test_hpd():
@@ -33,6 +39,17 @@ def test_r2_score():
     assert_almost_equal(res.rvalue ** 2, r2_score(y, res.intercept + res.slope * x).r2_median, 2)
 
 
+def test_r2_score_chunked():
+    x = np.linspace(0, 1, 100)
+    y = np.random.normal(x, 1)
+    y_pred = x + np.random.normal(0, 0.5, size=(50, 100))
+    dense = r2_score(y, y_pred, distribution=True)
+    assert dense.r2.shape == (50,)
+    assert_array_almost_equal(r2_score(y, y_pred, chunk_size=30, distribution=True).r2, dense.r2)
+    chunks = (y_pred[:, i:i + 25] for i in range(0, 100, 25))
+    assert_array_almost_equal(r2_score(y, chunks)[:3], dense[:3])
+
+
 def test_compare():
     np.random.seed(42)
     x_obs = np.random.normal(0, 1, size=100)
@@ -82,6 +99,8 @@ def test_compare():
     assert(w_bb_bma[0] > w_bb_bma[1] > w_bb_bma[2])
     assert(w_bma[0] > w_bma[1] > w_bma[2])
 
+    assert_frame_equal(compare(model_dict, n_jobs=2), compare(model_dict))
+
     assert_almost_equal(np.sum(w_st), 1.)
     assert_almost_equal(np.sum(w_st), 1.)
     assert_almost_equal(np.sum(w_st), 1.)
@@ -94,6 +113,35 @@ def test_summary():
     assert np.all(df_s.index == ['a', 'b', 'c'])
 
 
+def test_summary_extended():
+    trace = fake_trace(100)
+    df_s = summary(trace, quantiles=[0.25, 0.5, 0.75], kde_mode=True)
+    assert df_s.shape == (3, 11)
+    assert list(df_s.columns[5:9]) == ['q_25', 'q_50', 'q_75', 'mode']
+
+
+def test_quantile_table():
+    values = np.random.normal(size=(1001, 4))
+    table = _quantile_table(values, 0.1, [0.05, 0.5, 0.99], index=list('abcd'))
+    assert list(table.columns) == ['hpd_5', 'hpd_95', 'q_5', 'q_50', 'q_99']
+    assert_array_almost_equal(table[['q_5', 'q_50', 'q_99']].values,
+                              np.quantile(values, [0.05, 0.5, 0.99], axis=0).T)
+    assert_array_almost_equal(table.loc['c', ['hpd_5', 'hpd_95']], hpd(values[:, 2], 0.1))
+
+
+def test_summary_circular():
+    angles = np.random.vonmises([-3, 0, 3], 2, size=(2000, 3))
+    trace = pd.DataFrame(angles, columns=['a', 'b', 'c'])
+    df_s = summary(trace, circ_varnames=['a', 'c'], round_to=10)
+    assert_array_almost_equal(df_s.loc[['a', 'c'], 'mean'],
+                              stats.circmean(angles[:, [0, 2]], high=np.pi, low=-np.pi, axis=0))
+    assert_array_almost_equal(df_s.loc[['a', 'c'], 'sd'],
+                              stats.circstd(angles[:, [0, 2]], high=np.pi, low=-np.pi, axis=0))
+    assert_array_almost_equal(df_s.loc['c', ['hpd_2.5', 'hpd_97.5']],
+                              hpd(angles[:, 2], circular=True))
+    assert_almost_equal(df_s.loc['b', 'mean'], angles[:, 1].mean())
+
+
 def test_waic():
     """Test widely available information criterion calculation"""
     x_obs = np.arange(6)
@@ -120,7 +168,55 @@ def test_waic():
     assert_almost_equal(np.asarray(calculated_waic.waic_se),
                         actual_waic_se, decimal=2)
 
+    streamed_waic = waic(trace, model, chunk_size=7)
+    assert_array_almost_equal(streamed_waic.values, calculated_waic.values)
+
+
+def test_waic_accumulator():
+    log_py = np.random.normal(-5, 2, size=(1000, 20))
+    accumulator = WaicAccumulator()
+    for chunk in np.array_split(log_py, 9):
+        accumulator.update(chunk)
+    waic_i = - 2 * (logsumexp(log_py, axis=0, b=1. / 1000) - np.var(log_py, axis=0))
+
+    result = accumulator.result(pointwise=True)
+    assert accumulator.n_samples == 1000
+    assert_almost_equal(result.waic[0], np.sum(waic_i))
+    assert_almost_equal(result.p_waic[0], np.sum(np.var(log_py, axis=0)))
+    assert_array_almost_equal(result.waic_i[0], waic_i)
+
+
+def test_loo_subsample():
+    x_obs = np.random.normal(0, 1, size=200)
+
+    with pm.Model() as model:
+        mu = pm.Normal('mu', 0, 1)
+        pm.Normal('x', mu=mu, sd=1, observed=x_obs)
+        trace = pm.sample(500, chains=2)
+
+    full = loo(trace, model)
+    exact = loo(trace, model, subsample=200, seed=0)
+    assert_almost_equal(exact.loo[0], full.loo[0])
+    assert_almost_equal(exact.loo_se[0], full.loo_se[0])
+    assert_almost_equal(exact.loo_subsample_se[0], 0)
+
+    for method in ['srs', 'stratified']:
+        approx = loo(trace, model, subsample=50, subsample_method=method, seed=0)
+        assert abs(approx.loo[0] - full.loo[0]) < 4 * approx.loo_subsample_se[0] + 1
+        assert len(approx.loo_i[0]) == 200
+
+
 def test_psis():
     lw = np.random.randn(20000, 10)
     _, ks = psislw(lw)
     assert_array_less(ks, .5)
+
+    lw_out, ks = psislw(lw, 0.5)
+    lw_vec, ks_vec = psislw(lw, np.full(10, 0.5))
+    assert_array_almost_equal(lw_out, lw_vec)
+    assert_array_almost_equal(ks, ks_vec)
+
+
+def test_gpdfit_blocks():
+    x = np.sort(np.random.pareto(2.5, size=5000))
+    assert _gpdfit(x, block_size=1) == _gpdfit(x)
@@ -1,7 +1,16 @@
+import gc
+import json
+import weakref
+import numpy as np
+import pandas as pd
 import pymc3 as pm
 from numpy.testing import assert_equal
-from pandas.testing import assert_frame_equal
-from ..utils import trace_to_dataframe, save_trace, load_trace
+from pandas.testing import assert_frame_equal, assert_series_equal
+from pytest import raises
+from ..stats import effective_n, summary
+from ..utils import (trace_to_dataframe, trace_to_array, save_trace, load_trace, enable_cache,
+                    disable_cache, profile, expand_variable_names, get_varnames,
+                    get_variable_index, get_sampler_stats, get_stats)
 
 
 with pm.Model() as model:
@@ -23,6 +32,11 @@ def test_trace_to_dataframe():
 
         assert_equal(trace['a'][:, k, l], df_tc['a__{}_{}'.format(k, l)].values)
 
+    values, columns = trace_to_array(trace, combined=False)
+    assert values.shape == (1000, 10)
+    assert columns == list(df_fc.columns)
+    assert_equal(values, df_fc.values)
+
     assert_equal(trace['b'], df_tc['b'])
     assert_equal(trace['b'], df_tc['b'])
 
@@ -30,6 +44,109 @@ def test_trace_to_dataframe():
     assert_equal(trace['b'][1000:], df_fc['b'].iloc[:, 1])
 
 
+def test_trace_to_dataframe_single_chain():
+    with model:
+        trace1 = pm.sample(100, chains=1)
+    df = trace_to_dataframe(trace1, combined=False)
+    assert df.shape == (100, 5)
+    assert_equal(df['a__1_0'].values, trace1['a'][:, 1, 0])
+    values, columns = trace_to_array(trace1)
+    assert_equal(values[:, list(columns).index('b')], trace1['b'])
+
+
+def test_trace_to_dataframe_draws():
+    df = trace_to_dataframe(trace, combined=False)
+
+    tr = trace_to_dataframe(trace, combined=False, skip_first=100, thin=3)
+    assert_equal(tr.values, df.values[100::3])
+    assert_equal(trace_to_dataframe(df, combined=False, skip_first=100, thin=3).values, tr.values)
+    assert np.shares_memory(trace_to_dataframe(df, combined=False, skip_first=100).values,
+                            df.values)
+
+    tr = trace_to_dataframe(trace, combined=False, draws=[slice(None, 500), slice(200, None)])
+    assert tr.shape == (800, 10)
+    assert tr.iloc[:, 0].count() == 500
+    assert_equal(tr.iloc[:, 5].values, df.iloc[200:, 5].values)
+    assert trace_to_dataframe(df, draws=slice(None, None, 2)).shape == (1000, 5)
+
+
+def test_trace_to_dataframe_mixed_dtypes():
+    with pm.Model():
+        pm.Normal('mu', 0, 1)
+        pm.Poisson('k', 3, shape=2)
+        pm.Normal('th', 0, 1, shape=2)
+        trace_mixed = pm.sample(100, chains=2)
+    columns = ['mu', 'k__0', 'k__1', 'th__0', 'th__1']
+
+    df = trace_to_dataframe(trace_mixed)
+    assert list(df.columns) == columns
+    assert_equal(df['k__1'].values, trace_mixed['k'][:, 1])
+    assert list(trace_to_dataframe(trace_mixed, combined=False).columns) == \
+        [name for name in columns for _ in range(2)]
+    assert list(trace_to_array(trace_mixed)[1]) == columns
+
+
+def test_sampler_stats():
+    stats = get_sampler_stats(trace)
+    assert get_sampler_stats(trace) is stats
+    diverging = trace.get_sampler_stats('diverging', combine=False)
+
+    assert_equal(get_stats(trace, 'energy', skip_first=100, thin=3),
+                 trace.get_sampler_stats('energy', burn=100, thin=3))
+    assert_equal(stats.divergences(skip_first=100, thin=3),
+                 np.flatnonzero(np.concatenate([d[100::3] for d in diverging])))
+    for divergent, d in zip(stats.divergences(combined=False), diverging):
+        assert_equal(divergent, np.flatnonzero(d))
+    assert_equal(stats.counts('diverging')[:, 1], [d.sum() for d in diverging])
+
+    df = pd.DataFrame({'a': np.arange(6.), 'diverging': [0, 1, 0, 0, 1, 1]})
+    assert_equal(get_sampler_stats(df).divergences(skip_first=2), [2, 3])
+    assert 'energy' not in get_sampler_stats(df)
+    with raises(ValueError):
+        get_stats(df, 'energy')
+    df['diverging'] = 0
+    assert len(get_sampler_stats(df).divergences()) == 0
+
+    # the chains of a DataFrame are combined draw by draw, as by trace_to_dataframe
+    df = pd.DataFrame(np.random.rand(40, 4) < 0.3, columns=['a', 'a', 'diverging', 'diverging'])
+    combined = trace_to_dataframe(df, combined=True, skip_first=3, thin=2)
+    assert_equal(get_sampler_stats(df).divergences(skip_first=3, thin=2),
+                 np.flatnonzero(combined['diverging']))
+
+
+def test_sampler_stats_release_trace():
+    sliced = trace[100:]
+    get_sampler_stats(sliced).divergences()
+    ref = weakref.ref(sliced)
+    del sliced
+    gc.collect()
+    assert ref() is None
+
+
+def test_expand_variable_names():
+    columns = ['a', 'beta__0', 'beta__1', 'x__0_0', 'x__0_1', 'x__1_0', 'x__1_1']
+    df = pd.DataFrame(np.zeros((2, len(columns))), columns=columns)
+
+    assert get_varnames(df, None) == columns
+    assert expand_variable_names(df, ['a']) == ['a']
+    assert expand_variable_names(df, ['x', 'beta__1']) == columns[3:] + ['beta__1']
+    assert expand_variable_names(df, ['b'], filter_vars='prefix') == ['beta__0', 'beta__1']
+    assert expand_variable_names(df, ['_1$'], filter_vars='regex') == ['beta__1', 'x__0_1',
+                                                                        'x__1_1']
+
+    index = get_variable_index(df)
+    assert index.shapes == {'a': (), 'beta': (2,), 'x': (2, 2)}
+    assert index.locate('x__1_0') == 5
+    assert get_variable_index(trace).labels('a') == ['a__0_0', 'a__0_1', 'a__1_0', 'a__1_1']
+
+
+def test_integer_column_labels():
+    df = pd.DataFrame(np.random.randn(100, 3))
+    assert get_variable_index(df).shapes == {0: (), 1: (), 2: ()}
+    assert get_varnames(df, [1]) == [1]
+    assert list(summary(df).index) == [0, 1, 2]
+
+
 def test_save_and_load():
     save_trace(trace)
     trl0 = load_trace('trace.gzip')
@@ -40,3 +157,33 @@ def test_save_and_load():
     assert_frame_equal(tr, trl0)
     assert_frame_equal(tr, trl1)
     assert_frame_equal(trl0, trl1)
+
+
+def test_cache(tmpdir):
+    cache = enable_cache(str(tmpdir), max_size=2**20)
+    try:
+        n_eff0 = effective_n(trace)
+        n_eff1 = effective_n(trace)
+        effective_n(trace, varnames=['b'])
+    finally:
+        disable_cache()
+
+    assert_series_equal(n_eff0, n_eff1)
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.max_size = 0
+    cache.set('key', n_eff0)
+    assert cache.size == 0
+
+
+def test_profile(tmpdir):
+    with profile() as prof:
+        trace_to_dataframe(trace)
+        trace_to_dataframe(trace, combined=False)
+    report = prof.report()
+    assert report.loc['trace_to_dataframe', 'calls'] == 2
+    assert report.loc['trace_to_dataframe', 'max_size'] == 10000
+
+    filepath = str(tmpdir.join('trace.json'))
+    prof.to_chrome_trace(filepath)
+    with open(filepath) as fd:
+        assert len(json.load(fd)['traceEvents']) == 2
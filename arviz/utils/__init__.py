@@ -1,2 +1,7 @@
-from .utils import (trace_to_dataframe, get_stats, expand_variable_names, get_varnames,
-                    _create_flat_names, log_post_trace, save_trace, load_trace)
+from .utils import (trace_to_dataframe, trace_to_array, get_stats, get_sampler_stats, SamplerStats,
+                    expand_variable_names, get_varnames, get_variable_index, VariableIndex,
+                    _create_flat_names, log_post_trace, log_post_chunks, log_post_point, save_trace,
+                    load_trace)
+from .cache import DiskCache, enable_cache, disable_cache, get_cache
+from .profiling import Profiler, profile, enable_profiling, disable_profiling
+from .precision import enable_float32, disable_float32, float32_enabled, float32_mode
@@ -0,0 +1,198 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import numpy as np
+from .precision import float32_enabled
+from .utils import trace_to_dataframe
+
+
+__all__ = ['DiskCache', 'disable_cache', 'enable_cache', 'get_cache']
+
+_CACHE = None
+
+
+class DiskCache(object):
+    """
+    Content-addressed store of results on local disk with least-recently-used eviction.
+
+    Every result is pickled into its own file named after its key. Reading a result refreshes the
+    modification time of its file, and when the total size of the store exceeds `max_size` the
+    least recently used results are removed.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the results are stored. It is created if needed.
+    max_size : int
+        Maximum size of the store in bytes. Defaults to 1 GB.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that found a stored result.
+    misses : int
+        Number of lookups that did not find a stored result.
+    """
+
+    def __init__(self, directory, max_size=2**30):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{}.pkl'.format(key))
+
+    def get(self, key):
+        """Return the result stored under `key`, raise KeyError if there is none."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fd:
+                value = pickle.load(fd)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            raise KeyError(key)
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store `value` under `key` and evict old results if the store became too large."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp:
+            pickle.dump(value, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                   for e in os.scandir(self.directory) if e.name.endswith('.pkl')]
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    @property
+    def size(self):
+        """Total size in bytes of the stored results."""
+        return sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith('.pkl'))
+
+    def clear(self):
+        """Remove every stored result and reset the counters."""
+        for e in os.scandir(self.directory):
+            if e.name.endswith('.pkl'):
+                os.remove(e.path)
+        self.hits = 0
+        self.misses = 0
+
+
+def enable_cache(directory, max_size=2**30):
+    """
+    Cache the results of `summary`, `effective_n` and `gelman_rubin` on disk.
+
+    Results are keyed on a hash of the trace values and the parameters of the call, so repeated
+    calls on an unchanged trace are read back from disk instead of being recomputed. Calls with
+    user-provided functions (e.g. `stat_funcs` or `transform` in `summary`) are never cached.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the results are stored.
+    max_size : int
+        Maximum size of the cache in bytes, least recently used results are evicted first.
+        Defaults to 1 GB.
+
+    Returns
+    -------
+    cache : DiskCache
+        The active cache, its `hits` and `misses` attributes count the lookups.
+    """
+    global _CACHE
+    _CACHE = DiskCache(directory, max_size)
+    return _CACHE
+
+
+def disable_cache():
+    """Stop caching results. Stored results are kept on disk."""
+    global _CACHE
+    _CACHE = None
+
+
+def get_cache():
+    """Return the active DiskCache or None if caching is disabled."""
+    return _CACHE
+
+
+def cached(func):
+    """
+    Decorator caching the result of a function of a trace in the active DiskCache, if any.
+
+    The first argument of `func` should be the trace, the remaining arguments are the parameters
+    that form the key together with the trace values.
+    """
+    signature = inspect.signature(func)
+    name = '{}.{}'.format(func.__module__, func.__qualname__)
+
+    @functools.wraps(func)
+    def wrapper(trace, *args, **kwargs):
+        cache = _CACHE
+        if cache is None:
+            return func(trace, *args, **kwargs)
+
+        trace = trace_to_dataframe(trace, combined=False)
+        bound = signature.bind(trace, *args, **kwargs)
+        bound.apply_defaults()
+        params = list(bound.arguments.items())[1:]
+        for param, value in params:
+            if _has_callable(value) and value is not signature.parameters[param].default:
+                return func(trace, *args, **kwargs)
+
+        key = _hash_key(name, trace, params)
+        try:
+            return cache.get(key)
+        except KeyError:
+            result = func(trace, *args, **kwargs)
+            cache.set(key, result)
+            return result
+
+    return wrapper
+
+
+def _hash_key(name, trace, params):
+    """Hash the function name, the trace values and the parameters of a call."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(name.encode())
+    h.update(_param_repr(list(trace.columns)).encode())
+    h.update(_param_repr([str(d) for d in trace.dtypes]).encode())
+    h.update(str(trace.shape).encode())
+    # float32 samples give slightly different results when computed in float32
+    h.update('float32={}'.format(float32_enabled()).encode())
+    for dtype in trace.dtypes.unique():
+        h.update(np.ascontiguousarray(trace.select_dtypes(include=[dtype]).values).data)
+    for param, value in params:
+        if not callable(value):
+            h.update('{}={}'.format(param, _param_repr(value)).encode())
+    return h.hexdigest()
+
+
+def _has_callable(value):
+    """Check if a parameter value is, or contains, a function."""
+    if isinstance(value, (list, tuple)):
+        return any(_has_callable(v) for v in value)
+    return callable(value)
+
+
+def _param_repr(value):
+    """Full representation of a parameter value, numpy arrays are not abbreviated."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return '[{}]'.format(','.join(_param_repr(v) for v in value))
+    return repr(value)
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+import numpy as np
+
+
+__all__ = ['disable_float32', 'enable_float32', 'float32_enabled', 'float32_mode']
+
+_FLOAT32 = False
+
+
+def enable_float32():
+    """
+    Keep float32 samples in float32.
+
+    By default the samples are cast to float64 before computing statistics, diagnostics and KDEs.
+    Once the float32 mode is enabled float32 samples (e.g. from a sampler run with
+    `floatX=float32`) are sorted, convolved and stored in float32, halving the memory used and
+    read by `summary`, `effective_n`, `gelman_rubin`, `hpd`, `fast_kde` and the conversion of
+    traces. Means and variances are still accumulated in float64. Samples of other dtypes are not
+    affected.
+
+    Note that `hpd` used to keep the dtype of its input, it now follows this mode like the other
+    functions and returns float64 limits for float32 samples unless the mode is enabled.
+    """
+    global _FLOAT32
+    _FLOAT32 = True
+
+
+def disable_float32():
+    """Cast float32 samples to float64 before computing with them (the default)."""
+    global _FLOAT32
+    _FLOAT32 = False
+
+
+def float32_enabled():
+    """Whether the float32 mode is enabled."""
+    return _FLOAT32
+
+
+@contextmanager
+def float32_mode():
+    """
+    Context manager keeping float32 samples in float32 for the ArviZ calls made inside it.
+
+    Examples
+    --------
+
+    .. code:: ipython
+
+        >>> with az.utils.float32_mode():
+        ...     az.summary(trace)
+    """
+    global _FLOAT32
+    previous = _FLOAT32
+    _FLOAT32 = True
+    try:
+        yield
+    finally:
+        _FLOAT32 = previous
+
+
+def float_dtype(dtype):
+    """Floating point dtype used to compute with values of `dtype`."""
+    if _FLOAT32 and np.dtype(dtype) == np.float32:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def as_float(x):
+    """Return `x` as an array of the floating point dtype used to compute with it."""
+    x = np.asarray(x)
+    return x.astype(float_dtype(x.dtype), copy=False)
+
+
+def as_compute(x, copy=False):
+    """
+    Return `x` as an array ready for computations: floating point values are cast with
+    `as_float`, values of other dtypes (integers, booleans) are left unchanged.
+    """
+    x = np.asarray(x)
+    dtype = float_dtype(x.dtype) if x.dtype.kind == 'f' else x.dtype
+    return x.astype(dtype, copy=copy)
@@ -0,0 +1,182 @@
+import functools
+import json
+import numbers
+import os
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+
+
+__all__ = ['Profiler', 'disable_profiling', 'enable_profiling', 'profile']
+
+_PROFILER = None
+
+
+class Profiler(object):
+    """
+    Record the wall time, number of calls and data size of the stages of ArviZ functions.
+
+    A stage is a call to a public function (e.g. `summary`, `loo`, `traceplot`) or to one of the
+    internal steps they rely on (e.g. `trace_to_dataframe`, `log_post_trace`, `psislw`). Stages are
+    nested, the time spent in a stage but not in any of its nested stages is its self time. For
+    the plots the self time is essentially the time spent in matplotlib.
+
+    Attributes
+    ----------
+    events : list of dicts
+        One event per finished stage with the keys `name`, `start` and `duration` (in seconds
+        since the profiler was created), `self_time`, `size` (number of elements of the first
+        array-like argument, or of the result when no argument is array-like), `depth` and
+        `thread`.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+
+    def _children(self):
+        if not hasattr(self._local, 'children'):
+            self._local.children = []
+        return self._local.children
+
+    @contextmanager
+    def stage(self, name, size=None):
+        """
+        Context manager recording the enclosed code as the stage `name`.
+
+        It yields the event of the stage, whose `size` can be updated from inside the block.
+        """
+        children = self._children()
+        children.append(0.)
+        event = {'name': name, 'size': size}
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            duration = time.perf_counter() - start
+            children_time = children.pop()
+            if children:
+                children[-1] += duration
+            event.update({'start': start - self._origin,
+                          'duration': duration,
+                          'self_time': duration - children_time,
+                          'depth': len(children),
+                          'thread': threading.get_ident()})
+            self.events.append(event)
+
+    def report(self):
+        """
+        Aggregate the recorded events per stage.
+
+        Returns
+        -------
+        `pandas.DataFrame` indexed by stage name, sorted by decreasing total time, with the
+        columns `calls`, `total_time`, `self_time`, `mean_time` (in seconds) and `max_size`.
+        """
+        columns = ['calls', 'total_time', 'self_time', 'mean_time', 'max_size']
+        if not self.events:
+            return pd.DataFrame(columns=columns)
+        events = pd.DataFrame(self.events)
+        grouped = events.groupby('name')
+        report = pd.DataFrame({'calls': grouped.size(),
+                               'total_time': grouped['duration'].sum(),
+                               'self_time': grouped['self_time'].sum(),
+                               'mean_time': grouped['duration'].mean(),
+                               'max_size': grouped['size'].max()}, columns=columns)
+        return report.sort_values(by='total_time', ascending=False)
+
+    def to_chrome_trace(self, filepath):
+        """
+        Save the events in the Chrome trace event format.
+
+        The file can be opened in chrome://tracing, Perfetto or speedscope to get a flame graph.
+
+        Parameters
+        ----------
+        filepath : str
+            Name or path of the JSON file.
+        """
+        pid = os.getpid()
+        trace_events = [{'name': e['name'],
+                         'cat': 'arviz',
+                         'ph': 'X',
+                         'ts': e['start'] * 1e6,
+                         'dur': e['duration'] * 1e6,
+                         'pid': pid,
+                         'tid': e['thread'],
+                         'args': {'size': e['size']}} for e in self.events]
+        with open(filepath, 'w') as fd:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, fd)
+
+
+def enable_profiling():
+    """
+    Start recording the stages of every ArviZ call.
+
+    Returns
+    -------
+    profiler : Profiler
+        The active profiler, see `Profiler.report` and `Profiler.to_chrome_trace`.
+    """
+    global _PROFILER
+    _PROFILER = Profiler()
+    return _PROFILER
+
+
+def disable_profiling():
+    """Stop recording the stages of ArviZ calls."""
+    global _PROFILER
+    _PROFILER = None
+
+
+@contextmanager
+def profile():
+    """
+    Context manager recording the stages of the ArviZ calls made inside it.
+
+    Examples
+    --------
+
+    .. code:: ipython
+
+        >>> with az.utils.profile() as prof:
+        ...     az.loo(trace, model)
+        >>> prof.report()
+        >>> prof.to_chrome_trace('loo.json')
+    """
+    global _PROFILER
+    previous = _PROFILER
+    _PROFILER = Profiler()
+    try:
+        yield _PROFILER
+    finally:
+        _PROFILER = previous
+
+
+def timed(func):
+    """Decorator recording the calls to `func` as a stage of the active Profiler, if any."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _PROFILER
+        if profiler is None:
+            return func(*args, **kwargs)
+        with profiler.stage(name, _size(args)) as event:
+            result = func(*args, **kwargs)
+            if event['size'] is None:
+                event['size'] = _size((result,))
+        return result
+
+    return wrapper
+
+
+def _size(args):
+    """Number of elements of the first array-like argument."""
+    for arg in args:
+        size = getattr(arg, 'size', None)
+        if isinstance(size, numbers.Integral):
+            return int(size)
+    return None
@@ -1,28 +1,249 @@
 import numpy as np
 import pandas as pd
 import gzip
+import itertools
 import lzma
 import bz2
 import os
+import re
+import weakref
+from .precision import float_dtype
+from .profiling import timed
 
 
-__all__ = ['expand_variable_names', 'get_stats', 'get_varnames', 'log_post_trace',
-           'trace_to_dataframe', 'save_trace', 'load_trace']
+__all__ = ['SamplerStats', 'VariableIndex', 'expand_variable_names', 'get_sampler_stats',
+           'get_stats', 'get_variable_index', 'get_varnames', 'log_post_chunks', 'log_post_point',
+           'log_post_trace', 'trace_to_array', 'trace_to_dataframe', 'save_trace', 'load_trace']
 
+# Flat names of the elements of multidimensional variables, e.g. `x__0_1`
+_FLAT_NAME = re.compile(r'^(.+)__(\d+(?:_\d+)*)$')
 
-def expand_variable_names(trace, varnames):
+# Variable indices of DataFrame traces, keyed by the id of their columns
+_INDEX_CACHE = {}
+
+# Sampler statistics of traces, keyed by the id of the trace
+_STATS_CACHE = {}
+
+
+class VariableIndex(object):
     """
-    Expand the name of variables to include multidimensional variables
+    Index of the variables of a trace.
+
+    Maps each variable name to its shape and to the range of its flattened elements (e.g.
+    `theta__0`, `theta__1`, ...) among the columns of the trace, without duplicated chains. The
+    flat names are only generated when requested.
+
+    Parameters
+    ----------
+    names : list of str
+        Variable names, in the order of the columns
+    shapes : list of tuples
+        Shape of each variable, `()` for scalars
+    labels : array, optional
+        Flat names of all the columns. If None they are generated from the names and shapes.
     """
-    tmp = []
-    for vtrace in pd.unique(trace.columns):
+
+    def __init__(self, names, shapes, labels=None):
+        self.names = []
+        self.shapes = {}
+        self.positions = {}
+        start = 0
+        for name, shape in zip(names, shapes):
+            size = int(np.prod(shape, dtype=int))
+            if name in self.positions:
+                # the elements of a variable are not contiguous, keep all their positions
+                position = np.r_[np.arange(start)[self.positions[name]], start:start + size]
+                self.shapes[name] = (len(position),)
+            else:
+                self.names.append(name)
+                position = slice(start, start + size)
+                self.shapes[name] = tuple(shape)
+            self.positions[name] = position
+            start += size
+        self.size = start
+        self._labels = labels
+
+    @classmethod
+    def from_shapes(cls, var_shapes):
+        """Create the index from an ordered mapping of variable names to shapes."""
+        return cls(list(var_shapes.keys()), list(var_shapes.values()))
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Create the index from the flat names of the columns of a trace, duplicated columns (one
+        per chain) are indexed once.
+        """
+        labels = np.asarray(pd.unique(np.asarray(columns, dtype=object)), dtype=object)
+        names, shapes = [], []
+        run_name, run_last, run_size = None, None, 0
+        for label in itertools.chain(labels, [None]):
+            if label is not None:
+                # labels other than strings (e.g. integers) name scalar variables
+                base, sep, idx = label.rpartition('__') if isinstance(label, str) else (label,
+                                                                                       '', '')
+                if not (sep and base and idx and idx.replace('_', '').isdigit()):
+                    base, idx = label, None
+            if label is None or base != run_name or idx is None or run_last is None:
+                if run_name is not None:
+                    names.append(run_name)
+                    shapes.append(_run_shape(run_last, run_size))
+                if label is None:
+                    break
+                run_name, run_last, run_size = base, idx, 1
+            else:
+                run_last = idx
+                run_size += 1
+
+        return cls(names, shapes, labels)
+
+    def labels(self, name=None):
+        """
+        Flat names of the elements of variable `name`, or of all the variables if None.
+        """
+        if name is None:
+            if self._labels is not None:
+                return list(self._labels)
+            return [l for n in self.names for l in self.labels(n)]
+        if self._labels is not None:
+            return list(self._labels[self.positions[name]])
+        return _create_flat_names(name, self.shapes[name])
+
+    def locate(self, label):
+        """Position of the flat name `label` in the index, None if it is not indexed."""
+        if label in self.positions and not self.shapes[label]:
+            return self.positions[label].start
+        match = _FLAT_NAME.match(label)
+        if match is None or match.group(1) not in self.positions:
+            return None
+        name = match.group(1)
+        position = self.positions[name]
+        shape = self.shapes[name]
+        idx = tuple(int(i) for i in match.group(2).split('_'))
+        if isinstance(position, slice) and len(idx) == len(shape) and \
+                all(i < s for i, s in zip(idx, shape)):
+            pos = position.start + int(np.ravel_multi_index(idx, shape))
+            if self._labels is None or self._labels[pos] == label:
+                return pos
+        if self._labels is not None:
+            pos = np.arange(self.size)[position]
+            found = pos[self._labels[position] == label]
+            if len(found):
+                return int(found[0])
+        return None
+
+    def select(self, varnames, filter_vars=None):
+        """
+        Flat names of the selected variables, in the order of `varnames`.
+
+        Parameters
+        ----------
+        varnames : list of str
+            Names to select
+        filter_vars : {None, 'prefix', 'regex'}
+            If None (default) each name should be a variable name, selecting all its elements, or
+            the flat name of a single element (e.g. `theta__0`). If 'prefix', select the elements
+            whose flat name starts with one of the names. If 'regex', the names are regular
+            expressions and variables whose name matches are selected entirely, otherwise the
+            elements whose flat name matches.
+
+        Returns
+        -------
+        list of flat names, without duplicates
+        """
+        selected = []
         for v in varnames:
-            if '{}__'.format(v) in vtrace or v in vtrace:
-                tmp.append(vtrace)
-    return np.unique(tmp)
+            if filter_vars is None:
+                if v in self.positions:
+                    selected.extend(self.labels(v))
+                elif self.locate(v) is not None:
+                    selected.append(v)
+            elif filter_vars == 'prefix':
+                for name in self.names:
+                    if name.startswith(v):
+                        selected.extend(self.labels(name))
+                    elif v.startswith(name):
+                        selected.extend(l for l in self.labels(name) if l.startswith(v))
+            elif filter_vars == 'regex':
+                pattern = re.compile(v)
+                for name in self.names:
+                    if pattern.search(name):
+                        selected.extend(self.labels(name))
+                    else:
+                        selected.extend(l for l in self.labels(name) if pattern.search(l))
+            else:
+                raise ValueError("filter_vars should be None, 'prefix' or 'regex', not "
+                                 "{}".format(filter_vars))
+        return list(dict.fromkeys(selected))
+
 
+def _run_shape(last_idx, size):
+    """Shape of a variable from the index of its last flat name and its number of elements."""
+    if last_idx is None:
+        return ()
+    shape = tuple(int(i) + 1 for i in last_idx.split('_'))
+    if int(np.prod(shape, dtype=int)) != size:
+        # elements not in C order or missing, fall back to a flat shape
+        shape = (size,)
+    return shape
 
-def get_stats(trace, stat=None, combined=True):
+
+def get_variable_index(trace):
+    """
+    Get the VariableIndex of a trace.
+
+    The index of a DataFrame is cached as long as its columns exist, so slices of the same
+    DataFrame (e.g. after discarding the burn-in) share it.
+
+    Parameters
+    ----------
+    trace : Pandas DataFrame or PyMC3 trace
+
+    Returns
+    -------
+    VariableIndex
+    """
+    if type(trace).__name__ == 'MultiTrace':
+        var_shapes = trace._straces[0].var_shapes
+        return VariableIndex.from_shapes({v: s for v, s in var_shapes.items()
+                                          if not _is_transformed_name(str(v))})
+    elif isinstance(trace, pd.DataFrame):
+        entry = _INDEX_CACHE.get(id(trace.columns))
+        if entry is not None and entry[0]() is trace.columns:
+            return entry[1]
+        index = VariableIndex.from_columns(trace.columns)
+        _register_variable_index(trace.columns, index)
+        return index
+    else:
+        raise ValueError('The trace should be a DataFrame or a trace from PyMC3')
+
+
+def _register_variable_index(columns, index):
+    """Cache the VariableIndex of a DataFrame with the given columns."""
+    key = id(columns)
+    _INDEX_CACHE[key] = (weakref.ref(columns, lambda _: _INDEX_CACHE.pop(key, None)), index)
+
+
+def expand_variable_names(trace, varnames, filter_vars=None):
+    """
+    Expand the name of variables to include multidimensional variables
+
+    Parameters
+    ----------
+    trace : Pandas DataFrame or PyMC3 trace
+    varnames : list of str
+        Variable names (e.g. `theta`) or flat names of single elements (e.g. `theta__0`)
+    filter_vars : {None, 'prefix', 'regex'}
+        How to match the names, see `VariableIndex.select`. Defaults to None (exact names).
+
+    Returns
+    -------
+    list of the flat names of the selected variables
+    """
+    return get_variable_index(trace).select(varnames, filter_vars)
+
+
+def get_stats(trace, stat=None, combined=True, skip_first=0, thin=1, draws=None):
     """
     get sampling statistics from trace
 
@@ -34,34 +255,208 @@ def get_stats(trace, stat=None, combined=True):
         Statistics
     combined : Bool
         If True multiple statistics from different chains will be combined together.
+    skip_first : int
+        Number of first draws of each chain to discard (burn-in). Defaults to 0.
+    thin : int
+        Keep one every `thin` draws of each chain. Defaults to 1.
+    draws : slice or list of slices, optional
+        Draws to keep, the same slice for every chain or one slice per chain. If given,
+        `skip_first` and `thin` are ignored.
     Returns
     ----------
     stat: array with the choosen statistic
+
+    Raises
+    ------
+    ValueError
+        If the trace has no statistic `stat`.
     """
-    if type(trace).__name__ == 'MultiTrace':
-        try:
-            return trace.get_sampler_stats(stat, combine=combined)
-        except KeyError:
-            print('There is no {} information in the passed trace.'.format(stat))
+    return get_sampler_stats(trace).get(stat, combined, skip_first, thin, draws)
 
-    elif isinstance(trace, pd.DataFrame):
-        try:
-            return trace[stat].values
-        except KeyError:
-            print('There is no {} information in the passed trace.'.format(stat))
 
-    else:
-        raise ValueError('The trace should be a DataFrame or a trace from PyMC3')
+def get_sampler_stats(trace):
+    """
+    Get the SamplerStats store of a trace.
+
+    The store of a PyMC3 trace is cached as long as the trace exists and keeps its number of
+    draws, so every plot and diagnostic of the same trace reads each sampler statistic from the
+    trace only once. The columns of a DataFrame can be changed in place, so a new store is
+    created for every call.
+
+    Parameters
+    ----------
+    trace : Pandas DataFrame or PyMC3 trace
+        For a DataFrame the statistics are the columns with their names, one column per chain.
+
+    Returns
+    -------
+    SamplerStats
+    """
+    if type(trace).__name__ != 'MultiTrace':
+        return SamplerStats(trace)
+    key = id(trace)
+    entry = _STATS_CACHE.get(key)
+    if entry is not None and entry[0]() is trace and entry[1] == len(trace):
+        return entry[2]
+    stats = SamplerStats(trace)
+    _STATS_CACHE[key] = (weakref.ref(trace, lambda _: _STATS_CACHE.pop(key, None)), len(trace),
+                         stats)
+    return stats
+
+
+class SamplerStats(object):
+    """
+    Sampler statistics of a trace (e.g. `diverging`, `energy`, `depth`), stored by chain.
 
+    Each statistic is read from the trace the first time it is requested and kept as one array
+    per chain; the selections of draws are views of these arrays. The positions of the divergent
+    draws and the per chain aggregates are computed once, from the stored arrays.
 
-def get_varnames(trace, varnames):
+    The store only keeps a weak reference to the trace, so caching it does not keep the trace
+    alive; the statistics not read yet are unavailable once the trace is deleted.
+
+    Parameters
+    ----------
+    trace : Pandas DataFrame or PyMC3 trace
+        For a DataFrame the statistics are the columns with their names, one column per chain.
+    """
+
+    def __init__(self, trace):
+        if type(trace).__name__ != 'MultiTrace' and not isinstance(trace, pd.DataFrame):
+            raise ValueError('The trace should be a DataFrame or a trace from PyMC3')
+        self._trace = weakref.ref(trace)
+        # the chains of a DataFrame are combined draw by draw, as in `trace_to_dataframe`
+        self._interleaved = isinstance(trace, pd.DataFrame)
+        self._chains = {}
+        self._divergences = None
+        self._aggregates = {}
+
+    def _read(self, stat):
+        """Arrays of the statistic `stat` in each chain of the trace."""
+        trace = self._trace()
+        if trace is None:
+            raise ValueError('The trace of these sampler statistics has been deleted')
+        if isinstance(trace, pd.DataFrame):
+            values = trace[stat].values
+            return [values] if values.ndim == 1 else list(values.T)
+        return trace.get_sampler_stats(stat, combine=False, squeeze=False)
+
+    def __contains__(self, stat):
+        if stat not in self._chains:
+            try:
+                self._chains[stat] = [np.asarray(values) for values in self._read(stat)]
+            except KeyError:
+                return False
+        return True
+
+    def chains(self, stat):
+        """Arrays of the statistic `stat` in each chain."""
+        if stat not in self:
+            raise ValueError('There is no {} information in the passed trace'.format(stat))
+        return self._chains[stat]
+
+    def get(self, stat, combined=True, skip_first=0, thin=1, draws=None):
+        """
+        Values of the statistic `stat`.
+
+        Parameters
+        ----------
+        stat : str
+        combined : Bool
+            If True the chains are combined in the order of `trace_to_dataframe`, otherwise one
+            array per chain is returned.
+        skip_first, thin, draws
+            Draws to keep, see `trace_to_dataframe`.
+        """
+        chains = self.chains(stat)
+        values = [v[draws_] for v, draws_ in
+                  zip(chains, _draw_slices(len(chains), skip_first, thin, draws))]
+        if not combined:
+            return values
+        if not self._interleaved:
+            return np.concatenate(values)
+        # chains left with different numbers of draws are padded with NaN
+        n_rows = max(len(v) for v in values)
+        values = [v if len(v) == n_rows else np.concatenate([v, np.full(n_rows - len(v), np.nan)])
+                  for v in values]
+        return np.column_stack(values).ravel()
+
+    def divergences(self, combined=True, skip_first=0, thin=1, draws=None):
+        """
+        Positions of the divergent draws among the kept draws.
+
+        The positions of the divergences of each chain are found once and mapped to the kept
+        draws without reading the `diverging` statistic again.
+
+        Parameters
+        ----------
+        combined : Bool
+            If True the positions are among the chains combined as in `trace_to_dataframe`,
+            otherwise one array of positions per chain is returned.
+        skip_first, thin, draws
+            Draws to keep, see `trace_to_dataframe`.
+
+        Returns
+        -------
+        array of integer positions, or list of arrays
+        """
+        chains = self.chains('diverging')
+        if self._divergences is None:
+            self._divergences = [np.flatnonzero(diverging) for diverging in chains]
+        positions = []
+        offset = 0
+        for index, diverging, draws_ in zip(self._divergences, chains,
+                                            _draw_slices(len(chains), skip_first, thin, draws)):
+            start, stop, step = draws_.indices(len(diverging))
+            if step > 0:
+                index = index[np.searchsorted(index, start):np.searchsorted(index, stop)] - start
+                index = index[index % step == 0] // step
+            else:
+                index = np.flatnonzero(diverging[draws_])
+            if combined and self._interleaved:
+                index = index * len(chains) + len(positions)
+            positions.append(index + offset)
+            if combined and not self._interleaved:
+                offset += len(range(start, stop, step))
+        if not combined:
+            return positions
+        positions = np.concatenate(positions)
+        return np.sort(positions) if self._interleaved else positions
+
+    def counts(self, stat):
+        """
+        Number of draws of each value of an integer or boolean statistic (e.g. the tree `depth`
+        or `diverging`) in each chain, as a 2-D array with one row per chain.
+        """
+        key = ('counts', stat)
+        if key not in self._aggregates:
+            counts = [np.bincount(values.astype(int)) for values in self.chains(stat)]
+            width = max(len(c) for c in counts)
+            self._aggregates[key] = np.array([np.pad(c, (0, width - len(c))) for c in counts])
+        return self._aggregates[key]
+
+    def mean(self, stat):
+        """Mean of the statistic `stat` in each chain."""
+        key = ('mean', stat)
+        if key not in self._aggregates:
+            self._aggregates[key] = np.array([np.mean(values, dtype=np.float64)
+                                              for values in self.chains(stat)])
+        return self._aggregates[key]
+
+
+def get_varnames(trace, varnames, filter_vars=None):
+    """
+    Flat names of the selected variables of a trace, of all the variables if `varnames` is None.
+    See `expand_variable_names`.
+    """
     if varnames is None:
-        return np.unique(trace.columns)
+        return get_variable_index(trace).labels()
     else:
-        return expand_variable_names(trace, varnames)
+        return expand_variable_names(trace, varnames, filter_vars)
 
 
-def log_post_trace(trace, model):
+@timed
+def log_post_trace(trace, model, observations=None):
     """
     Calculate the elementwise log-posterior for the sampled trace.
     Currently only supports trace and models from PyMC3.
@@ -71,6 +466,10 @@ def log_post_trace(trace, model):
     trace : trace object
         Posterior samples
     model : PyMC Model
+    observations : array of ints, optional
+        Indices of the observations to keep, in the flattened order of the observed variables.
+        The other values are discarded as soon as each sample is evaluated, so the memory used is
+        proportional to the number of kept observations. Defaults to None, all the observations.
 
     Returns
     -------
@@ -81,31 +480,102 @@ def log_post_trace(trace, model):
     mo_t = type(model).__name__
 
     if tr_t == 'MultiTrace' and mo_t == 'Model':
-        cached = [(var, var.logp_elemwise) for var in model.observed_RVs]
-
-        def logp_vals_point(pt):
-            if len(model.observed_RVs) == 0:
-                raise ValueError('The model does not contain observed values.')
-
-            logp_vals = []
-            for var, logp in cached:
-                logp = logp(pt)
-                if var.missing_values:
-                    logp = logp[~var.observations.mask]
-                logp_vals.append(logp.ravel())
-
-            return np.concatenate(logp_vals)
+        logp_vals_point = _observed_logp(model)
 
         points = trace.points()
-        logp = (logp_vals_point(pt) for pt in points)
+        if observations is None:
+            logp = (logp_vals_point(pt) for pt in points)
+        else:
+            logp = (logp_vals_point(pt)[observations] for pt in points)
         return np.stack(logp)
     else:
         raise ValueError('Currently only supports trace and models from PyMC3.')
 
 
-def trace_to_dataframe(trace, combined=True):
+def log_post_chunks(trace, model, chunk_size=1000):
+    """
+    Calculate the elementwise log-posterior for the sampled trace, `chunk_size` samples at a time.
+    Currently only supports trace and models from PyMC3.
+
+    Parameters
+    ----------
+    trace : trace object
+        Posterior samples
+    model : PyMC Model
+    chunk_size : int
+        Number of samples per chunk
+
+    Yields
+    ------
+    logp : array of shape (chunk_size, n_observations)
+        The contribution of the observations to the logp of the whole model, the last chunk may be
+        shorter.
+    """
+    if type(trace).__name__ != 'MultiTrace' or type(model).__name__ != 'Model':
+        raise ValueError('Currently only supports trace and models from PyMC3.')
+
+    logp_vals_point = _observed_logp(model)
+    points = trace.points()
+    while True:
+        chunk = [logp_vals_point(pt) for pt in itertools.islice(points, chunk_size)]
+        if not chunk:
+            return
+        yield np.stack(chunk)
+
+
+def log_post_point(point, model):
+    """
+    Calculate the elementwise log-likelihood of the observations at a single point, e.g. the
+    posterior mean. Currently only supports models from PyMC3.
+
+    Parameters
+    ----------
+    point : dict
+        Value of each variable of the model
+    model : PyMC Model
+
+    Returns
+    -------
+    logp : array of shape (n_observations,)
+    """
+    if type(model).__name__ == 'Model':
+        return _observed_logp(model)(point)
+    else:
+        raise ValueError('Currently only supports models from PyMC3.')
+
+
+def _observed_logp(model):
+    """Function computing the flattened elementwise logp of the observed variables at a point."""
+    cached = [(var, var.logp_elemwise) for var in model.observed_RVs]
+
+    def logp_vals_point(pt):
+        if len(model.observed_RVs) == 0:
+            raise ValueError('The model does not contain observed values.')
+
+        logp_vals = []
+        for var, logp in cached:
+            logp = logp(pt)
+            if var.missing_values:
+                logp = logp[~var.observations.mask]
+            logp_vals.append(logp.ravel())
+
+        return np.concatenate(logp_vals)
+
+    return logp_vals_point
+
+
+@timed
+def trace_to_dataframe(trace, combined=True, skip_first=0, thin=1, draws=None):
     """Convert trace to Pandas DataFrame.
 
+    The values of a PyMC3 trace are copied once, into one preallocated 2-D block per dtype that
+    the DataFrame wraps without further copies. Variables of the same dtype keep their relative
+    order, variables of different dtypes are grouped by dtype.
+
+    The burn-in and thinning are applied while reading the samples, so only the kept draws are
+    copied. For a DataFrame with `combined=False` the result is a view of `trace` when every chain
+    keeps the same draws.
+
     Parameters
     ----------
     trace : trace
@@ -113,51 +583,199 @@ def trace_to_dataframe(trace, combined=True):
     combined : Bool
         If True multiple chains will be combined together in the same columns. Otherwise they will
         be assigned to separate columns.
+    skip_first : int
+        Number of first draws of each chain to discard (burn-in). Defaults to 0.
+    thin : int
+        Keep one every `thin` draws of each chain. Defaults to 1.
+    draws : slice or list of slices, optional
+        Draws to keep, the same slice for every chain or one slice per chain (e.g.
+        `[slice(500, None), slice(1000, None)]`). If given, `skip_first` and `thin` are ignored.
+        Chains left with different numbers of draws are padded with NaN when `combined` is False.
     """
     if type(trace).__name__ == 'MultiTrace':
-
-        var_shapes = trace._straces[0].var_shapes
-        varnames = [var for var in var_shapes.keys() if not _is_transformed_name(str(var))]
-
-        flat_names = {v: _create_flat_names(v, var_shapes[v]) for v in varnames}
-
-        var_dfs = []
-        for v in varnames:
-            vals = trace.get_values(v, combine=combined)
-            if isinstance(vals, list):
-                for va in vals:
-                    flat_vals = va.reshape(va.shape[0], -1)
-                    var_dfs.append(pd.DataFrame(flat_vals, columns=flat_names[v]))
-            else:
-                flat_vals = vals.reshape(vals.shape[0], -1)
-                var_dfs.append(pd.DataFrame(flat_vals, columns=flat_names[v]))
+        index = get_variable_index(trace)
+        slices = _draw_slices(len(trace.chains), skip_first, thin, draws)
+        var_dfs = [pd.DataFrame(block, columns=columns, copy=False)
+                   for block, columns in _multitrace_blocks(trace, index, combined, slices)]
+        if len(var_dfs) == 1:
+            trace = var_dfs[0]
+        else:
+            trace = pd.concat(var_dfs, axis=1, copy=False)
 
     elif isinstance(trace, pd.DataFrame):
+        trace = _dataframe_draws(trace, skip_first, thin, draws)
         if combined:
-            varnames = get_varnames(trace, trace.columns)
-            trace = pd.DataFrame({v: trace[v].values.ravel() for v in varnames})
-        return trace
+            index = get_variable_index(trace)
+            trace = pd.DataFrame({v: trace[v].values.ravel() for v in index.labels()})
+        else:
+            return trace
 
     else:
         raise ValueError('The trace should be a DataFrame or a trace from PyMC3')
 
-    return pd.concat(var_dfs, axis=1)
+    _register_variable_index(trace.columns, index)
+    return trace
 
 
-def _create_flat_names(varname, shape):
-    """Return flat variable names for `varname` of `shape`.
-    Examples
-    --------
-    >>> create_flat_names('x', (5,))
-    ['x__0', 'x__1', 'x__2', 'x__3', 'x__4']
-    >>> create_flat_names('x', (2, 2))
-    ['x__0_0', 'x__0_1', 'x__1_0', 'x__1_1']
+@timed
+def trace_to_array(trace, combined=True, skip_first=0, thin=1, draws=None):
+    """Convert trace to a single 2-D array, without building a DataFrame.
+
+    Parameters
+    ----------
+    trace : trace
+        PyMC3's trace or Pandas DataFrame
+    combined : Bool
+        If True multiple chains will be combined together in the same columns. Otherwise they will
+        be assigned to separate columns.
+    skip_first : int
+        Number of first draws of each chain to discard (burn-in). Defaults to 0.
+    thin : int
+        Keep one every `thin` draws of each chain. Defaults to 1.
+    draws : slice or list of slices, optional
+        Draws to keep, see `trace_to_dataframe`.
+
+    Returns
+    -------
+    values : array of shape (n_samples, n_columns)
+        The samples of all the variables, cast to a common dtype. Each column is contiguous in
+        memory.
+    columns : list
+        Flat name of each column, repeated once per chain if `combined` is False.
     """
-    if not shape:
-        return [varname]
-    labels = (np.ravel(xs).tolist() for xs in np.indices(shape))
-    labels = (map(str, xs) for xs in labels)
-    return ['{}__{}'.format(varname, '_'.join(idxs)) for idxs in zip(*labels)]
+    if type(trace).__name__ == 'MultiTrace':
+        index = get_variable_index(trace)
+        slices = _draw_slices(len(trace.chains), skip_first, thin, draws)
+        (values, columns), = _multitrace_blocks(trace, index, combined, slices, common_dtype=True)
+        return values, columns
+    else:
+        trace = trace_to_dataframe(trace, combined, skip_first, thin, draws)
+        return trace.values, list(trace.columns)
+
+
+def _draw_slices(nchains, skip_first=0, thin=1, draws=None):
+    """Slice of the draws to keep for each of the `nchains` chains."""
+    if draws is None:
+        if int(thin) != thin or thin < 1:
+            raise ValueError('thin should be a positive integer, got {}'.format(thin))
+        draws = slice(skip_first or None, None, thin if thin != 1 else None)
+    if isinstance(draws, slice):
+        return [draws] * nchains
+    draws = list(draws)
+    if len(draws) != nchains:
+        raise ValueError('Expected one slice of draws per chain, got {} slices for {} chains'
+                         .format(len(draws), nchains))
+    return draws
+
+
+def _chain_values(get_values, name, chain, draws):
+    """
+    Values of `name` in one chain of a MultiTrace, restricted to `draws`.
+
+    Forward slices are passed to the backend as `burn` and `thin`, so for in-memory traces the
+    result is a view and for the other backends only the kept draws are read.
+    """
+    start, stop, step = draws.start or 0, draws.stop, draws.step or 1
+    if start >= 0 and step > 0 and (stop is None or stop >= 0):
+        values = get_values(name, burn=start, thin=step, combine=False, chains=[chain],
+                            squeeze=False)[0]
+        if stop is not None:
+            values = values[:len(range(start, stop, step))]
+        return values
+    return get_values(name, combine=False, chains=[chain], squeeze=False)[0][draws]
+
+
+def _dataframe_draws(trace, skip_first=0, thin=1, draws=None):
+    """
+    Draws of a DataFrame trace with one column per variable and chain, the k-th column with a
+    given name belonging to the k-th chain. The result is a view of `trace` when every chain keeps
+    the same draws.
+    """
+    if draws is None and not skip_first and thin == 1:
+        return trace
+    chains = pd.Series(np.arange(trace.shape[1])).groupby(trace.columns.values).cumcount().values
+    slices = _draw_slices(chains.max() + 1 if len(chains) else 1, skip_first, thin, draws)
+    if all(draws_ == slices[0] for draws_ in slices):
+        return trace.iloc[slices[0]]
+    return pd.concat([trace.iloc[draws_, chains == chain].reset_index(drop=True)
+                      for chain, draws_ in enumerate(slices)], axis=1)
+
+
+def _multitrace_blocks(trace, index, combined, slices, common_dtype=False):
+    """
+    Copy the values of a MultiTrace into one preallocated 2-D block per dtype.
+
+    Parameters
+    ----------
+    trace : MultiTrace
+    index : VariableIndex
+        Index of the variables of `trace`
+    combined : Bool
+        If True the chains are stacked along the rows, otherwise placed side by side.
+    slices : list of slices
+        Draws to keep in each chain
+    common_dtype : Bool
+        If True return a single block, with the dtype all the variables can be cast to.
+
+    Returns
+    -------
+    list of (block, columns) tuples, the blocks are Fortran ordered (contiguous columns). They
+    are views of the block of each dtype, one per run of consecutive variables of the same dtype,
+    so the columns keep the order of the variables.
+    """
+    values = {v: [_chain_values(trace.get_values, v, chain, draws)
+                  for chain, draws in zip(trace.chains, slices)] for v in index.names}
+    lengths = [len(vals) for vals in values[index.names[0]]]
+    nrows = sum(lengths) if combined else max(lengths)
+    # Chains of different length are padded with NaN when placed side by side
+    padded = not combined and min(lengths) != nrows
+
+    groups = {}
+    for v in index.names:
+        dtype = np.result_type(*values[v])
+        if padded:
+            dtype = np.result_type(dtype, float_dtype(dtype))
+        groups.setdefault(dtype, []).append(v)
+    if common_dtype:
+        groups = {np.result_type(*groups): index.names}
+
+    blocks = []
+    # block and columns of each variable
+    spans = {}
+    for dtype, varnames in groups.items():
+        columns = []
+        for v in varnames:
+            columns.extend(index.labels(v) * (1 if combined else len(lengths)))
+        block = np.empty((nrows, len(columns)), dtype=dtype, order='F')
+        if padded:
+            block.fill(np.nan)
+
+        col = 0
+        for v in varnames:
+            size = int(np.prod(index.shapes[v], dtype=int))
+            start = col
+            row = 0
+            for vals in values[v]:
+                flat_vals = vals.reshape(len(vals), size)
+                if combined:
+                    block[row:row + len(vals), col:col + size] = flat_vals
+                    row += len(vals)
+                else:
+                    block[:len(vals), col:col + size] = flat_vals
+                    col += size
+            if combined:
+                col += size
+            spans[v] = [len(blocks), start, col]
+        blocks.append((block, columns))
+
+    runs = []
+    for v in index.names:
+        j, start, stop = spans[v]
+        if runs and runs[-1][0] == j and runs[-1][2] == start:
+            runs[-1][2] = stop
+        else:
+            runs.append(spans[v])
+    return [(blocks[j][0][:, start:stop], blocks[j][1][start:stop]) for j, start, stop in runs]
 
 
 def _is_transformed_name(name):
@@ -190,11 +808,12 @@ def _create_flat_names(varname, shape):
     """
     if not shape:
         return [varname]
-    labels = (np.ravel(xs).tolist() for xs in np.indices(shape))
-    labels = (map(str, xs) for xs in labels)
-    return ['{}__{}'.format(varname, '_'.join(idxs)) for idxs in zip(*labels)]
+    prefix = '{}__'.format(varname)
+    ranges = [[str(i) for i in range(s)] for s in shape]
+    return [prefix + '_'.join(idxs) for idxs in itertools.product(*ranges)]
 
 
+@timed
 def save_trace(trace, file_name='trace', compression='gzip', combined=False):
     """
     Save trace to a csv file. Duplicated columns names will be preserved, if any.
@@ -216,6 +835,7 @@ def save_trace(trace, file_name='trace', compression='gzip', combined=False):
     trace.to_csv('{}.{}'.format(file_name, compression), compression=compression)
 
 
+@timed
 def load_trace(filepath, combined=False):
     """
     Load csv file into a DataFrame. Duplicated columns names will be preserved, if any.
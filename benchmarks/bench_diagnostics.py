@@ -0,0 +1,19 @@
+from arviz import effective_n, gelman_rubin, geweke
+from .common import make_dataframe
+
+
+class Diagnostics(object):
+    params = [[2, 4], [500, 5000], [10, 100]]
+    param_names = ['chains', 'draws', 'parameters']
+
+    def setup(self, chains, draws, parameters):
+        self.trace = make_dataframe(chains, draws, parameters)
+
+    def time_effective_n(self, chains, draws, parameters):
+        effective_n(self.trace)
+
+    def time_gelman_rubin(self, chains, draws, parameters):
+        gelman_rubin(self.trace)
+
+    def time_geweke(self, chains, draws, parameters):
+        geweke(self.trace)
@@ -0,0 +1,191 @@
+import shutil
+import tempfile
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy import stats
+from arviz import (autocorrplot, compare, compareplot, densityplot, energyplot, forestplot,
+                   jointplot, kdeplot, pairplot, parallelplot, posteriorplot, render_report,
+                   trace_to_dataframe, traceplot, TraceMonitor)
+from arviz.plots.kdeplot import fast_kde
+from .common import MultiTrace, Model, make_dataframe
+
+
+class FastKde(object):
+    params = [[10**3, 10**5, 10**6]]
+    param_names = ['samples']
+
+    def setup(self, samples):
+        self.x = np.random.RandomState(0).normal(size=samples)
+
+    def time_fast_kde(self, samples):
+        fast_kde(self.x)
+
+
+class Plots(object):
+    """Render every plot with the Agg backend, including the drawing of the canvas."""
+    params = [[2, 4], [1000, 10000], [4]]
+    param_names = ['chains', 'draws', 'parameters']
+
+    def setup(self, chains, draws, parameters):
+        self.trace = MultiTrace.from_random(chains, draws, parameters)
+        self.varnames = ['theta__0', 'theta__1']
+
+    def teardown(self, chains, draws, parameters):
+        plt.close('all')
+
+    def _draw(self):
+        plt.gcf().canvas.draw()
+
+    def time_traceplot(self, chains, draws, parameters):
+        traceplot(self.trace)
+        self._draw()
+
+    def time_traceplot_priors(self, chains, draws, parameters):
+        traceplot(self.trace, priors=[stats.norm(0, 1)] * parameters)
+        self._draw()
+
+    def time_posteriorplot(self, chains, draws, parameters):
+        posteriorplot(self.trace)
+        self._draw()
+
+    def time_forestplot(self, chains, draws, parameters):
+        forestplot(self.trace)
+        self._draw()
+
+    def time_densityplot(self, chains, draws, parameters):
+        densityplot(self.trace)
+        self._draw()
+
+    def time_autocorrplot(self, chains, draws, parameters):
+        autocorrplot(self.trace)
+        self._draw()
+
+    def time_energyplot(self, chains, draws, parameters):
+        energyplot(self.trace)
+        self._draw()
+
+    def time_parallelplot(self, chains, draws, parameters):
+        parallelplot(self.trace)
+        self._draw()
+
+    def time_pairplot(self, chains, draws, parameters):
+        pairplot(self.trace, divergences=True)
+        self._draw()
+
+    def time_jointplot(self, chains, draws, parameters):
+        jointplot(self.trace, varnames=self.varnames)
+        self._draw()
+
+    def time_kdeplot(self, chains, draws, parameters):
+        kdeplot(self.trace.get_values('theta')[:, 0])
+        self._draw()
+
+
+class LongTraceplot(object):
+    """Trace plot of long chains, with the lines decimated to the width of the axes."""
+    params = [[10**4, 10**5, 10**6], [None, 'minmax', 'lttb']]
+    param_names = ['draws', 'decimation']
+
+    def setup(self, draws, decimation):
+        self.trace = MultiTrace.from_random(4, draws, 2)
+
+    def teardown(self, draws, decimation):
+        plt.close('all')
+
+    def time_traceplot(self, draws, decimation):
+        traceplot(self.trace, decimation=decimation)
+        plt.gcf().canvas.draw()
+
+
+class CompareDataFramePlot(object):
+    params = [[2, 10]]
+    param_names = ['models']
+
+    def setup(self, models):
+        model_dict = {Model(200, scale=1 + 0.1 * i): MultiTrace.from_random(2, 500, 5, seed=i)
+                      for i in range(models)}
+        self.comp_df = compare(model_dict, method='pseudo-BMA')
+
+    def teardown(self, models):
+        plt.close('all')
+
+    def time_compareplot(self, models):
+        compareplot(self.comp_df)
+        plt.gcf().canvas.draw()
+
+
+class RenderReport(object):
+    """Save a trace, posterior and autocorrelation plot per variable of a 40 variables trace."""
+    params = [[1, 4]]
+    param_names = ['n_jobs']
+
+    def setup(self, n_jobs):
+        self.trace = MultiTrace.from_random(4, 1000, 40)
+        self.specs = [{'plot': plot, 'varnames': ['theta__{}'.format(i)]}
+                      for i in range(40) for plot in ['traceplot', 'posteriorplot', 'autocorrplot']]
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self, n_jobs):
+        shutil.rmtree(self.directory)
+
+    def time_render_report(self, n_jobs):
+        render_report(self.trace, self.specs, self.directory, n_jobs=n_jobs)
+
+
+class LiveTraceMonitor(object):
+    """Refresh a monitor of 10 variables with 100 new draws of each of 4 chains."""
+    params = [[10**3, 10**5]]
+    param_names = ['draws']
+
+    def setup(self, draws):
+        trace = MultiTrace.from_random(4, draws + 100, 10)
+        self.monitor = TraceMonitor()
+        self.monitor.update(trace[:draws])
+        self.draws = trace_to_dataframe(trace[draws:], combined=False)
+
+    def teardown(self, draws):
+        plt.close('all')
+
+    def time_append(self, draws):
+        self.monitor.append(self.draws)
+
+
+class DiscretePlots(object):
+    """Histograms of 4 chains of 4 count variables, with supports of 10 to 10000 integers."""
+    params = [[10**4, 10**5]]
+    param_names = ['draws']
+
+    def setup(self, draws):
+        rng = np.random.RandomState(0)
+        self.trace = pd.DataFrame(rng.poisson([5, 50, 500, 5000] * 4, size=(draws, 16)),
+                                  columns=['k{}'.format(i % 4) for i in range(16)])
+
+    def teardown(self, draws):
+        plt.close('all')
+
+    def time_traceplot(self, draws):
+        traceplot(self.trace)
+
+    def time_densityplot(self, draws):
+        densityplot(self.trace)
+
+    def time_posteriorplot(self, draws):
+        posteriorplot(self.trace)
+
+
+class PosteriorPlotStats(object):
+    """Posterior plot of 20 variables, with the statistics computed from the samples."""
+    params = [['mode', 'mean', 'median'], [None, 0]]
+    param_names = ['point_estimate', 'ref_val']
+
+    def setup(self, point_estimate, ref_val):
+        self.trace = make_dataframe(1, 100000, 20)
+
+    def teardown(self, point_estimate, ref_val):
+        plt.close('all')
+
+    def time_posteriorplot(self, point_estimate, ref_val):
+        posteriorplot(self.trace, point_estimate=point_estimate, ref_val=ref_val)
@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from arviz import compare, hpd, loo, psislw, r2_score, summary, waic
+from .common import MultiTrace, Model, make_dataframe
+
+
+class Summary(object):
+    params = [[2, 4], [500, 5000], [10, 100]]
+    param_names = ['chains', 'draws', 'parameters']
+
+    def setup(self, chains, draws, parameters):
+        self.trace = make_dataframe(chains, draws, parameters)
+
+    def time_summary(self, chains, draws, parameters):
+        summary(self.trace)
+
+    def peakmem_summary(self, chains, draws, parameters):
+        summary(self.trace)
+
+    def time_summary_quantiles(self, chains, draws, parameters):
+        summary(self.trace, quantiles=[0.05, 0.25, 0.5, 0.75, 0.95])
+
+    def peakmem_summary_quantiles(self, chains, draws, parameters):
+        summary(self.trace, quantiles=[0.05, 0.25, 0.5, 0.75, 0.95])
+
+
+class CircularSummary(object):
+    """Summary of a trace of angle parameters, all of them circular."""
+    params = [[100, 1000], [False, True]]
+    param_names = ['parameters', 'extended']
+
+    def setup(self, parameters, extended):
+        values = np.random.RandomState(0).vonmises(0, 2, size=(2000, parameters))
+        self.trace = pd.DataFrame(values, columns=['phi__{}'.format(i) for i in range(parameters)])
+        self.kwargs = {'quantiles': [0.25, 0.5, 0.75], 'kde_mode': True} if extended else {}
+
+    def time_summary(self, parameters, extended):
+        summary(self.trace, circ_varnames=list(self.trace.columns), **self.kwargs)
+
+
+class R2Score(object):
+    """R2 of 100 draws of posterior predictive samples stored in a memory-mapped file."""
+    params = [[10**4, 10**6]]
+    param_names = ['observations']
+
+    def setup(self, observations):
+        rng = np.random.RandomState(0)
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'y_pred.npy')
+        np.save(path, rng.normal(size=(100, observations)))
+        self.y_pred = np.load(path, mmap_mode='r')
+        self.y_true = rng.normal(size=observations)
+
+    def teardown(self, observations):
+        del self.y_pred
+        shutil.rmtree(self.directory)
+
+    def time_r2_score(self, observations):
+        r2_score(self.y_true, self.y_pred)
+
+    def peakmem_r2_score(self, observations):
+        r2_score(self.y_true, self.y_pred)
+
+
+class Hpd(object):
+    params = [[10**4, 10**6], [False, True]]
+    param_names = ['samples', 'circular']
+
+    def setup(self, samples, circular):
+        x = np.random.RandomState(0).normal(size=samples)
+        self.x = np.arctan2(np.sin(x), np.cos(x)) if circular else x
+
+    def time_hpd(self, samples, circular):
+        hpd(self.x, circular=circular)
+
+
+class Psislw(object):
+    params = [[1000, 10000], [10, 1000]]
+    param_names = ['draws', 'observations']
+
+    def setup(self, draws, observations):
+        self.lw = np.random.RandomState(0).normal(size=(draws, observations))
+
+    def time_psislw(self, draws, observations):
+        psislw(self.lw)
+
+    def peakmem_psislw(self, draws, observations):
+        psislw(self.lw)
+
+
+class InformationCriteria(object):
+    params = [[2, 4], [500, 2000], [100, 1000]]
+    param_names = ['chains', 'draws', 'observations']
+
+    def setup(self, chains, draws, observations):
+        self.trace = MultiTrace.from_random(chains, draws, 5)
+        self.model = Model(observations)
+
+    def time_waic(self, chains, draws, observations):
+        waic(self.trace, self.model)
+
+    def time_loo(self, chains, draws, observations):
+        loo(self.trace, self.model)
+
+    def peakmem_waic(self, chains, draws, observations):
+        waic(self.trace, self.model)
+
+    def peakmem_waic_chunked(self, chains, draws, observations):
+        waic(self.trace, self.model, chunk_size=100)
+
+
+class SubsampledLoo(object):
+    params = [[100, 1000, 10000], ['srs', 'stratified']]
+    param_names = ['subsample', 'subsample_method']
+
+    def setup(self, subsample, subsample_method):
+        self.trace = MultiTrace.from_random(2, 1000, 5)
+        self.model = Model(100000)
+
+    def time_loo(self, subsample, subsample_method):
+        loo(self.trace, self.model, reff=1., subsample=subsample,
+            subsample_method=subsample_method, seed=0)
+
+    def peakmem_loo(self, subsample, subsample_method):
+        loo(self.trace, self.model, reff=1., subsample=subsample,
+            subsample_method=subsample_method, seed=0)
+
+
+class Compare(object):
+    params = [['waic', 'loo'], ['stacking', 'BB-pseudo-BMA', 'pseudo-BMA'], [2, 10]]
+    param_names = ['ic', 'method', 'models']
+
+    def setup(self, ic, method, models):
+        self.model_dict = {Model(200, scale=1 + 0.1 * i): MultiTrace.from_random(2, 500, 5, seed=i)
+                           for i in range(models)}
+
+    def time_compare(self, ic, method, models):
+        compare(self.model_dict, ic=ic, method=method, seed=0)
+
+
+class CompareParallel(object):
+    """Compare 20 models with the IC of each model computed in a pool of processes."""
+    params = [['waic', 'loo'], [1, 4]]
+    param_names = ['ic', 'n_jobs']
+
+    def setup(self, ic, n_jobs):
+        models = [Model(1000, scale=1 + 0.05 * i) for i in range(20)]
+        self.model_dict = {m: MultiTrace.from_random(2, 1000, 5, seed=i)
+                           for i, m in enumerate(models)}
+
+    def time_compare(self, ic, n_jobs):
+        compare(self.model_dict, ic=ic, method='pseudo-BMA', n_jobs=n_jobs)
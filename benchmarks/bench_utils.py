@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+from arviz import load_trace, save_trace, trace_to_dataframe
+from arviz.utils import SamplerStats
+from .common import MultiTrace
+
+
+class TraceToDataframe(object):
+    params = [[2, 4], [500, 5000], [10, 1000], [False, True]]
+    param_names = ['chains', 'draws', 'parameters', 'combined']
+
+    def setup(self, chains, draws, parameters, combined):
+        self.trace = MultiTrace.from_random(chains, draws, parameters)
+
+    def time_trace_to_dataframe(self, chains, draws, parameters, combined):
+        trace_to_dataframe(self.trace, combined=combined)
+
+    def peakmem_trace_to_dataframe(self, chains, draws, parameters, combined):
+        trace_to_dataframe(self.trace, combined=combined)
+
+
+class BurnInThin(object):
+    """Select the draws after the burn-in, thinned, from a MultiTrace and from a DataFrame."""
+    params = [[4], [5000], [100], [0, 1000], [1, 5]]
+    param_names = ['chains', 'draws', 'parameters', 'skip_first', 'thin']
+
+    def setup(self, chains, draws, parameters, skip_first, thin):
+        self.trace = MultiTrace.from_random(chains, draws, parameters)
+        self.df = trace_to_dataframe(self.trace, combined=False)
+
+    def time_multitrace(self, chains, draws, parameters, skip_first, thin):
+        trace_to_dataframe(self.trace, combined=False, skip_first=skip_first, thin=thin)
+
+    def time_dataframe(self, chains, draws, parameters, skip_first, thin):
+        trace_to_dataframe(self.df, combined=False, skip_first=skip_first, thin=thin)
+
+    def peakmem_dataframe(self, chains, draws, parameters, skip_first, thin):
+        trace_to_dataframe(self.df, combined=False, skip_first=skip_first, thin=thin)
+
+
+class SamplerStatistics(object):
+    """Divergences after the burn-in, thinned, from a store of the sampler statistics."""
+    params = [[4], [5000, 50000], [0, 1000], [1, 5]]
+    param_names = ['chains', 'draws', 'skip_first', 'thin']
+
+    def setup(self, chains, draws, skip_first, thin):
+        self.trace = MultiTrace.from_random(chains, draws, 2)
+        self.stats = SamplerStats(self.trace)
+        self.stats.divergences()
+
+    def time_divergences(self, chains, draws, skip_first, thin):
+        self.stats.divergences(skip_first=skip_first, thin=thin)
+
+    def time_read(self, chains, draws, skip_first, thin):
+        SamplerStats(self.trace).divergences(skip_first=skip_first, thin=thin)
+
+
+class SaveLoad(object):
+    params = [[2], [500, 5000], [10, 100], ['gzip', 'bz2', 'xz']]
+    param_names = ['chains', 'draws', 'parameters', 'compression']
+
+    def setup(self, chains, draws, parameters, compression):
+        self.trace = trace_to_dataframe(MultiTrace.from_random(chains, draws, parameters),
+                                        combined=False)
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'trace')
+        save_trace(self.trace, self.file_name, compression=compression)
+
+    def teardown(self, chains, draws, parameters, compression):
+        shutil.rmtree(self.directory)
+
+    def time_save_trace(self, chains, draws, parameters, compression):
+        save_trace(self.trace, self.file_name, compression=compression)
+
+    def time_load_trace(self, chains, draws, parameters, compression):
+        load_trace('{}.{}'.format(self.file_name, compression))
@@ -0,0 +1,111 @@
+"""
+Synthetic traces and stand-ins for PyMC3 objects shared by the benchmarks.
+
+The stand-ins implement only the parts of the PyMC3 API used by ArviZ, the class names matter as
+ArviZ dispatches on `type(trace).__name__` and `type(model).__name__`.
+"""
+import numpy as np
+import pandas as pd
+
+
+def make_draws(chains, draws, parameters, seed=0):
+    """Autocorrelated draws of shape (chains, draws, parameters) from an AR(1) process."""
+    rng = np.random.RandomState(seed)
+    noise = rng.normal(size=(chains, draws, parameters))
+    values = np.empty_like(noise)
+    values[:, 0] = noise[:, 0]
+    for i in range(1, draws):
+        values[:, i] = 0.5 * values[:, i - 1] + noise[:, i]
+    return values + np.arange(parameters)
+
+
+def make_dataframe(chains, draws, parameters, seed=0):
+    """
+    Trace in the format returned by `trace_to_dataframe(trace, combined=False)`, one column per
+    parameter and chain.
+    """
+    values = make_draws(chains, draws, parameters, seed)
+    columns = ['theta__{}'.format(i) for i in range(parameters)]
+    return pd.concat([pd.DataFrame(v, columns=columns) for v in values], axis=1)
+
+
+class _Strace(object):
+    def __init__(self, var_shapes):
+        self.var_shapes = var_shapes
+
+
+class MultiTrace(object):
+    """Stand-in for `pymc3.backends.base.MultiTrace` with a single vector variable `theta`."""
+
+    varnames = ['theta']
+
+    def __init__(self, values, sampler_stats=None):
+        self._values = values
+        self._sampler_stats = sampler_stats if sampler_stats is not None else {}
+        self._straces = {c: _Strace({'theta': values.shape[2:]}) for c in range(len(values))}
+
+    @classmethod
+    def from_random(cls, chains, draws, parameters, seed=0):
+        rng = np.random.RandomState(seed)
+        stats = {'energy': rng.normal(size=(chains, draws)).cumsum(1) * 0.1,
+                 'diverging': rng.uniform(size=(chains, draws)) < 0.01}
+        return cls(make_draws(chains, draws, parameters, seed), stats)
+
+    @property
+    def nchains(self):
+        return len(self._values)
+
+    @property
+    def chains(self):
+        return list(range(self.nchains))
+
+    def __len__(self):
+        return self._values.shape[1]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            stats = {k: v[:, idx] for k, v in self._sampler_stats.items()}
+            return MultiTrace(self._values[:, idx], stats)
+        return self.get_values(idx)
+
+    def get_values(self, varname, burn=0, thin=1, combine=True, chains=None, squeeze=True):
+        return _squeeze_cat(self._values, burn, thin, combine, chains, squeeze)
+
+    def get_sampler_stats(self, stat, burn=0, thin=1, combine=True, chains=None, squeeze=True):
+        return _squeeze_cat(self._sampler_stats[stat], burn, thin, combine, chains, squeeze)
+
+    def points(self):
+        for chain in self._values:
+            for draw in chain:
+                yield {'theta': draw}
+
+
+def _squeeze_cat(values, burn, thin, combine, chains, squeeze):
+    if chains is None:
+        chains = range(len(values))
+    results = [values[chain][burn::thin] for chain in chains]
+    if combine:
+        results = np.concatenate(results)
+        return results if squeeze else [results]
+    return results[0] if squeeze and len(results) == 1 else results
+
+
+class _ObservedRV(object):
+    missing_values = False
+
+    def __init__(self, data, scale):
+        self.data = data
+        self.scale = scale
+
+    def logp_elemwise(self, point):
+        z = (self.data - point['theta'][0]) / self.scale
+        return -0.5 * z ** 2 - np.log(self.scale) - 0.5 * np.log(2 * np.pi)
+
+
+class Model(object):
+    """Stand-in for `pymc3.Model` with one normally distributed observed variable."""
+
+    def __init__(self, observations, scale=1., seed=0):
+        self.name = ''
+        data = np.random.RandomState(seed).normal(size=observations)
+        self.observed_RVs = [_ObservedRV(data, scale)]
@@ -0,0 +1,17 @@
+"""
+Cold-start import time, every benchmark runs in a fresh interpreter.
+
+Run with `asv run --bench import_time` or compare two commits with `asv continuous`.
+"""
+
+
+def timeraw_import_arviz():
+    return "import arviz"
+
+
+def timeraw_import_arviz_stats():
+    return "from arviz import summary, loo, waic"
+
+
+def timeraw_import_arviz_plots():
+    return "from arviz import traceplot"